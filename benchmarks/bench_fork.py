@@ -0,0 +1,94 @@
+"""
+Benchmark: forking a recorded simulation vs restarting it from its setup.
+
+A game is run once with its history recorded. For each fork point, the
+continuation under a new seed is produced twice: with Game.fork(), which
+rebuilds the frame from the history and simulates only the suffix, and by
+restarting from the setup, replaying the prefix with the original seed and
+then reseeding at the fork point. Both must end in the same state.
+
+Usage: python benchmarks/bench_fork.py [--points N] [--turns T] [--at F ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app.game_logic import Game
+from bench_quiet import build_setup
+
+# Keys that record how a game was forked rather than what happened in it.
+FORK_KEYS = ('forked_from', 'log_offset')
+
+
+def fresh_teams(teams):
+    return {k: v.copy() for k, v in teams.items()}
+
+
+def run_recorded(setup, max_turns, seed, record_history):
+    """Runs a game to completion. Returns (game, seconds)."""
+    teams, points, grid_size = setup
+    game = Game()
+    start = time.perf_counter()
+    for _ in game.iter_simulation(fresh_teams(teams), points, max_turns, grid_size, seed=seed, record_history=record_history):
+        pass
+    return game, time.perf_counter() - start
+
+
+def fork_and_continue(game, frame_index, seed):
+    """Forks the game at a frame and runs the continuation. Returns (final state, fork seconds, total seconds)."""
+    start = time.perf_counter()
+    forked = game.fork(frame_index, seed=seed)
+    fork_time = time.perf_counter() - start
+    for _ in forked.continue_simulation():
+        pass
+    return forked.state, fork_time, time.perf_counter() - start
+
+
+def restart_and_continue(setup, max_turns, seed, frame_index, new_seed):
+    """Replays the prefix from the setup, reseeds at the fork point and runs on. Returns (final state, seconds)."""
+    teams, points, grid_size = setup
+    game = Game()
+    start = time.perf_counter()
+    steps = game.iter_simulation(fresh_teams(teams), points, max_turns, grid_size, seed=seed)
+    for index, _ in enumerate(steps):
+        if index == frame_index:
+            break
+    game.rng.seed(new_seed)
+    for _ in game.continue_simulation():
+        pass
+    return game.state, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=30)
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--at', type=float, nargs='*', default=[0.25, 0.5, 0.75, 0.9],
+                        help="Fork points, as fractions of the recorded run")
+    args = parser.parse_args()
+
+    setup = build_setup(args.points, args.seed)
+    _, bare_time = run_recorded(setup, args.turns, args.seed, record_history=False)
+    game, recorded_time = run_recorded(setup, args.turns, args.seed, record_history=True)
+    frames = len(game.history)
+    print(f"Recorded run: {frames} frames in {recorded_time:.2f}s ({bare_time:.2f}s without recording)")
+    print()
+    print(f"{'fork at':>8} {'suffix':>7} {'rebuild ms':>11} {'fork s':>8} {'restart s':>10} {'speedup':>8}")
+    for fraction in args.at:
+        frame_index = min(frames - 1, int(frames * fraction))
+        new_seed = args.seed + 1000
+        forked_state, rebuild_time, fork_time = fork_and_continue(game, frame_index, new_seed)
+        restarted_state, restart_time = restart_and_continue(setup, args.turns, args.seed, frame_index, new_seed)
+        forked_state, restarted_state = ({k: v for k, v in s.items() if k not in FORK_KEYS} for s in (forked_state, restarted_state))
+        assert forked_state == restarted_state, f"fork at frame {frame_index} diverged from the restarted run"
+        suffix = forked_state['step'] - frame_index
+        print(f"{frame_index:>8} {suffix:>7} {rebuild_time * 1000:>11.1f} {fork_time:>8.2f} {restart_time:>10.2f} "
+              f"{restart_time / fork_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
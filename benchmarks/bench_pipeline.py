@@ -0,0 +1,63 @@
+"""
+Benchmark: where the time of a simulation stream goes, simulating vs augmenting frames.
+
+A simulation is run for a fixed number of steps, once on its own and once streamed
+the way /api/game/start does, with every frame augmented and JSON-encoded in the
+request thread. The difference is what augmentation and encoding cost per frame,
+and bounds what moving them out of the request thread (e.g. to worker processes)
+could save. Each measurement is the best of `--repeat` runs.
+
+Usage: python benchmarks/bench_pipeline.py [--points N] [--steps S] [--repeat R]
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app.game_logic import Game
+from game_app.frame_selection import FrameSelection
+from game_app.sim_stream import generate_simulation_stream
+from bench_quiet import build_setup
+
+
+def run(setup, steps, seed, streamed):
+    """Runs `steps` simulation steps, streaming them if `streamed`, and returns the seconds taken."""
+    teams, points, grid_size = setup
+    teams = {k: v.copy() for k, v in teams.items()}
+    game = Game()
+    start = time.perf_counter()
+    simulation = itertools.islice(game.iter_simulation(teams, points, 10**6, grid_size, seed=seed), steps)
+    if streamed:
+        for _ in generate_simulation_stream(game, simulation, FrameSelection()):
+            pass
+    else:
+        for _ in simulation:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=30)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=2)
+    args = parser.parse_args()
+
+    setup = build_setup(args.points, args.seed)
+    simulate = min(run(setup, args.steps, args.seed, False) for _ in range(args.repeat))
+    stream = min(run(setup, args.steps, args.seed, True) for _ in range(args.repeat))
+    augment = stream - simulate
+
+    print(f"{args.steps} steps, {args.points} points")
+    print(f"{'':>18} {'ms/step':>8}")
+    print(f"{'simulate':>18} {simulate / args.steps * 1e3:>8.2f}")
+    print(f"{'stream':>18} {stream / args.steps * 1e3:>8.2f}")
+    print(f"{'augment + encode':>18} {augment / args.steps * 1e3:>8.2f}  ({augment / stream:.1%} of the stream)")
+
+
+if __name__ == '__main__':
+    main()
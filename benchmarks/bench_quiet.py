@@ -0,0 +1,86 @@
+"""
+Benchmark: simulation throughput (steps per second) in quiet vs normal mode.
+
+Each seed is run in both modes from the same setup, once as a bare simulation
+loop and once through run_full_simulation, which also records the history.
+The final states are checked to be identical, apart from the keys that quiet
+mode leaves empty.
+
+Usage: python benchmarks/bench_quiet.py [--points N] [--turns T] [--seeds S]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app.game_logic import Game
+
+# State keys that quiet mode intentionally leaves empty.
+QUIET_KEYS = ('log_offset', 'last_action_details', 'new_turn_events', 'action_events', 'action_probabilities')
+
+
+def build_setup(num_points, seed):
+    """Builds a random three-team setup."""
+    rng = random.Random(seed)
+    grid_size = max(10, int(num_points ** 0.5) * 3)
+    teams = {
+        'alpha': {'name': 'Alpha', 'color': '#ff4b4b', 'trait': 'Aggressive'},
+        'beta': {'name': 'Beta', 'color': '#4b4bff', 'trait': 'Defensive'},
+        'gamma': {'name': 'Gamma', 'color': '#4bff4b', 'trait': 'Expansive'},
+    }
+    points = [{'x': rng.randrange(grid_size), 'y': rng.randrange(grid_size), 'teamId': rng.choice(list(teams))}
+              for _ in range(num_points)]
+    return teams, points, grid_size
+
+
+def run(setup, max_turns, seed, quiet, record_history):
+    """
+    Runs one simulation to completion, either bare or through run_full_simulation.
+    Returns (steps, seconds, final state).
+    """
+    teams, points, grid_size = setup
+    teams = {k: v.copy() for k, v in teams.items()}
+    game = Game(quiet=quiet)
+    start = time.perf_counter()
+    if record_history:
+        state = game.run_full_simulation(teams, points, max_turns, grid_size, seed=seed)[-1]
+    else:
+        for state in game.iter_simulation(teams, points, max_turns, grid_size, seed=seed):
+            pass
+    elapsed = time.perf_counter() - start
+    return state['step'], elapsed, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='*', default=[20, 40])
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--seeds', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'mode':>10} {'steps':>8} {'normal st/s':>12} {'quiet st/s':>12} {'speedup':>8}")
+    for num_points in args.points:
+        for record_history in (False, True):
+            totals = {False: [0, 0.0], True: [0, 0.0]}
+            for seed in range(args.seeds):
+                setup = build_setup(num_points, seed)
+                finals = {}
+                for quiet in (False, True):
+                    steps, elapsed, finals[quiet] = run(setup, args.turns, seed, quiet, record_history)
+                    totals[quiet][0] += steps
+                    totals[quiet][1] += elapsed
+                normal, quiet_state = ({k: v for k, v in s.items() if k not in QUIET_KEYS} for s in (finals[False], finals[True]))
+                assert normal == quiet_state, f"quiet mode changed the outcome of seed {seed}"
+
+            normal_rate = totals[False][0] / totals[False][1]
+            quiet_rate = totals[True][0] / totals[True][1]
+            mode = 'history' if record_history else 'bare'
+            print(f"{num_points:>8} {mode:>10} {totals[False][0]:>8} {normal_rate:>12.0f} {quiet_rate:>12.0f} "
+                  f"{quiet_rate / normal_rate:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
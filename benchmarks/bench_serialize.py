@@ -0,0 +1,87 @@
+"""
+Benchmark: frame serialization throughput (bytes per second) on a long history.
+
+A simulation is recorded and every frame is augmented once, as it would be for
+streaming. The augmented frames are then encoded with the previous approach
+(json.dumps with a SetEncoder class defined per call) and with FrameSerializer
+for each available JSON backend. All encodings must decode to the same frames.
+
+Usage: python benchmarks/bench_serialize.py [--points N] [--turns T] [--repeat R]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app.game_logic import Game
+from game_app.serializer import BACKENDS, FrameSerializer
+from bench_quiet import build_setup
+
+
+def legacy_encode(frame):
+    """The encoding augment_state_for_frontend used before the serializer module."""
+    class SetEncoder(json.JSONEncoder):
+        def default(self, obj):
+            if isinstance(obj, set):
+                return list(obj)
+            return json.JSONEncoder.default(self, obj)
+    return json.dumps(frame, cls=SetEncoder)
+
+
+def build_frames(num_points, max_turns, seed):
+    """Records a simulation and returns its frames, augmented as for the /api/game/start stream."""
+    teams, points, grid_size = build_setup(num_points, seed)
+    game = Game()
+    history = game.run_full_simulation(teams, points, max_turns, grid_size, seed=seed)
+    frames = []
+    log_since = 0
+    for frame in history:
+        frames.append(game.augment_state_for_frontend(frame, log=history.log, log_since=log_since))
+        log_since = frame['log_offset']
+    return frames
+
+
+def measure(encode, frames, repeat):
+    """Returns (total bytes, best seconds) to encode all frames."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = sum(len(encode(frame)) for frame in frames)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return total, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=30)
+    parser.add_argument('--turns', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = build_frames(args.points, args.turns, args.seed)
+    encoders = {'legacy json': legacy_encode}
+    for backend in BACKENDS:
+        encoders[f'serializer {backend}'] = FrameSerializer(backend).encode
+
+    reference = [json.loads(legacy_encode(frame)) for frame in frames]
+    for name, encode in encoders.items():
+        assert [json.loads(encode(frame)) for frame in frames] == reference, f"{name} changed the encoded frames"
+
+    print(f"{len(frames)} frames")
+    print(f"{'encoder':>18} {'MB':>8} {'MB/s':>8} {'frames/s':>10} {'speedup':>8}")
+    baseline = None
+    for name, encode in encoders.items():
+        total, elapsed = measure(encode, frames, args.repeat)
+        rate = total / elapsed
+        baseline = baseline or len(frames) / elapsed
+        print(f"{name:>18} {total / 1e6:>8.2f} {rate / 1e6:>8.1f} {len(frames) / elapsed:>10.0f} "
+              f"{len(frames) / elapsed / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
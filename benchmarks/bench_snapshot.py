@@ -0,0 +1,68 @@
+"""
+Benchmark: Game.snapshot() vs copy.deepcopy(game.state) on large synthetic states.
+
+Usage: python benchmarks/bench_snapshot.py [--points N] [--repeat R]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app.game_logic import Game
+
+
+def build_large_game(num_points, seed=0):
+    """Builds a game whose state has many points, lines and structures."""
+    rng = random.Random(seed)
+    grid_size = max(10, int(num_points ** 0.5) * 3)
+    teams = {
+        'alpha': {'name': 'Alpha', 'color': '#ff4b4b', 'trait': 'Aggressive'},
+        'beta': {'name': 'Beta', 'color': '#4b4bff', 'trait': 'Defensive'},
+    }
+    points = [{'x': rng.randrange(grid_size), 'y': rng.randrange(grid_size), 'teamId': rng.choice(list(teams))}
+              for _ in range(num_points)]
+    game = Game()
+    game.start_game(teams, points, 100, grid_size, seed=seed)
+    state = game.state
+
+    by_team = {}
+    for pid, p in state['points'].items():
+        by_team.setdefault(p['teamId'], []).append(pid)
+    for team_id, pids in by_team.items():
+        for i in range(len(pids) - 2):
+            for j in (1, 2):
+                line_id = game._generate_id('l')
+                state['lines'].append({'id': line_id, 'p1_id': pids[i], 'p2_id': pids[i + j], 'teamId': team_id})
+                state['line_strengths'][line_id] = rng.randint(1, 3)
+            if i % 3 == 0:
+                state['territories'].append({'teamId': team_id, 'point_ids': [pids[i], pids[i + 1], pids[i + 2]]})
+        for i in range(0, len(pids) - 4, 10):
+            bastion_id = game._generate_id('b')
+            state['bastions'][bastion_id] = {'id': bastion_id, 'teamId': team_id, 'core_id': pids[i], 'prong_ids': pids[i + 1:i + 4]}
+    for line in state['lines'][::7]:
+        state['shields'][line['id']] = 3
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='*', default=[100, 500, 2000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'lines':>8} {'deepcopy ms':>12} {'snapshot ms':>12} {'speedup':>8}")
+    for num_points in args.points:
+        game = build_large_game(num_points)
+        assert game.snapshot() == copy.deepcopy(game.state)
+        deepcopy_s = min(timeit.repeat(lambda: copy.deepcopy(game.state), number=1, repeat=args.repeat))
+        snapshot_s = min(timeit.repeat(game.snapshot, number=1, repeat=args.repeat))
+        print(f"{len(game.state['points']):>8} {len(game.state['lines']):>8} "
+              f"{deepcopy_s * 1000:>12.2f} {snapshot_s * 1000:>12.2f} {deepcopy_s / snapshot_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Parameter sweep: win rates and game lengths of rule variants across trait matchups.
+
+Every variant (a set of GameRules overrides) is played in every matchup (the traits of the
+teams) from the same random setups, one game per seed. The games are spread over a pool of
+worker processes that is reused for the whole sweep; each game sends back only its divination
+record (divination.run_divination), and no module globals are changed. Prints a table of the
+win rates and mean game length of each variant and matchup.
+
+A grid file is JSON: {"variants": {name: {"parameters": {...}, "group_base_weights": {...},
+"trait_group_multipliers": {...}}}, "matchups": [[trait, trait], ...]}. Without one, a small
+example grid is swept.
+
+Usage: python benchmarks/sweep_rules.py [--grid FILE] [--points N] [--turns T] [--seeds S] [--workers W] [--json OUT]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_app import game_data
+from game_app.divination import DivinationAggregate, run_divination
+from game_app.rules import GameRules
+
+EXAMPLE_GRID = {
+    'variants': {
+        'default': {},
+        'fight_heavy': {'group_base_weights': {'Fight': 45}},
+        'long_stalemates': {'parameters': {'STALEMATE_PASS_TURNS': 10, 'STALEMATE_REPEAT_LIMIT': 5}},
+    },
+    'matchups': [list(pair) for pair in itertools.combinations(game_data.TRAIT_GROUP_MULTIPLIERS, 2)],
+}
+
+
+def build_setup(traits, num_points, layout_seed):
+    """Builds a setup with one team per trait and `num_points` points placed at random."""
+    rng = random.Random(layout_seed)
+    grid_size = max(10, int(num_points ** 0.5) * 3)
+    teams = {f'team_{i + 1}': {'name': f'{trait} {i + 1}', 'color': '#888888', 'trait': trait}
+             for i, trait in enumerate(traits)}
+    points = [{'x': rng.randrange(grid_size), 'y': rng.randrange(grid_size), 'teamId': rng.choice(list(teams))}
+              for _ in range(num_points)]
+    return teams, points, grid_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--grid', help='JSON file of variants and matchups')
+    parser.add_argument('--points', type=int, default=20)
+    parser.add_argument('--turns', type=int, default=50)
+    parser.add_argument('--seeds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--json', help='also write the table to this file as JSON')
+    args = parser.parse_args()
+
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    else:
+        grid = EXAMPLE_GRID
+    variants = {name: GameRules.from_dict(overrides) for name, overrides in grid['variants'].items()}
+    matchups = [tuple(traits) for traits in grid['matchups']]
+
+    start = time.perf_counter()
+    cells = {}
+    with ProcessPoolExecutor(args.workers) as pool:
+        for (name, rules), traits in itertools.product(variants.items(), matchups):
+            futures = []
+            for seed in range(args.seeds):
+                teams, points, grid_size = build_setup(traits, args.points, seed)
+                setup = {'teams': teams, 'points': points, 'max_turns': args.turns, 'grid_size': grid_size}
+                futures.append(pool.submit(run_divination, setup, seed, (None, None), rules))
+            cells[name, traits] = (list(teams), futures)
+
+        rows = []
+        for (name, traits), (team_ids, futures) in cells.items():
+            aggregate = DivinationAggregate(team_ids, len(futures))
+            for future in futures:
+                aggregate.add(future.result())
+            result = aggregate.to_dict()
+            rows.append({
+                'variant': name,
+                'matchup': list(traits),
+                'win_rates': [result['win_rates'][team_id] for team_id in team_ids], # In matchup order
+                'no_winner_rate': result['no_winner_rate'],
+                'victory_conditions': result['victory_conditions'],
+                'turns': result['turns'],
+            })
+    elapsed = time.perf_counter() - start
+
+    games = len(rows) * args.seeds
+    print(f"{games} games ({args.seeds} per cell, {args.points} points, {args.turns} turns) "
+          f"in {elapsed:.1f} s on {args.workers} workers")
+    print(f"{'variant':<18} {'matchup':<24} {'wins':<24} {'no winner':>9} {'turns':>7} {'sd':>6}")
+    for row in rows:
+        matchup = ' vs '.join(row['matchup'])
+        wins = ' / '.join(f"{rate:.0%}" for rate in row['win_rates'])
+        turns = row['turns']
+        print(f"{row['variant']:<18} {matchup:<24} {wins:<24} {row['no_winner_rate']:>9.0%} "
+              f"{turns['mean']:>7.1f} {turns['variance'] ** 0.5:>6.1f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
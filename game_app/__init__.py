@@ -1,3 +1,4 @@
+import os
 from flask import Flask
 
 def create_app():
@@ -9,13 +10,29 @@ def create_app():
     # package), we need to provide the correct relative path to it.
     # `index.html` is now served from the root by a route, so template_folder is not used.
     app = Flask(__name__, static_folder='../static')
+    # Games kept per client session: at most this many, each dropped after this many idle seconds
+    app.config['MAX_GAME_SESSIONS'] = int(os.environ.get('GEOM_MAX_GAME_SESSIONS', 64))
+    app.config['GAME_SESSION_TTL'] = float(os.environ.get('GEOM_GAME_SESSION_TTL', 30 * 60))
+    # Limits on each streamed or job simulation: wall-clock seconds and steps (0 = no limit).
+    # Requests may ask for less with `timeBudget` and `stepBudget`.
+    app.config['SIMULATION_TIME_BUDGET'] = float(os.environ.get('GEOM_SIMULATION_TIME_BUDGET', 600))
+    app.config['SIMULATION_STEP_BUDGET'] = int(os.environ.get('GEOM_SIMULATION_STEP_BUDGET', 0))
+    # Worker processes that run /api/jobs simulations, started with the first job
+    app.config['JOB_WORKERS'] = int(os.environ.get('GEOM_JOB_WORKERS', os.cpu_count() or 1))
+    # Compress every stream with gzip/deflate when the client accepts it. Off by default, as compressed
+    # frames are held back until the next flush; requests can still opt in with `compress`.
+    app.config['STREAM_COMPRESSION'] = bool(int(os.environ.get('GEOM_STREAM_COMPRESSION', 0)))
 
     # Import and initialize utilities
     from . import utils
     utils.calculate_startup_hash()
 
-    # Import game logic. The game instance is created when the module is imported.
+    # Import game logic. Each client session gets its own game (the module's `game` serves Pyodide).
     from . import game_logic
+    from .game_sessions import GameSessionManager
+    app.extensions['game_sessions'] = GameSessionManager(app.config['MAX_GAME_SESSIONS'], app.config['GAME_SESSION_TTL'])
+    from .jobs import JobQueue
+    app.extensions['jobs'] = JobQueue(app.config['JOB_WORKERS'])
 
     # Register Blueprints
     from . import routes
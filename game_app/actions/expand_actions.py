@@ -1,4 +1,3 @@
-import random
 import math
 from itertools import combinations
 from ..geometry import distance_sq, get_extended_border_point, clamp_and_round_point_coords, get_angle_bisector_vector
@@ -97,7 +96,7 @@ class ExpandActionsHandler:
         p2 = points[line_to_fracture['p2_id']]
 
         # Find a new point on the segment
-        ratio = random.uniform(0.25, 0.75)
+        ratio = self.game.rng.uniform(0.25, 0.75)
         new_x = p1['x'] + (p2['x'] - p1['x']) * ratio
         new_y = p1['y'] + (p2['y'] - p1['y']) * ratio
 
@@ -149,7 +148,7 @@ class ExpandActionsHandler:
 
         for i in range(10): # Try 10 deterministic angles
             angle = (i / 10.0) * 2 * math.pi
-            radius = self.state['grid_size'] * random.uniform(0.05, 0.15)
+            radius = self.state['grid_size'] * self.game.rng.uniform(0.05, 0.15)
             
             new_x = p_origin['x'] + math.cos(angle) * radius
             new_y = p_origin['y'] + math.sin(angle) * radius
@@ -181,7 +180,7 @@ class ExpandActionsHandler:
         p_origin = self.state['points'][p_origin_id]
 
         for _ in range(10): # try 10 random directions
-            angle = random.uniform(0, 2 * math.pi)
+            angle = self.game.rng.uniform(0, 2 * math.pi)
             p_dummy_end = {
                 'x': p_origin['x'] + math.cos(angle) * self.state['grid_size'] * 2,
                 'y': p_origin['y'] + math.sin(angle) * self.state['grid_size'] * 2
@@ -298,9 +297,9 @@ class ExpandActionsHandler:
             p_center = self.state['points'].get(p_center_id)
             if not p_center: continue
             
-            num_satellites = random.randint(3, 5)
-            radius = self.state['grid_size'] * random.uniform(0.15, 0.25)
-            angle_offset = random.uniform(0, 2 * math.pi)
+            num_satellites = self.game.rng.randint(3, 5)
+            radius = self.state['grid_size'] * self.game.rng.uniform(0.15, 0.25)
+            angle_offset = self.game.rng.uniform(0, 2 * math.pi)
             
             new_points_to_create = []
             valid_orbital = True
@@ -363,7 +362,7 @@ class ExpandActionsHandler:
         # Build adjacency list to find vertices
         adj_sets = self.game.query.get_team_adjacency_list(teamId)
         # Convert to list for sampling logic below
-        adj = {pid: list(neighbors) for pid, neighbors in adj_sets.items()}
+        adj = {pid: sorted(neighbors) for pid, neighbors in adj_sets.items()}
         
         points_map = self.state['points']
         possible_vertices = [pid for pid, neighbors in adj.items() if len(neighbors) >= 2]
@@ -387,7 +386,7 @@ class ExpandActionsHandler:
                 if not bisector_v: continue
 
                 # Spawn point a short distance along the bisector
-                growth_length = self.state['grid_size'] * random.uniform(0.1, 0.2)
+                growth_length = self.state['grid_size'] * self.game.rng.uniform(0.1, 0.2)
                 new_x = p_vertex['x'] + bisector_v['x'] * growth_length
                 new_y = p_vertex['y'] + bisector_v['y'] * growth_length
 
@@ -428,7 +427,7 @@ class ExpandActionsHandler:
                     lines_of_angle.append(l)
 
             if lines_of_angle:
-                line_to_strengthen = random.choice(lines_of_angle)
+                line_to_strengthen = self.game.rng.choice(lines_of_angle)
                 if self.game._strengthen_line(line_to_strengthen):
                      return {'success': True, 'type': 'bisect_fizzle_strengthen', 'strengthened_line': line_to_strengthen}
         
@@ -1,7 +1,5 @@
-import random
 import math
 from itertools import combinations
-from .. import game_data
 from ..geometry import (
     distance_sq, segments_intersect, get_segment_intersection_point,
     get_extended_border_point, is_ray_blocked,
@@ -151,8 +149,8 @@ class FightActionsHandler:
         enemy_points = self.game.query.get_vulnerable_enemy_points(teamId)
 
         points_map = self.state['points']
-        max_range_sq = (self.state['grid_size'] * game_data.GAME_PARAMETERS['PINCER_ATTACK_RANGE_FACTOR'])**2
-        pincer_angle_threshold = game_data.GAME_PARAMETERS['PINCER_ATTACK_ANGLE_COS']
+        max_range_sq = (self.state['grid_size'] * self.game.rules.parameters['PINCER_ATTACK_RANGE_FACTOR'])**2
+        pincer_angle_threshold = self.game.rules.parameters['PINCER_ATTACK_ANGLE_COS']
         
         pincer_candidates = list(combinations(team_point_ids, 2))
         # Prioritize pairs that are closer together, making for a tighter pincer
@@ -422,11 +420,11 @@ class FightActionsHandler:
         else:
             # --- Fallback Effect: Create Fissure ---
             grid_size = self.state['grid_size']
-            fissure_len = grid_size * game_data.GAME_PARAMETERS['LAUNCH_PAYLOAD_FISSURE_FACTOR']
+            fissure_len = grid_size * self.game.rules.parameters['LAUNCH_PAYLOAD_FISSURE_FACTOR']
             
             # Create fissure at a random location
-            center_x = random.uniform(fissure_len, grid_size - fissure_len)
-            center_y = random.uniform(fissure_len, grid_size - fissure_len)
+            center_x = self.game.rng.uniform(fissure_len, grid_size - fissure_len)
+            center_y = self.game.rng.uniform(fissure_len, grid_size - fissure_len)
             center_coords = {'x': center_x, 'y': center_y}
             
             new_fissure = self.game._create_random_fissure(center_coords, fissure_len, 3)
@@ -506,7 +504,7 @@ class FightActionsHandler:
             
         zap_vx, zap_vy = chosen_dir['x'], chosen_dir['y']
         
-        zap_range_sq = (self.state['grid_size'] * game_data.GAME_PARAMETERS['SENTRY_ZAP_RANGE_FACTOR'])**2
+        zap_range_sq = (self.state['grid_size'] * self.game.rules.parameters['SENTRY_ZAP_RANGE_FACTOR'])**2
         
         # Get list of vulnerable enemy points
         vulnerable_enemy_points = self.game.query.get_vulnerable_enemy_points(teamId)
@@ -665,7 +663,7 @@ class FightActionsHandler:
         if not potential_outcomes:
             if team_prisms:
                 # Fallback if no paths could be calculated at all.
-                return self._refraction_beam_fallback_strengthen(teamId, random.choice(team_prisms))
+                return self._refraction_beam_fallback_strengthen(teamId, self.game.rng.choice(team_prisms))
             return {'success': False, 'reason': 'no valid refraction paths or prisms found'}
 
         # Prioritize hits over misses
@@ -734,6 +732,7 @@ class FightActionsHandler:
                 territory_to_cleanse = best_target['territory_to_cleanse']
                 cleansed_team_name = self.state['teams'][territory_to_cleanse['teamId']]['name']
                 self.state['territories'].remove(territory_to_cleanse)
+                self.game.mark_structures_changed()
                 return {
                     'success': True, 'type': 'purify_territory',
                     'cleansed_territory': territory_to_cleanse, 'purifier_point_ids': best_target['purifier_point_ids'],
@@ -804,6 +803,7 @@ class FightActionsHandler:
                 self.state['isolated_points'] = {}
             
             self.state['isolated_points'][target_point_id] = 4 # Isolated for 4 turns
+            self.game.mark_structures_changed()
             
             target_team_name = self.state['teams'][target_point['teamId']]['name']
             return {
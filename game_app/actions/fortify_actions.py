@@ -1,4 +1,3 @@
-import random
 import math
 from itertools import combinations
 from ..geometry import distance_sq, reflect_point, rotate_point, is_rectangle, is_regular_pentagon, points_centroid, clamp_and_round_point_coords, get_edges_by_distance, polygon_area
@@ -18,7 +17,7 @@ class FortifyActionsHandler:
 
         for _ in range(num_attempts):
             # 1. Select axis
-            axis_p_ids = random.sample(team_point_ids, 2)
+            axis_p_ids = self.game.rng.sample(team_point_ids, 2)
             p_axis1 = self.state['points'][axis_p_ids[0]]
             p_axis2 = self.state['points'][axis_p_ids[1]]
             if distance_sq(p_axis1, p_axis2) < 4.0: continue
@@ -27,8 +26,8 @@ class FortifyActionsHandler:
             other_point_ids = [pid for pid in team_point_ids if pid not in axis_p_ids]
             if not other_point_ids: continue
             
-            num_to_mirror = min(len(other_point_ids), random.randint(1, 2))
-            points_to_mirror_ids = random.sample(other_point_ids, num_to_mirror)
+            num_to_mirror = min(len(other_point_ids), self.game.rng.randint(1, 2))
+            points_to_mirror_ids = self.game.rng.sample(other_point_ids, num_to_mirror)
             
             new_points_to_create = []
             grid_size = self.state['grid_size']
@@ -127,7 +126,7 @@ class FortifyActionsHandler:
             if p2_id in existing_purifier_points: continue
             
             p2 = points[p2_id]
-            neighbors = list(adj.get(p2_id, []))
+            neighbors = sorted(adj.get(p2_id, []))
             if len(neighbors) < 2: continue
             
             # 2. Iterate over pairs of neighbors to form a corner (p1-p2-p3)
@@ -155,7 +154,7 @@ class FortifyActionsHandler:
                 diag_len_sq = side_len_sq * phi_sq
                 
                 # Find candidates for p5 (connected to p1)
-                for p5_id in adj.get(p1_id, []):
+                for p5_id in sorted(adj.get(p1_id, [])):
                     if p5_id == p2_id or p5_id in existing_purifier_points: continue
                     p5 = points[p5_id]
                     if abs(distance_sq(p1, p5) - side_len_sq) > side_tolerance_sq: continue
@@ -163,7 +162,7 @@ class FortifyActionsHandler:
                     
                     # Find candidates for p4 (connected to p3 and p5)
                     p4_candidates = adj.get(p3_id, set()).intersection(adj.get(p5_id, set()))
-                    for p4_id in p4_candidates:
+                    for p4_id in sorted(p4_candidates):
                         if p4_id in {p1_id, p2_id, p3_id, p5_id} or p4_id in existing_purifier_points: continue
                         p4 = points[p4_id]
 
@@ -249,6 +248,7 @@ class FortifyActionsHandler:
                 'point_ids': list(triangle_to_claim)
             }
             self.state['territories'].append(new_territory)
+            self.game.mark_structures_changed()
             return {'success': True, 'type': 'claim_territory', 'territory': new_territory}
         else:
             # --- Fallback Effect: Reinforce an existing territory ---
@@ -282,7 +282,7 @@ class FortifyActionsHandler:
             
             degrees = self.game.query.get_team_degrees(teamId)
             # Find the fortified point with the highest degree
-            point_to_reinforce_id = max(fortified_point_ids, key=lambda pid: degrees.get(pid, 0), default=None)
+            point_to_reinforce_id = max(sorted(fortified_point_ids), key=lambda pid: degrees.get(pid, 0), default=None)
 
             if not point_to_reinforce_id:
                 return {'success': False, 'reason': 'could not find a fortified point to reinforce'}
@@ -309,6 +309,7 @@ class FortifyActionsHandler:
             **chosen_bastion
         }
         self.state['bastions'][bastion_id] = new_bastion
+        self.game.mark_structures_changed()
 
         # Collect line IDs for the visual effect
         all_lines_by_points = {tuple(sorted((l['p1_id'], l['p2_id']))): l['id'] for l in self.state['lines']}
@@ -342,6 +343,7 @@ class FortifyActionsHandler:
             
             if 'monoliths' not in self.state: self.state['monoliths'] = {}
             self.state['monoliths'][monolith_id] = new_monolith
+            self.game.mark_structures_changed()
             
             return {'success': True, 'type': 'form_monolith', 'monolith': new_monolith}
         elif fallback_candidates:
@@ -578,6 +580,7 @@ class FortifyActionsHandler:
         # Create the anchor
         anchor_duration = 5 # turns
         self.state['anchors'][p_to_anchor_id] = {'teamId': teamId, 'turns_left': anchor_duration}
+        self.game.mark_structures_changed()
 
         anchor_point = self.state['points'][p_to_anchor_id]
 
@@ -597,6 +600,7 @@ class FortifyActionsHandler:
             points_map = self.state['points']
             chosen_purifier_data = max(possible_purifiers, key=lambda p_data: polygon_area([points_map[pid] for pid in p_data['point_ids']]))
             self.state.setdefault('purifiers', {}).setdefault(teamId, []).append(chosen_purifier_data)
+            self.game.mark_structures_changed()
             return {'success': True, 'type': 'form_purifier', 'purifier': chosen_purifier_data}
         else:
             # --- Fallback Effect: Reinforce a potential structure ---
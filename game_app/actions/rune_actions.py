@@ -1,4 +1,3 @@
-import random
 import math
 from itertools import combinations
 from ..geometry import (
@@ -172,7 +171,7 @@ class RuneActionsHandler:
 
                     point['x'] = round(max(0, min(grid_size - 1, point['x'] + (dx/dist) * push_distance)))
                     point['y'] = round(max(0, min(grid_size - 1, point['y'] + (dy/dist) * push_distance)))
-                    pushed_points.append(point.copy())
+                    pushed_points.append(point if self.game.quiet else point.copy())
             
             return {
                 'success': True, 'type': 'area_shield_fizzle_push', 'pushed_points_count': len(pushed_points),
@@ -227,7 +226,7 @@ class RuneActionsHandler:
                 new_y = point['y'] + (dy / dist) * push_distance
                 point['x'] = round(max(0, min(grid_size - 1, new_x)))
                 point['y'] = round(max(0, min(grid_size - 1, new_y)))
-                pushed_points.append(point.copy())
+                pushed_points.append(point if self.game.quiet else point.copy())
 
             return {
                 'success': True, 'type': 'rune_shield_pulse', 'pushed_points_count': len(pushed_points),
@@ -248,7 +247,7 @@ class RuneActionsHandler:
                     new_y = point['y'] + (dy / dist) * pull_distance
                     point['x'] = round(max(0, min(grid_size - 1, new_x)))
                     point['y'] = round(max(0, min(grid_size - 1, new_y)))
-                    pulled_points.append(point.copy())
+                    pulled_points.append(point if self.game.quiet else point.copy())
             
             return {
                 'success': True, 'type': 'shield_pulse_fizzle_pull', 'pulled_points': pulled_points,
@@ -446,6 +445,7 @@ class RuneActionsHandler:
             p_vertex = points_map[rune['vertex_id']]
             target_point = min(possible_targets, key=lambda p: distance_sq(p_vertex, p))
             self.state['stasis_points'][target_point['id']] = 3 # 3 turns
+            self.game.mark_structures_changed()
             target_team_name = self.state['teams'][target_point['teamId']]['name']
             return {
                 'success': True, 'type': 'rune_hourglass_stasis',
@@ -467,6 +467,7 @@ class RuneActionsHandler:
                 return {'success': False, 'reason': 'chosen anchor point for fallback does not exist'}
 
             self.state['anchors'][p_to_anchor_id] = {'teamId': teamId, 'turns_left': 3}
+            self.game.mark_structures_changed()
 
             return {
                 'success': True, 'type': 'hourglass_fizzle_anchor',
@@ -520,8 +521,9 @@ class RuneActionsHandler:
             destroyed_point_data, destroyed_wonder_data = None, None
             if target_type == 'wonder':
                 destroyed_wonder_data = self.state['wonders'].pop(target_wonder['id'])
-                team_name = self.state['teams'][destroyed_wonder_data['teamId']]['name']
-                self.state['game_log'].append({'teamId': teamId, 'message': f"The Focus Beam obliterated the Chronos Spire of Team {team_name}!", 'short_message': '[WONDER DESTROYED!]'})
+                if not self.game.quiet:
+                    team_name = self.state['teams'][destroyed_wonder_data['teamId']]['name']
+                    self.game.log.append({'teamId': teamId, 'message': f"The Focus Beam obliterated the Chronos Spire of Team {team_name}!", 'short_message': '[WONDER DESTROYED!]'})
             else:
                 destroyed_point_data = self.game._delete_point_and_connections(target_point['id'], aggressor_team_id=teamId)
                 if not destroyed_point_data:
@@ -878,7 +880,7 @@ class RuneActionsHandler:
                  'success': True, 'type': 'raise_barricade_fizzle', 'rune_points': rune_p_ids_tuple
             }
             
-        diag_to_use = random.choice(diag_pairs)
+        diag_to_use = self.game.rng.choice(diag_pairs)
         p1 = points_map.get(diag_to_use[0])
         p2 = points_map.get(diag_to_use[1])
 
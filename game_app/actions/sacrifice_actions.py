@@ -1,4 +1,3 @@
-import random
 import math
 from ..geometry import (
     distance_sq, clamp_and_round_point_coords, points_centroid, segments_intersect,
@@ -140,7 +139,7 @@ class SacrificeActionsHandler:
             return min(distance_sq(midpoint, ep) for ep in vulnerable_enemies)
 
         line_to_sac = min(eligible_lines, key=get_line_proximity_to_vulnerable)
-        p_to_move_id, p_to_anchor_id = random.choice([
+        p_to_move_id, p_to_anchor_id = self.game.rng.choice([
             (line_to_sac['p1_id'], line_to_sac['p2_id']),
             (line_to_sac['p2_id'], line_to_sac['p1_id'])
         ])
@@ -159,7 +158,7 @@ class SacrificeActionsHandler:
         new_coords = None
         grid_size = self.state['grid_size']
         for _ in range(25): # Try several times
-            candidate_coords = {'x': random.randint(0, grid_size - 1), 'y': random.randint(0, grid_size - 1)}
+            candidate_coords = {'x': self.game.rng.randint(0, grid_size - 1), 'y': self.game.rng.randint(0, grid_size - 1)}
             is_valid, _ = self.game.is_spawn_location_valid(candidate_coords, teamId, min_dist_sq=1.0)
             if is_valid:
                 new_coords = candidate_coords
@@ -177,6 +176,7 @@ class SacrificeActionsHandler:
             # --- Fallback Effect: Create Anchor ---
             anchor_duration = 3 # A shorter anchor for a fizzled action
             self.state['anchors'][p_to_anchor_id] = {'teamId': teamId, 'turns_left': anchor_duration}
+            self.game.mark_structures_changed()
             anchor_point = self.state['points'][p_to_anchor_id]
             return {
                 'success': True, 'type': 'phase_shift_fizzle_anchor',
@@ -235,6 +235,7 @@ class SacrificeActionsHandler:
         # --- Sacrifice the territory ---
         # Remove territory object
         self.state['territories'].remove(territory_to_scorch)
+        self.game.mark_structures_changed()
         
         # Delete points and their connected lines
         sacrificed_points_data = []
@@ -374,7 +375,7 @@ class SacrificeActionsHandler:
             return {'success': False, 'reason': 'line points for sacrifice no longer exist'}
         
         # Sacrifice one point, keep the other
-        p_to_sac_id, p_to_keep_id = random.choice([(p1_id, p2_id), (p2_id, p1_id)])
+        p_to_sac_id, p_to_keep_id = self.game.rng.choice([(p1_id, p2_id), (p2_id, p1_id)])
 
         p1_orig = points[p1_id].copy()
         p2_orig = points[p2_id].copy()
@@ -453,9 +454,9 @@ class SacrificeActionsHandler:
         if not possible_bastions:
             return {'success': False, 'reason': 'no bastion with crossing lines found'}
         
-        bastion_to_pulse = random.choice(possible_bastions)
+        bastion_to_pulse = self.game.rng.choice(possible_bastions)
         bastion_id = bastion_to_pulse['id']
-        prong_to_sac_id = random.choice(bastion_to_pulse['prong_ids'])
+        prong_to_sac_id = self.game.rng.choice(bastion_to_pulse['prong_ids'])
         
         points_map = self.state['points']
         if prong_to_sac_id not in points_map:
@@ -717,7 +718,7 @@ class SacrificeActionsHandler:
         
         # We only need 5 branches, if there are more, pick 5.
         if len(branch_ids) > 5:
-            branch_ids = random.sample(branch_ids, 5)
+            branch_ids = self.game.rng.sample(branch_ids, 5)
 
         points_to_sac_ids = [center_id] + branch_ids
         
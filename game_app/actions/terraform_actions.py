@@ -1,4 +1,3 @@
-import random
 import math
 from ..geometry import distance_sq, points_centroid
 
@@ -25,20 +24,20 @@ class TerraformActionsHandler:
         
         # Create a long fissure, e.g., from one border to another
         borders = [
-            {'x': 0, 'y': random.randint(0, grid_size - 1)},
-            {'x': grid_size - 1, 'y': random.randint(0, grid_size - 1)},
-            {'x': random.randint(0, grid_size - 1), 'y': 0},
-            {'x': random.randint(0, grid_size - 1), 'y': grid_size - 1}
+            {'x': 0, 'y': self.game.rng.randint(0, grid_size - 1)},
+            {'x': grid_size - 1, 'y': self.game.rng.randint(0, grid_size - 1)},
+            {'x': self.game.rng.randint(0, grid_size - 1), 'y': 0},
+            {'x': self.game.rng.randint(0, grid_size - 1), 'y': grid_size - 1}
         ]
-        p1 = random.choice(borders)
+        p1 = self.game.rng.choice(borders)
         
         opposite_borders = []
-        if p1['x'] == 0: opposite_borders.append({'x': grid_size - 1, 'y': random.randint(0, grid_size - 1)})
-        if p1['x'] == grid_size - 1: opposite_borders.append({'x': 0, 'y': random.randint(0, grid_size - 1)})
-        if p1['y'] == 0: opposite_borders.append({'x': random.randint(0, grid_size - 1), 'y': grid_size - 1})
-        if p1['y'] == grid_size - 1: opposite_borders.append({'x': random.randint(0, grid_size - 1), 'y': 0})
+        if p1['x'] == 0: opposite_borders.append({'x': grid_size - 1, 'y': self.game.rng.randint(0, grid_size - 1)})
+        if p1['x'] == grid_size - 1: opposite_borders.append({'x': 0, 'y': self.game.rng.randint(0, grid_size - 1)})
+        if p1['y'] == 0: opposite_borders.append({'x': self.game.rng.randint(0, grid_size - 1), 'y': grid_size - 1})
+        if p1['y'] == grid_size - 1: opposite_borders.append({'x': self.game.rng.randint(0, grid_size - 1), 'y': 0})
         
-        p2 = random.choice(opposite_borders) if opposite_borders else random.choice(borders)
+        p2 = self.game.rng.choice(opposite_borders) if opposite_borders else self.game.rng.choice(borders)
 
         fissure_id = self.game._generate_id('f')
         new_fissure = { 'id': fissure_id, 'p1': p1, 'p2': p2, 'turns_left': 8 }
@@ -79,6 +78,7 @@ class TerraformActionsHandler:
         }
         
         self.state.setdefault('rift_spires', {})[spire_id] = new_spire
+        self.game.mark_structures_changed()
 
         return {
             'success': True,
@@ -0,0 +1,41 @@
+# game_app/cancellation.py
+import time
+
+
+class CancellationToken:
+    """
+    Stops a running simulation from outside, or once it has used up its budget.
+
+    Game.run_next_action() checks the token before each action; once the token gives a
+    reason, the game ends with that reason as its victory condition, so a cancelled or
+    truncated run still ends with a final frame that says why. cancel() may be called from
+    any thread. The budget is `max_seconds` of wall-clock time from the token's creation
+    and/or `max_steps` actions (None for no limit).
+    """
+
+    def __init__(self, max_seconds=None, max_steps=None, clock=time.monotonic):
+        self.max_seconds = max_seconds
+        self.max_steps = max_steps
+        self._clock = clock
+        self._started = clock()
+        self._steps = 0
+        self.reason = None
+
+    @property
+    def cancelled(self):
+        return self.reason is not None
+
+    def cancel(self, reason="Cancelled."):
+        """Makes the simulation stop before its next action. The first reason given is kept."""
+        if self.reason is None:
+            self.reason = reason
+
+    def check(self):
+        """Called before each action. Returns why the simulation must stop, or None to go on."""
+        if self.reason is None:
+            if self.max_steps is not None and self._steps >= self.max_steps:
+                self.reason = f"Halted: step budget of {self.max_steps} steps used up."
+            elif self.max_seconds is not None and self._clock() - self._started >= self.max_seconds:
+                self.reason = f"Halted: time budget of {self.max_seconds:g} s used up."
+        self._steps += 1
+        return self.reason
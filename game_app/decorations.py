@@ -0,0 +1,92 @@
+# game_app/decorations.py
+import itertools
+import json
+from collections import defaultdict
+
+from . import structure_data
+
+# State keys that point flags are derived from (see 'frontend_flag_key(s)' in STRUCTURE_DEFINITIONS).
+FLAG_SOURCE_KEYS = tuple(sorted({
+    definition['state_key'] for definition in structure_data.STRUCTURE_DEFINITIONS.values()
+    if definition.get('frontend_flag_key') or definition.get('frontend_flag_keys')
+}))
+
+
+def _flag_sources_key(state):
+    """Returns a string that changes whenever any structure that point flags come from changes."""
+    return json.dumps([state.get(key) for key in FLAG_SOURCE_KEYS], separators=(',', ':'), default=sorted)
+
+
+def _bastion_line_pairs(state):
+    """Returns the (p1_id, p2_id) pairs, in both orders, that a line needs to join to be a bastion line."""
+    pairs = set()
+    for bastion in state.get('bastions', {}).values():
+        core_id = bastion['core_id']
+        for prong_id in bastion['prong_ids']:
+            pairs.add((core_id, prong_id))
+            pairs.add((prong_id, core_id))
+    return pairs
+
+
+class DecorationCache:
+    """
+    Point flags and line decorations for frontend frames, kept across frames.
+
+    Point flags come from walking every stored structure, but structures change
+    far less often than points and lines do. The cache keeps the flags as a
+    {point_id: [flag_name, ...]} index, together with the point pairs that bastion
+    lines join, and only rebuilds them (bumping `version`) when the structures change.
+
+    For a game's live state, the caller passes the game's structure version, which
+    is bumped wherever structures are written (see Game.mark_structures_changed),
+    so checking the cache costs nothing. Other frames, such as recorded or replayed
+    ones, are keyed by the value of their structures instead.
+    Each cache entry is replaced as a single tuple and versions are never reused,
+    so frames can be augmented from several threads at once without a lock.
+    """
+
+    def __init__(self):
+        self._versions = itertools.count(1)
+        self._flags = (None, {}, set(), 0) # (key, {point_id: [flag_name, ...]}, bastion line pairs, version)
+
+    @property
+    def version(self):
+        return self._flags[3]
+
+    def _refresh(self, state, compute_flags, structure_version):
+        """Returns the per-point flag index and bastion line pairs, rebuilding them if the structures have changed."""
+        key = ('live', structure_version) if structure_version is not None else _flag_sources_key(state)
+        cached = self._flags
+        if key == cached[0]:
+            return cached[1], cached[2]
+        flags_by_point = defaultdict(list)
+        for flag_name, point_ids in compute_flags().items():
+            for pid in point_ids:
+                flags_by_point[pid].append(flag_name)
+        cached = self._flags = (key, dict(flags_by_point), _bastion_line_pairs(state), next(self._versions))
+        return cached[1], cached[2]
+
+    def augment(self, state, compute_flags, structure_version=None):
+        """
+        Returns the frame's (lines, points) as new dicts with their frontend decorations.
+        `compute_flags` returns {flag_name: set of point IDs} for `state` (see Game._get_all_point_flags).
+        `structure_version` is the game's structure version if `state` is its live state, else None.
+        """
+        flags_by_point, bastion_pairs = self._refresh(state, compute_flags, structure_version)
+
+        points = {pid: point.copy() for pid, point in state['points'].items()}
+        for pid, flag_names in flags_by_point.items():
+            point = points.get(pid)
+            if point is not None:
+                for flag_name in flag_names:
+                    point[flag_name] = True
+
+        shields = state['shields']
+        line_strengths = state.get('line_strengths', {})
+        augmented_lines = [
+            {**line, 'is_shielded': line.get('id') in shields,
+             'is_bastion_line': bool(bastion_pairs) and (line['p1_id'], line['p2_id']) in bastion_pairs,
+             'strength': line_strengths.get(line.get('id'), 0)}
+            for line in state['lines']
+        ]
+        return augmented_lines, points
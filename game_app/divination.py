@@ -0,0 +1,152 @@
+# game_app/divination.py
+from .cancellation import CancellationToken
+from .game_logic import Game
+from .rules import GameRules
+
+# Interpretation stats whose distribution over a batch of runs is reported per team.
+DIVINATION_STATS = ('controlled_area', 'hull_area', 'triangles', 'line_length')
+
+# Victory condition kinds, by how the condition text starts, for runs no team won.
+# Runs that a team won are counted as 'sole_survivor' or 'wonder'.
+_DRAW_KINDS = (
+    ('Max turns', 'max_turns'),
+    ('Stalemate', 'stalemate'),
+    ('Extinction', 'extinction'),
+    ('Halted', 'halted'),
+    ('Cancelled', 'halted'),
+)
+
+_game = None # The quiet Game a worker process runs divination runs with
+
+
+def _winner(state):
+    """Returns (winning team ID, victory kind) of a finished game, with None as the team if nobody won."""
+    for wonder in state.get('wonders', {}).values():
+        if wonder['type'] == 'ChronosSpire' and wonder['turns_to_victory'] <= 0:
+            return wonder['teamId'], 'wonder'
+    condition = state.get('victory_condition') or ''
+    teams_with_points = {p['teamId'] for p in state['points'].values()}
+    if len(teams_with_points) == 1 and condition.endswith('is the sole survivor.'):
+        return next(iter(teams_with_points)), 'sole_survivor'
+    kind = next((kind for prefix, kind in _DRAW_KINDS if condition.startswith(prefix)), 'other')
+    return None, kind
+
+
+def run_divination(setup, seed, budget=(None, None), rules=None):
+    """
+    Runs one game of a divination batch in quiet mode without keeping any history, and
+    returns only a compact record of its outcome: the winner, the kind of victory condition,
+    its length and each team's DIVINATION_STATS at the end. Runs in a worker process.
+    The game is played by `rules` (a GameRules), or by the default rules. The record's seed
+    replays the run in any process: ReplayEngine(setup, seed, rules=rules) plays the same game.
+    """
+    global _game
+    if _game is None:
+        _game = Game(quiet=True)
+    _game.rules = rules or GameRules()
+    state = None
+    for state in _game.iter_simulation(
+        setup['teams'], setup['points'], setup['max_turns'], setup['grid_size'], seed=seed,
+        cancel_token=CancellationToken(*budget)
+    ):
+        pass
+    winner, kind = _winner(state)
+    interpretation = _game.calculate_interpretation(state)
+    return {
+        'seed': seed,
+        'winner': winner,
+        'victory_condition': kind,
+        'turns': state['turn'],
+        'steps': state['step'],
+        'teams': {
+            teamId: {stat: team_stats[stat] for stat in DIVINATION_STATS}
+            for teamId, team_stats in interpretation.items()
+        },
+    }
+
+
+class RunningStats:
+    """Mean and variance of a stream of numbers, updated one value at a time (Welford's method)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Population variance of the values so far (0 for fewer than two)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {'mean': round(self.mean, 4), 'variance': round(self.variance, 4)}
+
+
+class DivinationAggregate:
+    """
+    Distributions over the runs of a divination batch, built up from run_divination()
+    records as they arrive: how often each team won (and how often nobody did), how
+    often each kind of victory condition ended a game, and the mean and variance of
+    each team's DIVINATION_STATS and of the game length. It also keeps the seed and outcome
+    of every run, so that single runs can be replayed.
+    """
+
+    def __init__(self, team_ids, runs):
+        self.runs = runs
+        self.completed = 0
+        self.failed = 0
+        self.last_error = None
+        self.wins = {teamId: 0 for teamId in team_ids}
+        self.no_winner = 0
+        self.victory_conditions = {}
+        self.turns = RunningStats()
+        self.stats = {teamId: {stat: RunningStats() for stat in DIVINATION_STATS} for teamId in team_ids}
+        self.outcomes = [] # [seed, winner, victory kind, turns] of each finished run
+
+    def add(self, record):
+        """Adds the record of a finished run."""
+        self.completed += 1
+        if record['winner'] is None:
+            self.no_winner += 1
+        else:
+            self.wins[record['winner']] = self.wins.get(record['winner'], 0) + 1
+        kind = record['victory_condition']
+        self.victory_conditions[kind] = self.victory_conditions.get(kind, 0) + 1
+        self.turns.add(record['turns'])
+        self.outcomes.append([record['seed'], record['winner'], kind, record['turns']])
+        for teamId, team_stats in record['teams'].items():
+            running = self.stats.setdefault(teamId, {stat: RunningStats() for stat in DIVINATION_STATS})
+            for stat in DIVINATION_STATS:
+                running[stat].add(team_stats[stat])
+
+    def add_failure(self, error):
+        """Counts a run that raised `error` instead of finishing."""
+        self.failed += 1
+        self.last_error = str(error)
+
+    def to_dict(self, outcomes=False):
+        """Returns the distributions so far, and with `outcomes`, the outcome of every run."""
+        completed = self.completed or 1 # Rates are 0 until the first run is in
+        result = {
+            'runs': self.runs,
+            'completed': self.completed,
+            'failed': self.failed,
+            'last_error': self.last_error,
+            'win_rates': {teamId: round(wins / completed, 4) for teamId, wins in self.wins.items()},
+            'no_winner_rate': round(self.no_winner / completed, 4),
+            'victory_conditions': {kind: round(count / completed, 4) for kind, count in self.victory_conditions.items()},
+            'turns': self.turns.to_dict(),
+            'stats': {
+                teamId: {stat: running.to_dict() for stat, running in team_stats.items()}
+                for teamId, team_stats in self.stats.items()
+            },
+        }
+        if outcomes:
+            result['outcomes'] = list(self.outcomes)
+        return result
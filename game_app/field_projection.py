@@ -0,0 +1,44 @@
+# game_app/field_projection.py
+
+
+def _parse_keys(value):
+    """Accepts a list of keys or a comma-separated string. Returns a frozenset, or None if no keys were given."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple, set, frozenset)) or not all(isinstance(key, str) for key in value):
+        raise TypeError("fields and exclude must be lists of frame keys or comma-separated strings.")
+    return frozenset(key.strip() for key in value if key.strip())
+
+
+class FieldProjection:
+    """
+    Decides which keys of an augmented frame are computed and sent to the client.
+
+    With `fields`, only those keys are kept; `exclude` then drops keys from what is left.
+    Keys are named as they appear in the frame (e.g. 'interpretation', 'live_stats',
+    'game_log' or, in streams, 'log_entries'). Augmentation steps whose keys are not
+    wanted are skipped. Call the projection with a key to test it.
+    """
+
+    def __init__(self, fields=None, exclude=None):
+        self.fields = _parse_keys(fields)
+        self.exclude = _parse_keys(exclude) or frozenset()
+
+    @classmethod
+    def from_payload(cls, data):
+        """
+        Builds a projection from request options (`fields`, `exclude`).
+        Raises TypeError if they are invalid.
+        """
+        return cls(fields=data.get('fields'), exclude=data.get('exclude'))
+
+    @property
+    def is_full(self):
+        """True if every key is kept."""
+        return self.fields is None and not self.exclude
+
+    def __call__(self, key):
+        """Returns True if the frame key should be kept."""
+        return (self.fields is None or key in self.fields) and key not in self.exclude
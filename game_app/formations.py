@@ -13,7 +13,11 @@ class FormationManager:
         pass # This manager is stateless.
 
     def get_adjacency_list(self, team_point_ids, team_lines):
-        """Builds an adjacency list (pid -> set of neighbor pids)."""
+        """
+        Builds an adjacency list (pid -> set of neighbor pids).
+        Sets of string IDs iterate in an order that changes with the process's hash seed,
+        so candidates are taken from them in sorted() order wherever the pick matters.
+        """
         adj = {pid: set() for pid in team_point_ids}
         for line in team_lines:
             if line['p1_id'] in adj and line['p2_id'] in adj:
@@ -61,7 +65,7 @@ class FormationManager:
                 continue
             
             p1 = all_points[p1_id]
-            neighbors_of_p1 = list(adj[p1_id])
+            neighbors_of_p1 = sorted(adj[p1_id])
 
             # Check pairs of neighbors for a right angle
             for i in range(len(neighbors_of_p1)):
@@ -83,7 +87,7 @@ class FormationManager:
                     p4_id = None
                     # The fourth point must be connected to both p2 and p3
                     p4_candidates = adj.get(p2_id, set()).intersection(adj.get(p3_id, set()))
-                    for pid_candidate in p4_candidates:
+                    for pid_candidate in sorted(p4_candidates):
                         if pid_candidate != p1_id:
                             p_candidate = all_points.get(pid_candidate)
                             # Check if the candidate point is where we expect it
@@ -115,7 +119,7 @@ class FormationManager:
         adj = self.get_adjacency_list(team_point_ids, team_lines)
         
         i_runes = []
-        endpoints = {pid for pid, neighbors in adj.items() if len(neighbors) == 1}
+        endpoints = sorted(pid for pid, neighbors in adj.items() if len(neighbors) == 1)
         visited_in_a_path = set()
 
         for start_pid in endpoints:
@@ -208,7 +212,7 @@ class FormationManager:
 
         all_triangles_pids = self._find_all_triangles(team_point_ids, team_lines)
 
-        for tri_ids in all_triangles_pids:
+        for tri_ids in sorted(all_triangles_pids):
             if any(pid in used_points for pid in tri_ids): continue
             
             tri_points = [all_points.get(pid) for pid in tri_ids]
@@ -245,14 +249,14 @@ class FormationManager:
 
         for center_candidate_id in team_point_ids:
             if center_candidate_id in used_points: continue
-            neighbors = list(adj.get(center_candidate_id, set()))
+            neighbors = sorted(adj.get(center_candidate_id, set()))
             if len(neighbors) < min_cycle: continue
 
             for cycle_len in range(min_cycle, max_cycle + 1):
                 if len(neighbors) < cycle_len: continue
                 
                 for cycle_candidate_ids in combinations(neighbors, cycle_len):
-                    sub_adj = {pid: [opid for opid in adj.get(pid, set()) if opid in cycle_candidate_ids] for pid in cycle_candidate_ids}
+                    sub_adj = {pid: [opid for opid in sorted(adj.get(pid, set())) if opid in cycle_candidate_ids] for pid in cycle_candidate_ids}
                     if not all(len(sub_adj[pid]) == 2 for pid in cycle_candidate_ids): continue
 
                     start_node, ordered_cycle, prev_node = cycle_candidate_ids[0], [], None
@@ -270,7 +274,7 @@ class FormationManager:
                     
                     all_star_points = set(ordered_cycle) | {center_candidate_id}
                     if not used_points.intersection(all_star_points):
-                        found_stars.append({'center_id': center_candidate_id, 'cycle_ids': ordered_cycle, 'all_points': list(all_star_points)})
+                        found_stars.append({'center_id': center_candidate_id, 'cycle_ids': ordered_cycle, 'all_points': sorted(all_star_points)})
                         used_points.update(all_star_points)
                         break
                 if center_candidate_id in used_points: break
@@ -296,7 +300,7 @@ class FormationManager:
             if not (tuple(sorted((p_apex['id'], p_base[0]['id']))) in existing_lines_set and tuple(sorted((p_apex['id'], p_base[1]['id']))) in existing_lines_set):
                 continue
             
-            for handle_candidate_id in adj.get(p_apex['id'], set()):
+            for handle_candidate_id in sorted(adj.get(p_apex['id'], set())):
                 if handle_candidate_id in (p_base[0]['id'], p_base[1]['id']): continue
                 
                 p_handle = all_points.get(handle_candidate_id)
@@ -353,7 +357,7 @@ class FormationManager:
             p_mid = all_points.get(mid_id)
             if not p_mid: continue
             
-            neighbors = list(neighbors_set)
+            neighbors = sorted(neighbors_set)
 
             for p_stem1_id, p_stem2_id in combinations(neighbors, 2):
                 p_stem1, p_stem2 = all_points.get(p_stem1_id), all_points.get(p_stem2_id)
@@ -379,7 +383,7 @@ class FormationManager:
                     if cos_theta_sq < 0.05:
                         rune_points = {mid_id, p_stem1_id, p_stem2_id, p_head_id}
                         if not used_points.intersection(rune_points):
-                            t_runes.append({'mid_id': mid_id, 'stem1_id': p_stem1_id, 'stem2_id': p_stem2_id, 'head_id': p_head_id, 'all_points': list(rune_points)})
+                            t_runes.append({'mid_id': mid_id, 'stem1_id': p_stem1_id, 'stem2_id': p_stem2_id, 'head_id': p_head_id, 'all_points': sorted(rune_points)})
                             used_points.update(rune_points)
                             break
                 if mid_id in used_points: break
@@ -395,7 +399,7 @@ class FormationManager:
         plus_runes, used_points = [], set()
         for center_id in team_point_ids:
             if center_id in used_points: continue
-            neighbors = list(adj.get(center_id, set()))
+            neighbors = sorted(adj.get(center_id, set()))
             if len(neighbors) < 4: continue
 
             p_center = all_points.get(center_id)
@@ -431,7 +435,7 @@ class FormationManager:
                     if (v_line1_x * v_line2_x + v_line1_y * v_line2_y)**2 / (mag1_sq * mag2_sq) < 0.05:
                         rune_points = {center_id, p_arm1_id, p_arm2_id, p_arm3_id, p_arm4_id}
                         if not used_points.intersection(rune_points):
-                            plus_runes.append({'center_id': center_id, 'arm_ids': list(arm_candidates_ids), 'all_points': list(rune_points)})
+                            plus_runes.append({'center_id': center_id, 'arm_ids': list(arm_candidates_ids), 'all_points': sorted(rune_points)})
                             used_points.update(rune_points)
                             break
                 if center_id in used_points: break
@@ -449,7 +453,7 @@ class FormationManager:
             if len(adj.get(p1_id, [])) < 2: continue
             
             p1 = all_points[p1_id]
-            neighbors_of_p1 = list(adj[p1_id])
+            neighbors_of_p1 = sorted(adj[p1_id])
             
             for i in range(len(neighbors_of_p1)):
                 for j in range(i + 1, len(neighbors_of_p1)):
@@ -461,7 +465,7 @@ class FormationManager:
 
                     p4_id = None
                     p4_candidates = adj.get(p2_id, set()).intersection(adj.get(p3_id, set()))
-                    for pid_candidate in p4_candidates:
+                    for pid_candidate in sorted(p4_candidates):
                         if pid_candidate != p1_id:
                             p_candidate = all_points.get(pid_candidate)
                             if p_candidate and distance_sq(p_candidate, p4_coords) < 0.5:
@@ -488,7 +492,7 @@ class FormationManager:
         for vertex_id in team_point_ids:
             if vertex_id in used_points: continue
             
-            neighbors = list(adj.get(vertex_id, []))
+            neighbors = sorted(adj.get(vertex_id, []))
             if len(neighbors) < 4: continue
 
             triangles_from_vertex = [set([p1_id, p2_id]) for p1_id, p2_id in combinations(neighbors, 2) if p2_id in adj.get(p1_id, set())]
@@ -498,7 +502,7 @@ class FormationManager:
                 if not tri1_others.intersection(tri2_others):
                     all_rune_points = {vertex_id}.union(tri1_others).union(tri2_others)
                     if not used_points.intersection(all_rune_points):
-                        hourglass_runes.append({'vertex_id': vertex_id, 'all_points': list(all_rune_points)})
+                        hourglass_runes.append({'vertex_id': vertex_id, 'all_points': sorted(all_rune_points)})
                         used_points.update(all_rune_points)
                         break
             if vertex_id in used_points: continue
@@ -522,7 +526,7 @@ class FormationManager:
                 ter1, ter2 = team_territories[ter_indices[0]], team_territories[ter_indices[1]]
                 all_points = set(ter1['point_ids']).union(set(ter2['point_ids']))
                 if len(all_points) == 4:
-                    prisms.append({'shared_p1_id': edge[0], 'shared_p2_id': edge[1], 'all_point_ids': list(all_points)})
+                    prisms.append({'shared_p1_id': edge[0], 'shared_p2_id': edge[1], 'all_point_ids': sorted(all_points)})
         return prisms
 
     def check_trebuchets(self, team_point_ids, team_lines, all_points):
@@ -535,7 +539,7 @@ class FormationManager:
         for apex_id in team_point_ids:
             if apex_id in used_points: continue
             
-            neighbors = list(adj.get(apex_id, set()))
+            neighbors = sorted(adj.get(apex_id, set()))
             if len(neighbors) < 2: continue
 
             for base1_id, base2_id in combinations(neighbors, 2):
@@ -552,7 +556,7 @@ class FormationManager:
                 if distance_sq(p_base1, p_base2) > leg1_sq: continue
                 if base2_id not in adj.get(base1_id, set()): continue
 
-                for cw_id in adj.get(base1_id, set()).intersection(adj.get(base2_id, set())):
+                for cw_id in sorted(adj.get(base1_id, set()).intersection(adj.get(base2_id, set()))):
                     if cw_id == apex_id or cw_id in used_points: continue
                     
                     p_cw = all_points.get(cw_id)
@@ -566,6 +570,6 @@ class FormationManager:
                     
                     all_p_ids = {apex_id, base1_id, base2_id, cw_id}
                     if not used_points.intersection(all_p_ids):
-                        possible_trebuchets.append({'point_ids': list(all_p_ids), 'apex_id': apex_id, 'base_ids': [base1_id, base2_id], 'counterweight_id': cw_id})
+                        possible_trebuchets.append({'point_ids': sorted(all_p_ids), 'apex_id': apex_id, 'base_ids': [base1_id, base2_id], 'counterweight_id': cw_id})
                         used_points.update(all_p_ids)
         return possible_trebuchets
\ No newline at end of file
@@ -0,0 +1,55 @@
+# game_app/frame_selection.py
+
+# Frame selection modes for a simulation run:
+# - 'all': every action-level frame
+# - 'turns': the setup frame and the last frame of each turn
+# - 'final': only the final frame
+FRAME_MODES = ('all', 'turns', 'final')
+
+
+class FrameSelection:
+    """
+    Decides which frames of a simulation are recorded and sent to the client.
+
+    Frames before `from_turn` are skipped, and of the remaining turns only every
+    `stride`-th one (counting from `from_turn`) is kept. The final frame is always
+    selected, so the outcome of the game is never lost. Call the selection with a
+    live state to test it.
+    """
+
+    def __init__(self, mode='all', from_turn=0, stride=1):
+        if mode not in FRAME_MODES:
+            raise ValueError(f"Unknown frame mode '{mode}'. Expected one of: {', '.join(FRAME_MODES)}.")
+        from_turn, stride = int(from_turn), int(stride)
+        if from_turn < 0 or stride < 1:
+            raise ValueError("fromTurn must be >= 0 and stride must be >= 1.")
+        self.mode = mode
+        self.from_turn = from_turn
+        self.stride = stride
+
+    @classmethod
+    def from_payload(cls, data):
+        """
+        Builds a selection from request options (`frames`, `fromTurn`, `stride`).
+        Raises ValueError/TypeError if they are invalid.
+        """
+        def option(key, default):
+            value = data.get(key)
+            return default if value is None or value == '' else value
+
+        return cls(mode=option('frames', 'all'), from_turn=option('fromTurn', 0), stride=option('stride', 1))
+
+    def __call__(self, state):
+        """Returns True if the frame for this live state should be kept."""
+        if state['game_phase'] != 'RUNNING':
+            return True # The final frame (or a game that never started)
+        if self.mode == 'final':
+            return False
+
+        turn = state['turn']
+        if turn < self.from_turn or (turn - self.from_turn) % self.stride != 0:
+            return False
+        if self.mode == 'turns':
+            # The setup frame, or the frame after the last action of a turn
+            return turn == 0 or state['action_in_turn'] >= len(state['actions_queue_this_turn'])
+        return True
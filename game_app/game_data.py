@@ -18,6 +18,9 @@ GAME_PARAMETERS = {
     'LAUNCH_PAYLOAD_FISSURE_FACTOR': 0.3,
     'SENTRY_ZAP_RANGE_FACTOR': 0.35,
     'MAX_ACTION_ATTEMPTS': 15,
+    # Stalemate detection, checked at the end of each full turn
+    'STALEMATE_PASS_TURNS': 5,  # Consecutive turns in which every action passed
+    'STALEMATE_REPEAT_LIMIT': 3,  # Times the same position may end a turn
 }
 
 GROUP_BASE_WEIGHTS = {
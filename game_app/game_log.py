@@ -0,0 +1,85 @@
+# game_app/game_log.py
+from . import game_data
+
+_log_generators = None
+
+
+def _get_log_generators():
+    """Returns the result-type -> log generator mapping, built once per process."""
+    global _log_generators
+    if _log_generators is None:
+        _log_generators = game_data.get_log_generators()
+    return _log_generators
+
+
+def format_action_event(event):
+    """
+    Formats a structured action event into a {teamId, message, short_message} log entry.
+    The message parts come from the `action_data` log generator for the result's type.
+    """
+    action = event['action']
+    result = action['result']
+    log_message = ""
+    short_log_message = "[ACTION]"
+
+    if action['is_bonus'] and not action['is_from_free']:
+        log_message += "[BONUS] "
+    log_message += f"{action['team_name']} "
+
+    if result.get('success'):
+        generator = _get_log_generators().get(result.get('type'))
+        if generator:
+            long_msg_part, short_log_message = generator(result)
+        else:
+            # Fallback for any action that might not have a custom message
+            long_msg_part, short_log_message = "performed a successful action.", "[ACTION]"
+        log_message += long_msg_part
+
+        if action['is_no_cost']:
+            if action['gained_bonus']:
+                log_message += " This action is free and grants a bonus action."
+                short_log_message += " [FREE+BONUS]"
+            else:
+                log_message += " This action is free."
+                short_log_message += " [FREE]"
+    else:
+        log_message += "could not find a valid move and passed its turn."
+        short_log_message = "[PASS]"
+
+    return {'teamId': event['teamId'], 'message': log_message, 'short_message': short_log_message}
+
+
+class GameLog:
+    """
+    An append-only store of structured log events, owned by a simulation.
+
+    Events are either ready-made entries ({message, short_message, ...}) or action
+    events ({teamId, action: {...}}) that keep the action's result dict and are
+    only formatted into text when read. Frames refer to the log by offset.
+    """
+
+    def __init__(self, events=None):
+        self._events = list(events or [])
+
+    def __len__(self):
+        return len(self._events)
+
+    def append(self, event):
+        self._events.append(event)
+
+    def truncate(self, length):
+        """Drops events past `length`. Only used when a simulation is rewound to an earlier frame."""
+        del self._events[length:]
+
+    def copy(self, length=None):
+        """Returns a new log holding the first `length` events (all events by default)."""
+        return GameLog(self._events[:length])
+
+    def entry(self, index):
+        """Returns the formatted log entry at `index`."""
+        event = self._events[index]
+        return format_action_event(event) if 'action' in event else event
+
+    def entries(self, start=0, end=None):
+        """Returns the formatted log entries in [start, end)."""
+        return [self.entry(i) for i in range(start, len(self._events) if end is None else min(end, len(self._events)))]
@@ -1,8 +1,6 @@
 import random
 import math
-import uuid  # For unique point IDs
-import copy
-import json
+import uuid
 from itertools import combinations
 from collections import defaultdict
 from .geometry import (
@@ -13,7 +11,7 @@ from .geometry import (
     clamp_and_round_point_coords
 )
 from .formations import FormationManager
-from .game_state_query import GameStateQuery
+from .game_state_query import GameStateQuery, PositionCounts
 from . import game_data
 from . import action_data
 from . import structure_data
@@ -24,13 +22,48 @@ from .actions.sacrifice_actions import SacrificeActionsHandler
 from .actions.rune_actions import RuneActionsHandler
 from .actions.terraform_actions import TerraformActionsHandler
 from .turn_processor import TurnProcessor
+from .history import SimulationHistory
+from .snapshot import snapshot_state
+from .game_log import GameLog
+from .decorations import DecorationCache
+from .team_stats import TeamStatsTracker, MetricsSeries
+from .serializer import FrameSerializer
+from .field_projection import FieldProjection
+from .rules import GameRules
 
 # --- Game Class ---
 class Game:
     """Encapsulates the entire game state and logic."""
 
-    def __init__(self):
+    def __init__(self, seed=None, quiet=False, rules=None):
         self.formation_manager = FormationManager()
+        # Parameters and action weights this game is played by (the game_data defaults if not given)
+        self.rules = rules or GameRules()
+        # Per-game random number generator. Every random decision in the simulation
+        # must go through it so a run can be reproduced from its setup and seed.
+        self.rng = random.Random(seed)
+        # Quiet mode skips the log, visualization events and action result payloads.
+        # It never changes what happens in the game, so bulk runs for statistics can use it.
+        self.quiet = quiet
+        # Delta-encoded frames of the latest recorded run, which fork() restores frames from.
+        self.history = None
+        # (state, teamId, action statuses) computed for the next action when the last step ended.
+        # The next step reuses it for its first choice instead of re-running the precondition sweep.
+        self._next_action_status = None
+        # CancellationToken of the current run (see continue_simulation), checked before each action
+        self.cancel_token = None
+        # Point flags and bastion lines of the structures last augmented, see decorations.py
+        self.decorations = DecorationCache()
+        # Goes up whenever the structures of the live state change (see mark_structures_changed)
+        self.structure_version = 0
+        self.stats_tracker = TeamStatsTracker()
+        # Encodes augmented frames, reusing the encoded invariant parts of a run
+        self.serializer = FrameSerializer()
+        # The state version goes up whenever the state changes (see mark_state_changed). Together with
+        # the instance ID it identifies a state, so clients can skip refetching one they already have.
+        self.instance_id = uuid.uuid4().hex
+        self.state_version = 0
+        self._state_json = None # (state version, get_state() as JSON text)
         self.reset()
         # Query object for read-only state access
         self.query = GameStateQuery(self)
@@ -43,7 +76,6 @@ class Game:
         self.terraform_handler = TerraformActionsHandler(self)
         self.turn_processor = TurnProcessor(self)
         self._init_action_preconditions()
-        self._log_generators = game_data.get_log_generators()
 
     def _init_action_preconditions(self):
         """Dynamically maps action names to their precondition check functions from action_data."""
@@ -56,6 +88,13 @@ class Game:
         """Initializes or resets the game state with default teams."""
         # Using fixed IDs for default teams ensures they can be referenced consistently.
         default_teams = {t['id']: t.copy() for t in game_data.DEFAULT_TEAMS}
+        # The log lives outside the state so frames only need to record how long it was (`log_offset`).
+        self._next_action_status = None
+        # Per-turn team stats of the current run, kept outside the state like the log
+        self.metrics = MetricsSeries()
+        # Position fingerprints of the run's turn ends, for stalemate detection
+        self.positions = PositionCounts()
+        self.log = GameLog([{'message': "Welcome! Default teams Alpha and Beta are ready. Place points to begin.", 'short_message': '[READY]'}])
         self.state = {
             "grid_size": 10,
             "teams": default_teams,
@@ -82,20 +121,108 @@ class Game:
             "ley_lines": {}, # {ley_line_id: {teamId, point_ids, turns_left, bonus_radius_sq}}
             "line_strengths": {}, # {line_id: strength}
             "regenerating_points": {}, # {point_id: {data: point_data, turns_left: N}}
-            "game_log": [{'message': "Welcome! Default teams Alpha and Beta are ready. Place points to begin.", 'short_message': '[READY]'}],
+            "log_offset": len(self.log), # Length of self.log when this state was recorded
             "turn": 0,
+            "step": 0, # Number of simulation steps run since the game started
+            "id_counter": 0, # Source of deterministic entity IDs
             "max_turns": 100,
             "game_phase": "SETUP", # SETUP, RUNNING, FINISHED
             "victory_condition": None,
             "interpretation": {},
+            "forked_from": None, # {step, seed} if this game continues a frame of another run
+            "action_probabilities": None, # Probability table for the team about to act (not recorded in quiet mode)
+            "live_stats": None, # {teamId: {point_count, line_count, controlled_area, line_length}}, updated at the end of each turn, None within a turn
             "last_action_details": {}, # For frontend visualization
             "initial_state": None, # Store the setup config for restarts
             "new_turn_events": [], # For visualizing things that happen at turn start
             "action_in_turn": 0, # Which action index in the current turn's queue
             "actions_queue_this_turn": [], # List of action dicts {teamId, is_bonus} for the current turn
-            "no_cost_action_used_by_team_this_turn": set(), # Tracks which teams used a no-cost action
-            "action_events": [] # For visualizing secondary effects of an action
+            "no_cost_action_used_by_team_this_turn": [], # Teams that used a no-cost action this turn (a list, so frames need no set encoding)
+            "action_events": [], # For visualizing secondary effects of an action
+            # Stalemate detection (see _check_stalemate; the turn ends' positions are in self.positions)
+            "pass_turns": 0, # Consecutive turns in which every action passed
+            "turn_passes": 0, # Actions that passed this turn
+            "turn_idle_passes": 0 # Actions this turn whose team had no valid action at all
         }
+        self.mark_state_changed()
+        self.mark_structures_changed()
+
+    def mark_state_changed(self):
+        """
+        Bumps the state version. Simulation steps, reset(), restore() and start_game() call it;
+        any other code that changes `self.state` in place must call it too.
+        """
+        self.state_version += 1
+
+    def mark_structures_changed(self):
+        """
+        Records that structures in the live state that point flags come from (decorations.FLAG_SOURCE_KEYS)
+        have changed, so decorations are rebuilt for the next frame. Code that adds, removes or
+        edits such structures must call it; the action handlers do so after their structure writes.
+        """
+        self.structure_version += 1
+
+    def snapshot(self):
+        """
+        Returns a fast, independent copy of the current state.
+        Only containers that the game mutates in place are copied; immutable leaves are shared.
+        """
+        return snapshot_state(self.state)
+
+    def restore(self, snapshot):
+        """
+        Replaces the current state with a copy of a snapshot, so the snapshot can be restored again.
+        Log entries recorded after the snapshot are dropped.
+        """
+        self.state = snapshot_state(snapshot)
+        self.log.truncate(self.state['log_offset'])
+        self.metrics.truncate(self.state['step'])
+        self.positions.truncate(self.state['step'])
+        self.history = None # The recorded frames no longer lead up to the current state
+        self._next_action_status = None
+        self.mark_state_changed()
+        self.mark_structures_changed()
+
+    def fork(self, frame_index, seed=None, traits=None):
+        """
+        Returns a new Game positioned at a frame of this game's recorded history, ready to be
+        continued with continue_simulation() under a different seed (a fresh one if not given).
+        The frame is rebuilt from the history, so only the continuation is simulated.
+        `traits` optionally maps team IDs to the traits they play with from the fork onwards.
+        Raises ValueError if there is no history or a trait is unknown, IndexError for a bad frame index.
+        """
+        if self.history is None or self.history.log is None:
+            raise ValueError("No recorded simulation to fork from.")
+        frame = self.history[frame_index] # An independent copy
+        teams = frame['teams']
+        for team_id, trait in (traits or {}).items():
+            if team_id not in teams:
+                raise ValueError(f"Unknown team '{team_id}'.")
+            if trait not in self.rules.trait_group_multipliers:
+                raise ValueError(f"Unknown trait '{trait}' for team '{team_id}'.")
+        if seed is None:
+            seed = random.randrange(2**32)
+
+        forked = Game(quiet=self.quiet, rules=self.rules)
+        forked.log = self.history.log.copy(frame['log_offset'])
+        if self.history.metrics is not None:
+            forked.metrics = self.history.metrics.copy(frame['step'])
+        if self.history.positions is not None:
+            forked.positions = self.history.positions.copy(frame['step'])
+        forked.state = frame
+        forked.mark_state_changed()
+        forked.mark_structures_changed()
+        forked.rng.seed(seed)
+        if traits:
+            # Teams are shared between frames, so they are replaced rather than edited
+            frame['teams'] = {tid: {**team, 'trait': traits.get(tid, team['trait'])} for tid, team in teams.items()}
+        frame['forked_from'] = {'step': frame['step'], 'seed': seed}
+        if traits:
+            forked._record_next_action_probabilities() # The recorded table used the old traits
+        if not forked.quiet:
+            forked.log.append({'message': f"Simulation forked at step {frame['step']} with seed {seed}.", 'short_message': '[FORK]'})
+            frame['log_offset'] = len(forked.log)
+        return forked
 
     def get_state(self):
         """Returns the current game state, augmenting with transient data for frontend."""
@@ -103,46 +230,30 @@ class Game:
             self.state['interpretation'] = self.calculate_interpretation()
 
         state_copy = self.state.copy()
-        
-        # Convert sets to lists for JSON serialization
-        if 'no_cost_action_used_by_team_this_turn' in state_copy:
-            state_copy['no_cost_action_used_by_team_this_turn'] = list(state_copy['no_cost_action_used_by_team_this_turn'])
 
-        state_copy['lines'] = self._augment_lines_for_frontend(self.state['lines'])
-        state_copy['points'] = self._augment_points_for_frontend(self.state['points'])
+        state_copy['lines'], state_copy['points'] = self._augment_entities_for_frontend()
         state_copy['live_stats'] = self._calculate_live_stats()
+        state_copy['game_log'] = self.log.entries()
         
         return state_copy
 
-    def _augment_lines_for_frontend(self, lines):
-        """Adds transient frontend-specific data to lines."""
-        bastion_line_ids = self.query.get_bastion_line_ids()
-        augmented_lines = []
-        for line in lines:
-            augmented_line = line.copy()
-            line_id = line.get('id')
-            augmented_line['is_shielded'] = line_id in self.state['shields']
-            augmented_line['is_bastion_line'] = line_id in bastion_line_ids
-            augmented_line['strength'] = self.state.get('line_strengths', {}).get(line_id, 0)
-            augmented_lines.append(augmented_line)
-        return augmented_lines
-
-    def _augment_points_for_frontend(self, points):
-        """Adds transient frontend-specific data to points."""
-        point_flags = self._get_all_point_flags()
-        
-        # Get all unique flag names that can be applied to a point
-        all_flag_names = list(point_flags.keys())
-
-        augmented_points = {}
-        for pid, point in points.items():
-            augmented_point = point.copy()
-            for flag_name in all_flag_names:
-                # Set the flag to true if the point ID is in the set for that flag
-                if pid in point_flags[flag_name]:
-                    augmented_point[flag_name] = True
-            augmented_points[pid] = augmented_point
-        return augmented_points
+    def get_state_json(self):
+        """Returns get_state() as JSON text. It is only built once per state version."""
+        if self._state_json is None or self._state_json[0] != self.state_version:
+            self._state_json = (self.state_version, self.serializer.encode(self.get_state()))
+        return self._state_json[1]
+
+    def _augment_entities_for_frontend(self, state=None):
+        """
+        Returns the (lines, points) of `state` (the current state by default) with transient
+        frontend-specific data added. Point flags and bastion lines are cached and only
+        recomputed when structures change: for the live state, when its structure version goes up.
+        """
+        state = self.state if state is None else state
+        return self.decorations.augment(
+            state, lambda: self._get_all_point_flags(state),
+            structure_version=self.structure_version if state is self.state else None
+        )
 
     def _helper_spawn_on_border(self, teamId, border_point):
         """Helper to create a new point on the border if the location is valid. Returns the new point or None."""
@@ -197,45 +308,28 @@ class Game:
             self.state['lines'].append(bonus_line)
 
             # Log this bonus event
-            team_name = self.state['teams'][new_point['teamId']]['name']
-            log_msg = f"A new point for Team {team_name} was empowered by a nearby Ley Line, creating a bonus connection!"
-            self.state['game_log'].append({'message': log_msg, 'short_message': '[LEY LINE BONUS!]', 'teamId': new_point['teamId']})
-            self.state['action_events'].append({
-                'type': 'ley_line_bonus',
-                'bonus_line': bonus_line
-            })
+            if not self.quiet:
+                team_name = self.state['teams'][new_point['teamId']]['name']
+                log_msg = f"A new point for Team {team_name} was empowered by a nearby Ley Line, creating a bonus connection!"
+                self.log.append({'message': log_msg, 'short_message': '[LEY LINE BONUS!]', 'teamId': new_point['teamId']})
+                self.state['action_events'].append({
+                    'type': 'ley_line_bonus',
+                    'bonus_line': bonus_line
+                })
 
             return bonus_line
         
         return None
 
-    def _calculate_live_stats(self):
-        """Calculates and returns live stats for all teams."""
-        live_stats = {}
-        all_points = self.state['points']
-        for teamId, team_data in self.state['teams'].items():
-            team_point_ids = self.query.get_team_point_ids(teamId)
-            team_lines = self.query.get_team_lines(teamId)
-            team_territories = [t for t in self.state.get('territories', []) if t['teamId'] == teamId]
-
-            controlled_area = 0
-            for territory in team_territories:
-                triangle_point_ids = territory['point_ids']
-                if all(pid in all_points for pid in triangle_point_ids):
-                    triangle_points = [all_points[pid] for pid in triangle_point_ids]
-                    if len(triangle_points) == 3:
-                        controlled_area += polygon_area(triangle_points)
-
-            live_stats[teamId] = {
-                'point_count': len(team_point_ids),
-                'line_count': len(team_lines),
-                'controlled_area': round(controlled_area, 2)
-            }
-        return live_stats
+    def _calculate_live_stats(self, state=None):
+        """Returns the live stats of `state` (the current state by default): the ones recorded by the simulation if present."""
+        state = self.state if state is None else state
+        return state.get('live_stats') or self.stats_tracker.compute(state)
 
     def _generate_id(self, prefix):
-        """Generates a unique ID with a given prefix."""
-        return f"{prefix}_{uuid.uuid4().hex[:6]}"
+        """Generates a unique, deterministic ID with a given prefix from the game's ID counter."""
+        self.state['id_counter'] += 1
+        return f"{prefix}_{self.state['id_counter']:06x}"
 
     def _find_first_ray_hit(self, ray_p1, ray_p2, target_lines, can_bypass_shields=False, ignored_line_ids=None):
         """
@@ -275,13 +369,13 @@ class Game:
                     }
         return closest_hit
 
-    def _iterate_structures(self, definition, teamId_filter=None):
+    def _iterate_structures(self, definition, teamId_filter=None, state=None):
         """
-        A generator that yields structures from the game state based on a definition
+        A generator that yields structures from the game state (or `state`) based on a definition
         from the structure registry. Can optionally filter by teamId.
         """
         state_key = definition['state_key']
-        storage = self.state.get(state_key)
+        storage = (self.state if state is None else state).get(state_key)
         if not storage:
             return
 
@@ -342,15 +436,23 @@ class Game:
                     pids.add(point_id)
         return pids
 
-    def start_game(self, teams, points, max_turns, grid_size):
-        """Starts a new game with the given parameters."""
+    def start_game(self, teams, points, max_turns, grid_size, seed=None):
+        """
+        Starts a new game with the given parameters.
+        If no seed is given, a fresh one is drawn; either way it is stored in `initial_state`.
+        """
         self.reset()
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.rng.seed(seed)
         
         # Process team traits, handling 'Random' selection
         available_traits = ['Aggressive', 'Expansive', 'Defensive', 'Balanced']
         for team_id, team_data in teams.items():
+            # Draw for every team so the rest of the random stream doesn't depend on which traits were 'Random'.
+            random_trait = self.rng.choice(available_traits)
             if team_data.get('trait') == 'Random' or 'trait' not in team_data:
-                team_data['trait'] = random.choice(available_traits)
+                team_data['trait'] = random_trait
             team_data['id'] = team_id # Ensure team object contains its own ID
 
         self.state['teams'] = teams
@@ -370,7 +472,9 @@ class Game:
             self.state['points'][point_id] = {**p, **clamped_coords, 'id': point_id}
         
         self.state['game_phase'] = "RUNNING" if len(self.state['points']) > 0 else "SETUP"
-        self.state['game_log'].append({'message': "Game initialized.", 'short_message': '[INIT]'})
+        if not self.quiet:
+            self.log.append({'message': "Game initialized.", 'short_message': '[INIT]'})
+        self.state['log_offset'] = len(self.log)
         self.state['action_in_turn'] = 0
         self.state['actions_queue_this_turn'] = []
         
@@ -379,103 +483,169 @@ class Game:
             'teams': {tid: t.copy() for tid, t in self.state['teams'].items()},
             'points': points, # Use original point list before IDs are added
             'max_turns': max_turns,
-            'grid_size': grid_size
+            'grid_size': grid_size,
+            'seed': seed
         }
+        self.mark_state_changed()
 
-    def augment_state_for_frontend(self, historical_state, as_json_string=False):
+    def augment_state_for_frontend(self, historical_state, as_json_string=False, log=None, log_since=None,
+                                   fields=None, exclude=None):
         """
         Augments a single historical state object with transient data for frontend display.
         This method is designed to be called on a raw state from the simulation history.
-        It temporarily sets the game's state to the historical one to use its helper methods.
-        Can return a Python dict or a JSON string.
+        The state is passed explicitly to the helpers and only read, never swapped into
+        `self.state`, so live simulation states can be augmented directly and several frames
+        can be augmented at once from different threads. Can return a Python dict or a JSON string.
+
+        If the simulation's `log` is given, the frame gets its log entries up to its `log_offset`:
+        all of them as `game_log`, or only those from `log_since` on as `log_entries`.
+        With `fields` and/or `exclude` (see FieldProjection), the frame only has the selected keys,
+        and augmentation steps whose keys aren't selected are skipped.
         """
-        # Temporarily swap state to use helper methods that rely on self.state
-        original_live_state = self.state
-        self.state = historical_state
-        try:
-            state_copy = self.state.copy()
-
-            # --- Calculate action probabilities for the team about to act in this state ---
-            next_team_id = None
-            if state_copy['game_phase'] == 'RUNNING' and state_copy.get('actions_queue_this_turn'):
-                action_idx = state_copy['action_in_turn']
-                queue = state_copy['actions_queue_this_turn']
-                if action_idx < len(queue):
-                    next_team_id = queue[action_idx]['teamId']
-
-            if next_team_id:
-                state_copy['action_probabilities'] = self.get_action_probabilities(next_team_id, include_invalid=False)
-            else:
-                state_copy['action_probabilities'] = None
+        projection = FieldProjection(fields, exclude)
+        state = historical_state
+        if projection.is_full:
+            state_copy = state.copy()
+        else:
+            state_copy = {key: value for key, value in state.items() if projection(key)}
+        # Action probabilities for the team about to act were recorded by the simulation
+        if projection('action_probabilities'):
+            state_copy.setdefault('action_probabilities', None)
+
+        if projection('interpretation') and state['game_phase'] == 'FINISHED' and not state_copy.get('interpretation'):
+            state_copy['interpretation'] = self.calculate_interpretation(state)
+
+        if projection('lines') or projection('points'):
+            lines, points = self._augment_entities_for_frontend(state)
+            if projection('lines'):
+                state_copy['lines'] = lines
+            if projection('points'):
+                state_copy['points'] = points
+        if projection('live_stats'):
+            state_copy['live_stats'] = self._calculate_live_stats(state)
+
+        log_offset = state.get('log_offset')
+        if log is not None and log_offset is not None:
+            if log_since is None:
+                if projection('game_log'):
+                    state_copy['game_log'] = log.entries(0, log_offset)
+            elif projection('log_entries'):
+                state_copy['log_entries'] = log.entries(log_since, log_offset)
+
+        if as_json_string:
+            return self.serializer.encode(state_copy)
 
-            if state_copy['game_phase'] == 'FINISHED' and not state_copy.get('interpretation'):
-                state_copy['interpretation'] = self.calculate_interpretation()
+        return state_copy
 
-            if 'no_cost_action_used_by_team_this_turn' in state_copy:
-                state_copy['no_cost_action_used_by_team_this_turn'] = list(state_copy['no_cost_action_used_by_team_this_turn'])
+    def _max_simulation_steps(self):
+        """Safety limit on simulation steps. A turn can have many actions (bonuses), so it is generous."""
+        max_turns = self.state['max_turns']
+        return (max_turns * len(self.state['teams']) * 10) + 50 if max_turns > 0 else 10000
 
-            state_copy['lines'] = self._augment_lines_for_frontend(self.state['lines'])
-            state_copy['points'] = self._augment_points_for_frontend(self.state['points'])
-            state_copy['live_stats'] = self._calculate_live_stats()
-            
-            if as_json_string:
-                class SetEncoder(json.JSONEncoder):
-                    def default(self, obj):
-                        if isinstance(obj, set):
-                            return list(obj)
-                        return json.JSONEncoder.default(self, obj)
-                return json.dumps(state_copy, cls=SetEncoder)
-
-            return state_copy
-        finally:
-            self.state = original_live_state # Ensure we restore state
+    def iter_simulation(self, teams, points, max_turns, grid_size, seed=None, record_history=False, cancel_token=None):
+        """
+        Starts a game and runs it step by step, yielding the live state after setup and after each step.
+        The yielded state is mutated by the next step, so consumers must copy or record it immediately.
+        With `record_history`, every step is also kept in `self.history` so the run can be forked.
+        A CancellationToken (`cancel_token`) can stop the run early, see continue_simulation().
+        """
+        self.start_game(teams, points, max_turns, grid_size, seed=seed)
+        self.history = SimulationHistory(log=self.log, metrics=self.metrics, positions=self.positions) if record_history else None
+        self._finish_step()
+        yield self.state
+        yield from self.continue_simulation(cancel_token)
 
-    def run_full_simulation(self, teams, points, max_turns, grid_size):
+    def continue_simulation(self, cancel_token=None):
         """
-        Runs a complete game simulation from a given setup and returns the raw history of states.
+        Runs the current game to completion from wherever it is, yielding the live state after each step.
+        If `cancel_token` (a CancellationToken) is cancelled or its budget runs out, the game ends
+        before its next action, with the token's reason as the victory condition.
         """
-        history = []
-        self.start_game(teams, points, max_turns, grid_size)
-        history.append(copy.deepcopy(self.state))
-
-        # Safety break for infinite loops
-        # A turn can have many actions (bonuses). Let's give it a generous step limit.
-        max_steps = (max_turns * len(teams) * 10) + 50 if max_turns > 0 else 10000
-        step = 0
-        
+        self.cancel_token = cancel_token
         while self.state['game_phase'] == 'RUNNING':
+            # Safety break for infinite loops
+            if self.state['step'] > self._max_simulation_steps():
+                self._halt_simulation(
+                    "Halted due to excessive length.", "Error: Simulation exceeded safety step limit and was terminated."
+                )
+                self.state['log_offset'] = len(self.log)
+                self._finish_step()
+                yield self.state # Add final halted state
+                return
+
             self.run_next_action()
-            history.append(copy.deepcopy(self.state))
-            
-            step += 1
-            if step > max_steps:
-                self.state['game_log'].append({'message': "Error: Simulation exceeded safety step limit and was terminated.", 'short_message': '[HALTED]'})
-                self.state['game_phase'] = 'FINISHED'
-                self.state['victory_condition'] = "Halted due to excessive length."
-                history.append(copy.deepcopy(self.state)) # Add final halted state
-                break
-        
+            self.state['step'] += 1
+            self.state['log_offset'] = len(self.log)
+            self._finish_step()
+            yield self.state
+
+    def _finish_step(self):
+        """
+        Updates the live stats at the end of a turn and records them, and records the step in the history.
+        Within a turn `live_stats` is None; _calculate_live_stats() computes them for the frames that
+        are emitted or asked for.
+        """
+        self.mark_state_changed()
+        queue = self.state['actions_queue_this_turn']
+        turn_ended = (self.state['turn'] == 0 or self.state['game_phase'] != 'RUNNING'
+                      or self.state['action_in_turn'] >= len(queue))
+        if turn_ended:
+            self.state['live_stats'] = self.stats_tracker.compute(self.state)
+            self.metrics.record(self.state['turn'], self.state['step'], self.state['live_stats'])
+        else:
+            self.state['live_stats'] = None
+        if self.history is not None:
+            self.history.append(self.state)
+
+    def run_full_simulation(self, teams, points, max_turns, grid_size, seed=None, quiet=None, frame_filter=None,
+                            cancel_token=None):
+        """
+        Runs a complete game simulation from a given setup and returns its history.
+        A CancellationToken (`cancel_token`) can end it early, see continue_simulation().
+        The history is a delta-encoded SimulationHistory; index it to rebuild any frame.
+        The history's `log` holds the game log that the frames' `log_offset`s refer to.
+        `quiet` overrides the game's quiet mode for this run only.
+        If `frame_filter` is given (e.g. a FrameSelection), only states it accepts are recorded;
+        each frame's `step` tells which simulation step it is.
+        """
+        previous_quiet = self.quiet
+        if quiet is not None:
+            self.quiet = quiet
+        try:
+            history = SimulationHistory()
+            for state in self.iter_simulation(teams, points, max_turns, grid_size, seed=seed, cancel_token=cancel_token):
+                if frame_filter is None or frame_filter(state):
+                    history.append(state)
+        finally:
+            self.quiet = previous_quiet
+        history.log = self.log # Created by start_game, so only available once the run has begun
+        history.metrics = self.metrics
+        history.positions = self.positions
+        self.history = history # Frame indices for fork() are positions in this history
         return history
 
-    def restart_and_run_simulation(self):
-        """Restarts the game with its initial settings and runs a full simulation."""
+    def restart_and_run_simulation(self, seed=None, frame_filter=None):
+        """
+        Restarts the game with its initial settings and runs a full simulation.
+        A new seed is drawn unless one is given; pass the stored seed to replay the previous run.
+        """
         initial_state = self.state.get('initial_state')
         if not initial_state:
-            return [] # Return an empty history if there's nothing to restart
+            return SimulationHistory() # Return an empty history if there's nothing to restart
 
-        # The Pyodide version of this will return {'raw_history': history}
-        # To keep server and client consistent, we'll just return the list
         return self.run_full_simulation(
             initial_state['teams'],
             initial_state['points'],
             initial_state['max_turns'],
-            initial_state['grid_size']
+            initial_state['grid_size'],
+            seed=seed,
+            frame_filter=frame_filter
         )
 
-    def _get_all_point_flags(self):
+    def _get_all_point_flags(self, state=None):
         """
-        Returns a dictionary mapping frontend flag names to sets of point IDs that have that flag.
-        This is driven by the STRUCTURE_DEFINITIONS registry.
+        Returns a dictionary mapping frontend flag names to sets of point IDs that have that flag
+        in `state` (the current state by default). This is driven by the STRUCTURE_DEFINITIONS registry.
         """
         flags = defaultdict(set)
 
@@ -487,11 +657,11 @@ class Game:
 
             if definition['storage_type'] == 'dict_keyed_by_pid':
                 if flag_key:
-                    for pid, _ in self._iterate_structures(definition):
+                    for pid, _ in self._iterate_structures(definition, state=state):
                         flags[flag_key].add(pid)
                 continue
 
-            for struct in self._iterate_structures(definition):
+            for struct in self._iterate_structures(definition, state=state):
                 if flag_key:
                     pids = self._get_pids_from_struct(struct, definition.get('point_id_keys', []))
                     flags[flag_key].update(pids)
@@ -548,14 +718,15 @@ class Game:
         nexus_owner_name = self.state['teams'][nexus_owner_teamId]['name']
         aggressor_name = self.state['teams'][aggressor_team_id]['name'] if aggressor_team_id and aggressor_team_id in self.state['teams'] else "an unknown force"
 
-        log_msg = f"The destruction of a Nexus from {nexus_owner_name} by {aggressor_name} caused a violent energy discharge!"
-        self.state['game_log'].append({'message': log_msg, 'short_message': '[NEXUS BOOM!]', 'teamId': nexus_owner_teamId, 'is_event': True})
-        self.state['action_events'].append({
-            'type': 'nexus_detonation',
-            'center': center,
-            'radius_sq': radius_sq,
-            'color': self.state['teams'][nexus_owner_teamId]['color']
-        })
+        if not self.quiet:
+            log_msg = f"The destruction of a Nexus from {nexus_owner_name} by {aggressor_name} caused a violent energy discharge!"
+            self.log.append({'message': log_msg, 'short_message': '[NEXUS BOOM!]', 'teamId': nexus_owner_teamId, 'is_event': True})
+            self.state['action_events'].append({
+                'type': 'nexus_detonation',
+                'center': center,
+                'radius_sq': radius_sq,
+                'color': self.state['teams'][nexus_owner_teamId]['color']
+            })
 
         points_to_destroy_ids = []
         lines_to_destroy = []
@@ -584,8 +755,9 @@ class Game:
                 destroyed_lines_count += 1
 
         if destroyed_points_count > 0 or destroyed_lines_count > 0:
-            log_msg = f"The blast destroyed {destroyed_points_count} points and {destroyed_lines_count} lines."
-            self.state['game_log'].append({'message': log_msg, 'short_message': '[CASCADE]', 'teamId': nexus_owner_teamId, 'is_event': True})
+            if not self.quiet:
+                log_msg = f"The blast destroyed {destroyed_points_count} points and {destroyed_lines_count} lines."
+                self.log.append({'message': log_msg, 'short_message': '[CASCADE]', 'teamId': nexus_owner_teamId, 'is_event': True})
 
     def _delete_line(self, line_to_delete):
         """Removes a line from the state, along with any associated shield or strength."""
@@ -611,7 +783,7 @@ class Game:
         """Creates a fissure of a given length, centered at given coordinates."""
         grid_size = self.state['grid_size']
         fissure_id = self._generate_id('f')
-        angle = random.uniform(0, math.pi)
+        angle = self.rng.uniform(0, math.pi)
 
         half_len = length / 2
         p1 = {
@@ -651,12 +823,13 @@ class Game:
                 
                 new_coords = clamp_and_round_point_coords({'x': new_x, 'y': new_y}, grid_size)
                 point['x'], point['y'] = new_coords['x'], new_coords['y']
-                pushed_points.append(point.copy())
+                pushed_points.append(point if self.quiet else point.copy())
                 
         return pushed_points
 
     def _cleanup_structures_for_point(self, point_id):
         """Helper to remove a point from all associated secondary structures after it has been deleted."""
+        self.mark_structures_changed()
         # Remove connected lines (and their shields/strength)
         lines_to_remove = [l for l in self.state['lines'] if point_id in (l['p1_id'], l['p2_id'])]
         for l in lines_to_remove:
@@ -735,10 +908,11 @@ class Game:
                 'data': deleted_point_data,
                 'turns_left': 3
             }
-            team_name = self.state['teams'][deleted_point_data['teamId']]['name']
-            log_msg = f"A point from {team_name} was sacrificed and will attempt to regenerate in 3 turns."
-            self.state['game_log'].append({'message': log_msg, 'short_message': '[SAC->REGEN]', 'teamId': deleted_point_data['teamId'], 'is_event': True})
-            self.state['action_events'].append({'type': 'point_regenerate_start', 'point': deleted_point_data})
+            if not self.quiet:
+                team_name = self.state['teams'][deleted_point_data['teamId']]['name']
+                log_msg = f"A point from {team_name} was sacrificed and will attempt to regenerate in 3 turns."
+                self.log.append({'message': log_msg, 'short_message': '[SAC->REGEN]', 'teamId': deleted_point_data['teamId'], 'is_event': True})
+                self.state['action_events'].append({'type': 'point_regenerate_start', 'point': deleted_point_data})
             return deleted_point_data
 
         # --- Standard (permanent) Deletion Logic ---
@@ -793,7 +967,7 @@ class Game:
         if not team_lines:
             return {'success': False, 'reason': 'no lines to perform action on or strengthen'}
         
-        line_to_strengthen = random.choice(team_lines)
+        line_to_strengthen = self.rng.choice(team_lines)
         self._strengthen_line(line_to_strengthen) # It's okay if it fails (already maxed)
         return {
             'success': True,
@@ -855,8 +1029,10 @@ class Game:
         # Update structures for the team to get the most accurate list of possible actions
         self._update_structures_for_team(teamId)
 
-        all_action_statuses = self._get_all_actions_status(teamId)
-        
+        return self._build_action_probabilities(teamId, self._get_all_actions_status(teamId), include_invalid)
+
+    def _build_action_probabilities(self, teamId, all_action_statuses, include_invalid=False):
+        """Builds the probability table of get_action_probabilities from already computed action statuses."""
         # Group valid actions by category
         valid_actions_by_group = defaultdict(list)
         for action_name, status in all_action_statuses.items():
@@ -866,14 +1042,11 @@ class Game:
         
         # Determine group weights based on trait and valid actions
         team_trait = self.state['teams'][teamId].get('trait', 'Balanced')
-        group_multipliers = game_data.TRAIT_GROUP_MULTIPLIERS.get(team_trait, {})
         
         final_group_weights = {}
         for group_name, actions in valid_actions_by_group.items():
             if actions: # Only consider groups that have at least one valid action
-                base_weight = game_data.GROUP_BASE_WEIGHTS.get(group_name, 0)
-                multiplier = group_multipliers.get(group_name, 1.0)
-                final_group_weights[group_name] = base_weight * multiplier
+                final_group_weights[group_name] = self.rules.group_weight(team_trait, group_name)
 
         total_group_weight = sum(final_group_weights.values())
 
@@ -924,12 +1097,19 @@ class Game:
 
         return response
 
-    def _choose_action_for_team(self, teamId, exclude_actions=None):
-        """Chooses an action for a team based on group probabilities, excluding any that have already failed this turn."""
+    def _choose_action_for_team(self, teamId, exclude_actions=None, action_statuses=None):
+        """
+        Chooses an action for a team based on group probabilities, excluding any that have already failed this turn.
+        `action_statuses` can pass in a precondition sweep already done on the current state.
+        """
         if exclude_actions is None: exclude_actions = []
 
         # --- 1. Get all valid actions, excluding ones that have already failed ---
-        possible_actions = self._get_possible_actions(teamId, exclude_actions)
+        if action_statuses is None:
+            possible_actions = self._get_possible_actions(teamId, exclude_actions)
+        else:
+            possible_actions = [name for name, status_info in action_statuses.items()
+                                if status_info['valid'] and name not in exclude_actions]
         if not possible_actions: return None, None
 
         # --- 2. Group these valid actions by category ---
@@ -940,14 +1120,11 @@ class Game:
 
         # --- 3. Determine final group weights based on trait and which groups are actually possible ---
         team_trait = self.state['teams'][teamId].get('trait', 'Balanced')
-        group_multipliers = game_data.TRAIT_GROUP_MULTIPLIERS.get(team_trait, {})
         
         final_group_weights = {}
         for group_name, actions in valid_actions_by_group.items():
             if actions: # Only consider groups that have at least one valid action
-                base_weight = game_data.GROUP_BASE_WEIGHTS.get(group_name, 0)
-                multiplier = group_multipliers.get(group_name, 1.0)
-                final_group_weights[group_name] = base_weight * multiplier
+                final_group_weights[group_name] = self.rules.group_weight(team_trait, group_name)
         
         if not final_group_weights: return None, None # No valid groups to choose from
 
@@ -955,8 +1132,8 @@ class Game:
         group_names = list(final_group_weights.keys())
         group_weights = list(final_group_weights.values())
         
-        chosen_group = random.choices(group_names, weights=group_weights, k=1)[0]
-        chosen_action_name = random.choice(valid_actions_by_group[chosen_group])
+        chosen_group = self.rng.choices(group_names, weights=group_weights, k=1)[0]
+        chosen_action_name = self.rng.choice(valid_actions_by_group[chosen_group])
         
         # --- 5. Return the chosen action name and its function ---
         action_details = action_data.ACTIONS.get(chosen_action_name)
@@ -976,11 +1153,12 @@ class Game:
 
     def _build_action_queue(self):
         """Builds the action queue for the current turn, respecting team turns."""
-        self.state['game_log'].append({'message': f"--- Turn {self.state['turn']} ---", 'short_message': f"~ T{self.state['turn']} ~"})
+        if not self.quiet:
+            self.log.append({'message': f"--- Turn {self.state['turn']} ---", 'short_message': f"~ T{self.state['turn']} ~"})
         
         # Determine the order of teams for this turn
         active_teams_ordered = [teamId for teamId in self.state['teams'] if len(self.query.get_team_point_ids(teamId)) > 0]
-        random.shuffle(active_teams_ordered)
+        self.rng.shuffle(active_teams_ordered)
         
         final_actions_queue = []
         for teamId in active_teams_ordered:
@@ -994,18 +1172,20 @@ class Game:
             # Add bonus actions from Nexuses
             num_nexuses = len(self.state.get('runes', {}).get(teamId, {}).get('nexus', []))
             if num_nexuses > 0:
-                team_name = self.state['teams'][teamId]['name']
-                plural = "s" if num_nexuses > 1 else ""
-                self.state['game_log'].append({'message': f"{team_name} gains {num_nexuses} bonus action{plural} from its Nexus{plural}.", 'short_message': f'[NEXUS:+{num_nexuses}ACT]'})
+                if not self.quiet:
+                    team_name = self.state['teams'][teamId]['name']
+                    plural = "s" if num_nexuses > 1 else ""
+                    self.log.append({'message': f"{team_name} gains {num_nexuses} bonus action{plural} from its Nexus{plural}.", 'short_message': f'[NEXUS:+{num_nexuses}ACT]'})
                 for _ in range(num_nexuses):
                     team_actions.append({'teamId': teamId, 'is_bonus': True})
 
             # Add bonus actions from Wonders
             num_wonders = sum(1 for w in self.state.get('wonders', {}).values() if w['teamId'] == teamId)
             if num_wonders > 0:
-                team_name = self.state['teams'][teamId]['name']
-                plural = "s" if num_wonders > 1 else ""
-                self.state['game_log'].append({'message': f"{team_name} gains {num_wonders} bonus action{plural} from its Wonder{plural}.", 'short_message': f'[WONDER:+{num_wonders}ACT]'})
+                if not self.quiet:
+                    team_name = self.state['teams'][teamId]['name']
+                    plural = "s" if num_wonders > 1 else ""
+                    self.log.append({'message': f"{team_name} gains {num_wonders} bonus action{plural} from its Wonder{plural}.", 'short_message': f'[WONDER:+{num_wonders}ACT]'})
                 for _ in range(num_wonders):
                     team_actions.append({'teamId': teamId, 'is_bonus': True})
             
@@ -1020,9 +1200,13 @@ class Game:
         self.state['action_in_turn'] = 0
         self.state['last_action_details'] = {}
         self.state['new_turn_events'] = []
-        self.state['no_cost_action_used_by_team_this_turn'] = set()
+        self.state['no_cost_action_used_by_team_this_turn'] = []
+        self.state['turn_passes'] = 0
+        self.state['turn_idle_passes'] = 0
         
         game_ended = self.turn_processor.process_turn_start_effects()
+        # Turn start effects count down, expire and create structures
+        self.mark_structures_changed()
         if game_ended:
             return
 
@@ -1040,32 +1224,72 @@ class Game:
             self.state['game_phase'] = 'FINISHED'
             team_name = self.state['teams'][winner_id]['name']
             self.state['victory_condition'] = f"'{team_name}' is the sole survivor."
-            self.state['game_log'].append({'message': self.state['victory_condition'], 'short_message': '[VICTORY]'})
+            if not self.quiet:
+                self.log.append({'message': self.state['victory_condition'], 'short_message': '[VICTORY]'})
             return
 
         # 2. Extinction (mutual destruction)
         if len(teams_with_points) == 0:
             self.state['game_phase'] = 'FINISHED'
             self.state['victory_condition'] = "Extinction"
-            self.state['game_log'].append({'message': "All teams have been eliminated. Game over.", 'short_message': '[EXTINCTION]'})
+            if not self.quiet:
+                self.log.append({'message': "All teams have been eliminated. Game over.", 'short_message': '[EXTINCTION]'})
             return
 
         # 3. Max Turns Reached
         if self.state['turn'] >= self.state['max_turns']:
             self.state['game_phase'] = 'FINISHED'
             self.state['victory_condition'] = "Max turns reached."
-            self.state['game_log'].append({'message': "Max turns reached. Game finished.", 'short_message': '[END]'})
+            if not self.quiet:
+                self.log.append({'message': "Max turns reached. Game finished.", 'short_message': '[END]'})
+            return
 
-    def _get_action_log_messages(self, result):
-        """Generates the long and short log messages for a given action result."""
-        action_type = result.get('type')
+        # 4. Stalemate
+        self._check_stalemate()
 
-        if action_type in self._log_generators:
-            long_msg, short_msg = self._log_generators[action_type](result)
-            return long_msg, short_msg
-        
-        # Fallback for any action that might not have a custom message
-        return "performed a successful action.", "[ACTION]"
+    def _check_stalemate(self):
+        """
+        Ends games that can no longer change meaningfully. Called at the end of each full turn.
+        A turn in which no team had any valid action and the position did not change will repeat
+        until the end, since valid actions depend only on the position, so the remaining turns are
+        skipped. Otherwise, a run of turns in which every action passed, or a position that keeps
+        coming back, ends the game as a stalemate.
+        """
+        queue_length = len(self.state['actions_queue_this_turn'])
+        all_passed = queue_length > 0 and self.state['turn_passes'] >= queue_length
+        self.state['pass_turns'] = self.state['pass_turns'] + 1 if all_passed else 0
+
+        position = self.query.get_position_fingerprint()
+        previous_position = self.positions.last()
+        # The turn ends within the action of the coming step, so it belongs to that step's frame
+        repeats = self.positions.record(self.state['step'] + 1, position)
+
+        if all_passed and self.state['turn_idle_passes'] >= queue_length and position == previous_position:
+            skipped_turns = max(0, self.state['max_turns'] - self.state['turn'])
+            self.state['turn'] += skipped_turns
+            self._end_in_stalemate(
+                "Stalemate: no team can act.", f'[STALEMATE:+{skipped_turns}T]',
+                log_message=f"No team can act and the board is frozen. Skipped {skipped_turns} remaining turns."
+            )
+        elif self.state['pass_turns'] >= self.rules.parameters['STALEMATE_PASS_TURNS']:
+            self._end_in_stalemate(f"Stalemate: every action passed for {self.state['pass_turns']} turns.", '[STALEMATE]')
+        elif repeats >= self.rules.parameters['STALEMATE_REPEAT_LIMIT']:
+            self._end_in_stalemate(f"Stalemate: the same position occurred {repeats} times.", '[STALEMATE:REPEAT]')
+
+    def _halt_simulation(self, victory_condition, log_message=None):
+        """Ends a game that was cut short (cancelled, over budget or too long). The log message defaults to the condition."""
+        self.state['game_phase'] = 'FINISHED'
+        self.state['victory_condition'] = victory_condition
+        self.state['action_probabilities'] = None
+        if not self.quiet:
+            self.log.append({'message': log_message or victory_condition, 'short_message': '[HALTED]'})
+
+    def _end_in_stalemate(self, victory_condition, short_log_message, log_message=None):
+        """Finishes the game with a stalemate victory condition. The log message defaults to the condition."""
+        self.state['game_phase'] = 'FINISHED'
+        self.state['victory_condition'] = victory_condition
+        if not self.quiet:
+            self.log.append({'message': log_message or victory_condition, 'short_message': short_log_message})
 
     def _update_structures_for_team(self, teamId):
         """
@@ -1103,11 +1327,16 @@ class Game:
             
             storage_type = definition['storage_type']
             if storage_type == 'team_dict_list':
-                self.state.setdefault(state_key, {})[teamId] = result
+                team_structures = self.state.setdefault(state_key, {})
+                slot = teamId
             elif storage_type == 'team_dict_of_structures':
-                self.state.setdefault(state_key, {}).setdefault(teamId, {})
-                subtype_key = definition['structure_subtype_key']
-                self.state[state_key][teamId][subtype_key] = result
+                team_structures = self.state.setdefault(state_key, {}).setdefault(teamId, {})
+                slot = definition['structure_subtype_key']
+            else:
+                continue
+            if team_structures.get(slot) != result:
+                self.mark_structures_changed()
+            team_structures[slot] = result
 
     def run_next_action(self):
         """Runs a single successful action for the next team in the current turn."""
@@ -1115,6 +1344,14 @@ class Game:
             return
 
         self.state['action_events'] = []
+        self.state['action_probabilities'] = None
+
+        # Stop here if the run was cancelled or has used up its budget
+        if self.cancel_token is not None:
+            halt_reason = self.cancel_token.check()
+            if halt_reason is not None:
+                self._halt_simulation(halt_reason)
+                return
 
         # --- Turn Management ---
         # Check if it's time to start a new turn.
@@ -1140,7 +1377,8 @@ class Game:
                 if self.state['game_phase'] == 'RUNNING': # Guard against double-ending
                     self.state['game_phase'] = 'FINISHED'
                     self.state['victory_condition'] = "Extinction"
-                    self.state['game_log'].append({'message': "All teams have been eliminated. Game over.", 'short_message': '[EXTINCTION]'})
+                    if not self.quiet:
+                        self.log.append({'message': "All teams have been eliminated. Game over.", 'short_message': '[EXTINCTION]'})
                 return
 
         # --- Action Execution ---
@@ -1149,13 +1387,22 @@ class Game:
         is_bonus_action = action_info['is_bonus']
         is_from_free_action = action_info.get('from_free', False)
         
-        self._update_structures_for_team(teamId)
+        # The previous step may already have updated structures and swept preconditions on this exact state
+        cached = self._next_action_status
+        self._next_action_status = None
+        if cached is not None and cached[0] is self.state and cached[1] == teamId:
+            action_statuses = cached[2]
+        else:
+            self._update_structures_for_team(teamId)
+            action_statuses = None
         team_name = self.state['teams'][teamId]['name']
         
         result, action_name = None, None
         failed_actions = []
-        for _ in range(game_data.GAME_PARAMETERS['MAX_ACTION_ATTEMPTS']):
-            action_name, action_func = self._choose_action_for_team(teamId, exclude_actions=failed_actions)
+        for _ in range(self.rules.parameters['MAX_ACTION_ATTEMPTS']):
+            action_name, action_func = self._choose_action_for_team(
+                teamId, exclude_actions=failed_actions, action_statuses=None if failed_actions else action_statuses
+            )
             
             if not action_func:
                 result = {'success': False, 'reason': 'no possible actions'}
@@ -1170,18 +1417,25 @@ class Game:
                 failed_actions.append(action_name)
         else:
             result = {'success': False, 'reason': 'all attempted actions failed'}
+
+        if not result.get('success'):
+            self.state['turn_passes'] += 1
+            if not failed_actions: # Nothing was even possible, which depends only on the position
+                self.state['turn_idle_passes'] += 1
             
         gained_bonus_this_action = False
         is_no_cost_action = result.get('success') and action_data.ACTIONS.get(action_name, {}).get('no_cost', False)
         
         if result.get('success'):
-            if self.state['action_events']:
-                result['action_events'] = self.state['action_events'][:]
-            self.state['last_action_details'] = result
+            # In quiet mode the result payload is only used to decide what happens next, never kept.
+            if not self.quiet:
+                if self.state['action_events']:
+                    result['action_events'] = self.state['action_events'][:]
+                self.state['last_action_details'] = result
 
             if is_no_cost_action:
-                if teamId not in self.state.get('no_cost_action_used_by_team_this_turn', set()):
-                    self.state.setdefault('no_cost_action_used_by_team_this_turn', set()).add(teamId)
+                if teamId not in self.state.get('no_cost_action_used_by_team_this_turn', []):
+                    self.state.setdefault('no_cost_action_used_by_team_this_turn', []).append(teamId)
                     bonus_action = {'teamId': teamId, 'is_bonus': True, 'from_free': True}
                     self.state['actions_queue_this_turn'].insert(self.state['action_in_turn'] + 1, bonus_action)
                     gained_bonus_this_action = True
@@ -1189,32 +1443,37 @@ class Game:
             self.state['last_action_details'] = {}
         
         # --- Log the final result ---
-        log_message = ""
-        short_log_message = "[ACTION]"
-
-        if is_bonus_action and not is_from_free_action:
-            log_message += "[BONUS] "
-        log_message += f"{team_name} "
-
-        if result.get('success'):
-            long_msg_part, short_log_message = self._get_action_log_messages(result)
-            log_message += long_msg_part
-
-            if is_no_cost_action:
-                if gained_bonus_this_action:
-                    log_message += " This action is free and grants a bonus action."
-                    short_log_message += " [FREE+BONUS]"
-                else:
-                    log_message += " This action is free."
-                    short_log_message += " [FREE]"
-        else:
-            log_message += "could not find a valid move and passed its turn."
-            short_log_message = "[PASS]"
-            
-        self.state['game_log'].append({'teamId': teamId, 'message': log_message, 'short_message': short_log_message})
+        # The message text is formatted from the result when the log is read (see game_log.py).
+        if not self.quiet:
+            self.log.append({'teamId': teamId, 'action': {
+                'team_name': team_name,
+                'result': result.copy(),
+                'is_bonus': is_bonus_action,
+                'is_from_free': is_from_free_action,
+                'is_no_cost': is_no_cost_action,
+                'gained_bonus': gained_bonus_this_action,
+            }})
         
         # Increment for next action
         self.state['action_in_turn'] += 1
+        self._record_next_action_probabilities()
+
+    def _record_next_action_probabilities(self):
+        """
+        Records the probability table for the team about to act as the state's `action_probabilities`.
+        The structure update and precondition sweep it needs are kept for the next step to choose with.
+        """
+        self.state['action_probabilities'] = None
+        if self.quiet or self.state['game_phase'] != 'RUNNING':
+            return
+        queue = self.state['actions_queue_this_turn']
+        if self.state['action_in_turn'] >= len(queue):
+            return # The next step starts a new turn, which changes the state first
+        teamId = queue[self.state['action_in_turn']]['teamId']
+        self._update_structures_for_team(teamId)
+        action_statuses = self._get_all_actions_status(teamId)
+        self._next_action_status = (self.state, teamId, action_statuses)
+        self.state['action_probabilities'] = self._build_action_probabilities(teamId, action_statuses)
     
     # --- Interpretation ---
 
@@ -1242,29 +1501,26 @@ class Game:
         return "A balanced force, showing steady and stable development."
 
 
-    def calculate_interpretation(self):
-        """Calculates geometric properties for each team."""
+    def calculate_interpretation(self, state=None):
+        """Calculates geometric properties for each team in `state` (the current state by default)."""
+        state = self.state if state is None else state
+        query = GameStateQuery(self, state)
         interpretation = {}
-        all_points = self.state['points']
-        for teamId, team_data in self.state['teams'].items():
-            team_point_ids = self.query.get_team_point_ids(teamId)
+        all_points = state['points']
+        live_stats = self._calculate_live_stats(state)
+        for teamId, team_data in state['teams'].items():
+            team_point_ids = query.get_team_point_ids(teamId)
             team_points_dict = {pid: all_points[pid] for pid in team_point_ids if pid in all_points}
             team_points_list = list(team_points_dict.values())
             
-            team_lines = self.query.get_team_lines(teamId)
-            team_territories = [t for t in self.state.get('territories', []) if t['teamId'] == teamId]
+            team_lines = query.get_team_lines(teamId)
 
             if len(team_points_list) < 1:
                  interpretation[teamId] = { 'point_count': 0, 'line_count': 0, 'line_length': 0, 'triangles': 0, 'controlled_area': 0, 'hull_area': 0, 'hull_perimeter': 0, 'hull_points': [], 'divination_text': 'Faded from existence.'}
                  continue
 
-            # 1. Total Line Length
-            total_length = 0
-            for line in team_lines:
-                if line['p1_id'] in all_points and line['p2_id'] in all_points:
-                    p1 = all_points[line['p1_id']]
-                    p2 = all_points[line['p2_id']]
-                    total_length += math.sqrt(distance_sq(p1, p2))
+            # 1. Point and line counts, line length and controlled area are kept up to date by the stats tracker
+            team_stats = live_stats[teamId]
 
             # 2. Triangle Count
             all_triangles = self.formation_manager._find_all_triangles(team_point_ids, team_lines)
@@ -1278,22 +1534,12 @@ class Game:
                 hull_area = polygon_area(hull_points)
                 hull_perimeter = polygon_perimeter(hull_points)
 
-            # 4. Total Controlled Area from territories
-            controlled_area = 0
-            for territory in team_territories:
-                triangle_point_ids = territory['point_ids']
-                if all(pid in all_points for pid in triangle_point_ids):
-                    triangle_points = [all_points[pid] for pid in triangle_point_ids]
-                    if len(triangle_points) == 3:
-                        controlled_area += polygon_area(triangle_points)
-
-
             stats = {
-                'point_count': len(team_points_list),
-                'line_count': len(team_lines),
-                'line_length': round(total_length, 2),
+                'point_count': team_stats['point_count'],
+                'line_count': team_stats['line_count'],
+                'line_length': team_stats['line_length'],
                 'triangles': triangles,
-                'controlled_area': round(controlled_area, 2),
+                'controlled_area': team_stats['controlled_area'],
                 'hull_area': round(hull_area, 2),
                 'hull_perimeter': round(hull_perimeter, 2),
                 'hull_points': hull_points
@@ -0,0 +1,75 @@
+# game_app/game_sessions.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from .game_logic import Game
+
+# Defaults for how many client games are kept and how long an unused one lives.
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_IDLE_TTL = 30 * 60 # seconds
+
+
+class GameSessionManager:
+    """
+    Keeps one Game per client session, so clients don't overwrite each other's games.
+
+    Sessions are kept in least-recently-used order. A session that hasn't been used for
+    `idle_ttl` seconds is dropped the next time any session is accessed, and once there
+    are more than `max_sessions`, the least recently used ones are dropped. A client whose
+    session was dropped simply gets a new, empty game. All methods are thread-safe.
+    """
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, idle_ttl=DEFAULT_IDLE_TTL, clock=time.monotonic):
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._sessions = OrderedDict() # {session_id: (Game, last used)}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    def get(self, session_id):
+        """Returns the session's Game, creating it if the session is new or was evicted."""
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._sessions.pop(session_id, None)
+            game = entry[0] if entry is not None else None
+            if game is None:
+                game = Game()
+                self.created += 1
+            self._sessions[session_id] = (game, now)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted_lru += 1
+            return game
+
+    def _evict_idle(self, now):
+        if self.idle_ttl is None:
+            return
+        while self._sessions:
+            _, last_used = next(iter(self._sessions.values()))
+            if now - last_used < self.idle_ttl:
+                return
+            self._sessions.popitem(last=False)
+            self.evicted_idle += 1
+
+    def stats(self):
+        """Returns the session counters."""
+        with self._lock:
+            return {
+                'live_sessions': len(self._sessions),
+                'created_sessions': self.created,
+                'evicted_sessions': self.evicted_lru + self.evicted_idle,
+                'evicted_lru': self.evicted_lru,
+                'evicted_idle': self.evicted_idle,
+                'max_sessions': self.max_sessions,
+                'idle_ttl': self.idle_ttl,
+            }
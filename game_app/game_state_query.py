@@ -1,24 +1,94 @@
 import math
-import random
+import json
+import hashlib
 from itertools import combinations
+from operator import itemgetter
 from .geometry import (
     distance_sq, get_extended_border_point, is_ray_blocked,
     polygon_area, points_centroid
 )
-from . import game_data
+
+# State keys that are bookkeeping rather than part of the board. They are left out
+# of position fingerprints, so turn counters and queues don't make positions differ.
+POSITION_IGNORED_KEYS = frozenset({
+    'turn', 'step', 'id_counter', 'log_offset', 'max_turns', 'grid_size', 'teams',
+    'game_phase', 'victory_condition', 'interpretation', 'initial_state', 'forked_from',
+    'last_action_details', 'new_turn_events', 'action_events', 'action_probabilities', 'live_stats',
+    'action_in_turn', 'actions_queue_this_turn', 'no_cost_action_used_by_team_this_turn',
+    'pass_turns', 'turn_passes', 'turn_idle_passes',
+})
+
+# The fields of the entities that make up most of a position. Fingerprints hash each entity once
+# and cache its digest, so a turn that moves a few points only hashes those points again.
+POSITION_ENTITY_FIELDS = {
+    'points': ('id', 'x', 'y', 'teamId'),
+    'lines': ('id', 'p1_id', 'p2_id', 'teamId'),
+}
+_POSITION_ENTITY_GETTERS = {collection: itemgetter(*fields) for collection, fields in POSITION_ENTITY_FIELDS.items()}
+# Entity digests kept by a query before its cache is cleared
+POSITION_DIGEST_CACHE_SIZE = 8192
+
+class PositionCounts:
+    """
+    The position fingerprints of a run's turn ends, counted for stalemate detection.
+
+    Like the log and the metrics, it is kept on the Game rather than in the state, so frames
+    don't carry a table that grows every turn. Each fingerprint is stored with the step of the
+    frame it was recorded in, so a rewound or forked game can drop the turn ends after its frame.
+    """
+
+    def __init__(self):
+        self.steps = []
+        self.positions = []
+        self.counts = {} # {position fingerprint: number of turn ends in it}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def record(self, step, position):
+        """Records a turn end at `position` in the frame of simulation step `step`. Returns how often it has occurred."""
+        self.steps.append(step)
+        self.positions.append(position)
+        repeats = self.counts[position] = self.counts.get(position, 0) + 1
+        return repeats
+
+    def last(self):
+        """Returns the fingerprint of the latest turn end, or None if no turn has ended."""
+        return self.positions[-1] if self.positions else None
+
+    def truncate(self, step):
+        """Drops the turn ends recorded after simulation step `step`."""
+        while self.steps and self.steps[-1] > step:
+            self.steps.pop()
+            position = self.positions.pop()
+            self.counts[position] -= 1
+            if not self.counts[position]:
+                del self.counts[position]
+
+    def copy(self, step=None):
+        """Returns an independent copy, optionally without the turn ends recorded after `step`."""
+        counts = PositionCounts()
+        counts.steps, counts.positions, counts.counts = list(self.steps), list(self.positions), dict(self.counts)
+        if step is not None:
+            counts.truncate(step)
+        return counts
+
 
 class GameStateQuery:
     """
     A class dedicated to read-only operations and queries on the game state.
     It provides a clean interface for action handlers and other parts of the game
     to get information about the current state without modifying it.
+    Given a `state`, it queries that state (e.g. a recorded frame) instead of the game's current one.
     """
-    def __init__(self, game):
+    def __init__(self, game, state=None):
         self.game = game
+        self._state = state
+        self._entity_digests = {} # entity key -> 64-bit digest, see get_position_fingerprint
 
     @property
     def state(self):
-        return self.game.state
+        return self.game.state if self._state is None else self._state
 
     # --- Core State Getters ---
 
@@ -30,6 +100,41 @@ class GameStateQuery:
         """Returns lines belonging to a team."""
         return [l for l in self.state['lines'] if l['teamId'] == teamId]
 
+    def get_position_fingerprint(self):
+        """
+        Returns a short, stable hash of the board: points, lines, structures and their timers.
+        Bookkeeping keys (see POSITION_IGNORED_KEYS) are ignored.
+        Points and lines are hashed one by one and their digests combined with XOR, so equal
+        positions hash the same however their entities are ordered.
+        """
+        state = self.state
+        digests = self._entity_digests
+        if len(digests) > POSITION_DIGEST_CACHE_SIZE:
+            digests.clear()
+        combined = 0
+        for collection, get_fields in _POSITION_ENTITY_GETTERS.items():
+            entities = state.get(collection) or ()
+            if isinstance(entities, dict):
+                entities = entities.values()
+            field_count = len(POSITION_ENTITY_FIELDS[collection])
+            for entity in entities:
+                # An entity with other fields than the usual ones is keyed by its full JSON instead
+                try:
+                    key = (collection, *get_fields(entity)) if len(entity) == field_count else None
+                except KeyError:
+                    key = None
+                if key is None:
+                    key = (collection, json.dumps(entity, sort_keys=True, separators=(',', ':'), default=sorted))
+                digest = digests.get(key)
+                if digest is None:
+                    encoded = json.dumps(key, separators=(',', ':'))
+                    digest = digests[key] = int.from_bytes(hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).digest(), 'big')
+                combined ^= digest
+        rest = {k: v for k, v in state.items() if k not in POSITION_IGNORED_KEYS and k not in POSITION_ENTITY_FIELDS}
+        encoded = json.dumps(rest, sort_keys=True, separators=(',', ':'), default=sorted)
+        combined ^= int.from_bytes(hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).digest(), 'big')
+        return format(combined, '016x')
+
     # --- Structure & Point Status Queries ---
 
     def get_fortified_point_ids(self):
@@ -102,11 +207,11 @@ class GameStateQuery:
                 continue
             
             if definition['storage_type'] == 'dict_keyed_by_pid':
-                for pid, data in self.game._iterate_structures(definition, teamId):
+                for pid, data in self.game._iterate_structures(definition, teamId, state=self.state):
                     critical_pids.add(pid)
                 continue
 
-            for struct in self.game._iterate_structures(definition, teamId):
+            for struct in self.game._iterate_structures(definition, teamId, state=self.state):
                 pids = self.game._get_pids_from_struct(struct, definition.get('point_id_keys', []))
                 critical_pids.update(pids)
         
@@ -158,7 +263,7 @@ class GameStateQuery:
         for pid in team_point_ids:
             if pid not in visited: dfs(pid)
         
-        return list(articulation_points), adj
+        return sorted(articulation_points), adj
 
     def get_team_centroid(self, teamId):
         """Calculates the centroid of a team's points."""
@@ -266,7 +371,7 @@ class GameStateQuery:
             if tuple(sorted((line['p1_id'], line['p2_id']))) in territory_line_keys: continue
             if line['p1_id'] in self.state['points'] and line['p2_id'] in self.state['points']:
                 p1, p2 = self.state['points'][line['p1_id']], self.state['points'][line['p2_id']]
-                if distance_sq(p1, p2) >= game_data.GAME_PARAMETERS['FRACTURE_LINE_MIN_LENGTH_SQ']:
+                if distance_sq(p1, p2) >= self.game.rules.parameters['FRACTURE_LINE_MIN_LENGTH_SQ']:
                     fracturable_lines.append(line)
         return fracturable_lines
     
@@ -274,7 +379,7 @@ class GameStateQuery:
         team_territories = [t for t in self.state.get('territories', []) if t['teamId'] == teamId]
         if not team_territories: return []
         points_map = self.state['points']
-        MIN_AREA = game_data.GAME_PARAMETERS['TERRITORY_STRIKE_MIN_AREA']
+        MIN_AREA = self.game.rules.parameters['TERRITORY_STRIKE_MIN_AREA']
         large_territories = []
         for territory in team_territories:
             p_ids = territory['point_ids']
@@ -289,7 +394,7 @@ class GameStateQuery:
         all_triangles = self.game.formation_manager._find_all_triangles(self.get_team_point_ids(teamId), self.get_team_lines(teamId))
         if not all_triangles: return []
         claimed_triangles = {tuple(sorted(t['point_ids'])) for t in self.state.get('territories', [])}
-        return list(all_triangles - claimed_triangles)
+        return sorted(all_triangles - claimed_triangles)
 
     def find_possible_bastions(self, teamId):
         fortified_point_ids = self.get_fortified_point_ids()
@@ -297,9 +402,9 @@ class GameStateQuery:
         adj = self.get_team_adjacency_list(teamId)
         used_points = self.get_bastion_point_ids()['cores'].union(self.get_bastion_point_ids()['prongs'])
         possible_bastions = []
-        for core_candidate_id in fortified_point_ids:
+        for core_candidate_id in sorted(fortified_point_ids):
             if core_candidate_id not in self.get_team_point_ids(teamId) or core_candidate_id in used_points: continue
-            prong_candidates = [pid for pid in adj.get(core_candidate_id, set()) if pid not in fortified_point_ids and pid not in used_points]
+            prong_candidates = [pid for pid in sorted(adj.get(core_candidate_id, set())) if pid not in fortified_point_ids and pid not in used_points]
             if len(prong_candidates) >= 3: possible_bastions.append({'core_id': core_candidate_id, 'prong_ids': prong_candidates})
         return possible_bastions
 
@@ -313,7 +418,7 @@ class GameStateQuery:
     def find_heartwood_candidates(self, teamId):
         if teamId in self.state.get('heartwoods', {}): return [] # Can only have one heartwood
         adj = self.get_team_adjacency_list(teamId)
-        return [{'center_id': pid, 'branch_ids': list(neighbors)} for pid, neighbors in adj.items() if len(neighbors) >= 5]
+        return [{'center_id': pid, 'branch_ids': sorted(neighbors)} for pid, neighbors in adj.items() if len(neighbors) >= 5]
 
     def find_possible_nova_bursts(self, teamId):
         """Finds non-critical points that are also 'ideal' for a nova burst (i.e., have an enemy line in range)."""
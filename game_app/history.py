@@ -0,0 +1,200 @@
+# game_app/history.py
+import copy
+
+from .snapshot import snapshot_state
+
+# Keys that are fixed once a game has been started. They are stored once per
+# history instead of once per frame.
+INVARIANT_KEYS = ('initial_state', 'teams', 'grid_size', 'max_turns')
+
+# How many frames apart full keyframes are stored.
+DEFAULT_KEYFRAME_INTERVAL = 50
+
+
+def _is_id_keyed_list(value):
+    """Returns True if a list consists solely of dicts with unique 'id' keys (e.g. lines, barricades)."""
+    if not isinstance(value, list):
+        return False
+    ids = set()
+    for item in value:
+        if not isinstance(item, dict) or 'id' not in item or item['id'] in ids:
+            return False
+        ids.add(item['id'])
+    return True
+
+
+def _copy_containers(state):
+    """
+    Copies the top-level containers of a stored frame, sharing their entries.
+    Stored entries are never mutated, so this is enough to get a private working frame.
+    """
+    working = {}
+    for key, value in state.items():
+        if isinstance(value, (dict, list, set)):
+            working[key] = value.copy()
+        else:
+            working[key] = value
+    return working
+
+
+def diff_value(key, old, new):
+    """
+    Computes the operation that turns `old` into `new` for a single state key.
+    Returns None if nothing changed. Changed entries are deep-copied into the operation.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {k: copy.deepcopy(v) for k, v in new.items() if k not in old or old[k] != v}
+        removed = [k for k in old if k not in new]
+        # Insertion order matters for iteration-driven game logic, so record it if it drifted.
+        order = None
+        if removed or changed:
+            expected = [k for k in old if k in new] + [k for k in new if k not in old]
+            if expected != list(new):
+                order = list(new)
+        if not changed and not removed and order is None:
+            return None
+        return ('dict', changed, removed, order)
+
+    if _is_id_keyed_list(old) and _is_id_keyed_list(new):
+        old_by_id = {item['id']: item for item in old}
+        new_ids = [item['id'] for item in new]
+        changed = {item['id']: copy.deepcopy(item) for item in new
+                   if item['id'] not in old_by_id or old_by_id[item['id']] != item}
+        new_id_set = set(new_ids)
+        removed = [item_id for item_id in old_by_id if item_id not in new_id_set]
+        expected = [item_id for item_id in old_by_id if item_id in new_id_set] + [i for i in new_ids if i not in old_by_id]
+        order = new_ids if expected != new_ids else None
+        if not changed and not removed and order is None:
+            return None
+        return ('id_list', changed, removed, order)
+
+    if type(old) is type(new) and old == new:
+        return None
+    return ('set', copy.deepcopy(new))
+
+
+def diff_states(old, new, skip_keys=()):
+    """Computes a diff {key: operation} between two state dicts, ignoring `skip_keys`."""
+    diff = {}
+    for key, value in new.items():
+        if key in skip_keys:
+            continue
+        if key not in old:
+            diff[key] = ('set', copy.deepcopy(value))
+            continue
+        op = diff_value(key, old[key], value)
+        if op is not None:
+            diff[key] = op
+    for key in old:
+        if key not in new and key not in skip_keys:
+            diff[key] = ('remove',)
+    return diff
+
+
+def apply_diff(working, diff):
+    """
+    Applies a diff produced by `diff_states` to a working frame in place.
+    The working frame's containers must be private (see `_copy_containers`); entries are shared.
+    """
+    for key, op in diff.items():
+        kind = op[0]
+        if kind == 'set':
+            value = op[1]
+            working[key] = value.copy() if isinstance(value, (dict, list, set)) else value
+        elif kind == 'remove':
+            working.pop(key, None)
+        elif kind == 'dict':
+            _, changed, removed, order = op
+            # Replaced rather than updated in place: frames built earlier may share the container (see snapshot._share).
+            container = working[key].copy()
+            for k in removed:
+                container.pop(k, None)
+            container.update(changed)
+            working[key] = {k: container[k] for k in order} if order is not None else container
+        elif kind == 'id_list':
+            _, changed, removed, order = op
+            by_id = {item['id']: item for item in working[key]}
+            for item_id in removed:
+                by_id.pop(item_id, None)
+            by_id.update(changed)
+            ids = order if order is not None else list(by_id)
+            working[key] = [by_id[item_id] for item_id in ids]
+
+
+class SimulationHistory:
+    """
+    A compact, list-like store of simulation frames.
+
+    Instead of a full deep copy per action, it keeps a full keyframe every
+    `keyframe_interval` frames plus a small per-frame diff of the keys that
+    changed (points, lines, structures, scalar fields). Invariant keys are
+    stored once. Any frame can be rebuilt on demand with `history[i]`.
+
+    The game log is not part of the frames; `log` is the simulation's GameLog,
+    which each frame indexes through its `log_offset`. `metrics` is the run's
+    per-turn MetricsSeries and `positions` its turn ends' PositionCounts.
+    """
+
+    def __init__(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, log=None, metrics=None, positions=None):
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.log = log
+        self.metrics = metrics
+        self.positions = positions
+        self._invariants = None
+        self._keyframes = {} # {frame_index: stored frame}
+        self._diffs = [] # diff from frame i-1 to frame i (None for frame 0)
+        self._shadow = None # Stored form of the most recently appended frame
+        # Cache of the most recently rebuilt frame, so sequential access only applies one diff.
+        self._cursor_index = None
+        self._cursor_state = None
+
+    def __len__(self):
+        return len(self._diffs)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_frame(i)
+
+    def __getitem__(self, index):
+        return self.get_frame(index)
+
+    def append(self, state):
+        """Records a live game state as the next frame. The live state is not retained."""
+        index = len(self._diffs)
+        if self._shadow is None:
+            self._invariants = {k: copy.deepcopy(state[k]) for k in INVARIANT_KEYS if k in state}
+            self._shadow = snapshot_state({k: v for k, v in state.items() if k not in INVARIANT_KEYS})
+            self._diffs.append(None)
+        else:
+            diff = diff_states(self._shadow, state, skip_keys=INVARIANT_KEYS)
+            apply_diff(self._shadow, diff)
+            self._diffs.append(diff)
+
+        if index % self.keyframe_interval == 0:
+            self._keyframes[index] = _copy_containers(self._shadow)
+
+    def get_frame(self, index):
+        """Rebuilds and returns an independent copy of the full state at a given frame index."""
+        total = len(self)
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("history frame index out of range")
+
+        keyframe_index = index - (index % self.keyframe_interval)
+        if self._cursor_index is not None and keyframe_index <= self._cursor_index <= index:
+            working, start = self._cursor_state, self._cursor_index
+        else:
+            working, start = _copy_containers(self._keyframes[keyframe_index]), keyframe_index
+
+        for i in range(start + 1, index + 1):
+            apply_diff(working, self._diffs[i])
+
+        self._cursor_index, self._cursor_state = index, working
+        return self._materialize(working)
+
+    def _materialize(self, working):
+        """Produces a standalone full state from a working frame. Invariant keys are shared, not copied."""
+        frame = snapshot_state(working)
+        frame.update(self._invariants)
+        return frame
@@ -0,0 +1,272 @@
+# game_app/jobs.py
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .cancellation import CancellationToken
+from .shared_ring import DEFAULT_RING_CAPACITY, RingClosed, SharedRingBuffer
+from .sim_stream import generate_simulation_stream
+
+# How many jobs are kept, running or finished. The oldest are dropped (and stopped) first.
+MAX_JOBS = 64
+
+# How long the collector sleeps when no running job has written anything new.
+COLLECT_INTERVAL = 0.005 # seconds
+
+# How often a reader waiting for new lines checks that the job's worker is still running.
+LIVENESS_INTERVAL = 1.0 # seconds
+
+# How much of a job's stream is kept in memory; the rest of it is spilled to a temporary file.
+JOB_SPOOL_MEMORY = 1024 * 1024 # bytes
+
+# How much of a job's stream a reader takes from the spool at a time.
+JOB_READ_CHUNK = 256 * 1024 # bytes
+
+# Stream update types that are frames, counted in a job's status
+FRAME_UPDATE_TYPES = (b'state', b'delta')
+
+_worker_game = None # The Game a worker process runs its jobs with
+
+
+def _init_worker():
+    """Imports the game once per worker process, so jobs start without that cost."""
+    global _worker_game
+    from .game_logic import Game
+    _worker_game = Game()
+
+
+def _warm_up():
+    return True
+
+
+def _run_job(ring_name, setup, seed, selection, projection, budget):
+    """
+    Worker side of a SimulationJob: runs the simulation and writes its stream, the same
+    newline-delimited JSON as /api/game/start, into the job's shared ring buffer.
+    Each line is preceded by its update type and a space, so the collector can tell the lines apart
+    without parsing them.
+    The (max_seconds, max_steps) `budget` counts from when the job starts running.
+    """
+    ring = SharedRingBuffer(ring_name)
+    try:
+        steps = _worker_game.iter_simulation(
+            setup['teams'], setup['points'], setup['max_turns'], setup['grid_size'], seed=seed,
+            cancel_token=CancellationToken(*budget)
+        )
+        for update_type, line in generate_simulation_stream(_worker_game, steps, selection, projection=projection, typed=True):
+            ring.write(f'{update_type} {line}'.encode('utf-8'))
+    except RingClosed: # The job was dropped; nobody is reading any more
+        pass
+    finally:
+        ring.close()
+
+
+class SimulationJob:
+    """
+    A simulation running in a JobQueue worker process.
+
+    The worker writes the job's stream into a shared ring buffer, from which the queue's
+    collector thread moves it into the job's spool, keeping track of its progress. Any
+    number of clients can then read the lines from the start with iter_lines(), while
+    the job runs or after it has finished. The spool keeps up to JOB_SPOOL_MEMORY bytes
+    in memory and spills longer streams to a temporary file, deleted once the job has been
+    dropped and no reader holds it any more.
+    """
+
+    def __init__(self, job_id, seed, ring, future):
+        self.id = job_id
+        self.seed = seed
+        self.started = False
+        self.finished = False
+        self.error = None
+        self.progress = {'progress': 0, 'turn': 0, 'max_turns': None, 'step': 0}
+        self.frames = 0
+        self._spool = tempfile.SpooledTemporaryFile(max_size=JOB_SPOOL_MEMORY)
+        self._size = 0 # Bytes of stream lines in the spool
+        self._partial = b''
+        self._ring = ring
+        self._future = future
+        self._condition = threading.Condition()
+
+    def _collect(self):
+        """Moves newly written stream lines out of the ring buffer. Returns True if there were any."""
+        with self._condition:
+            if self.finished:
+                return False
+            # Checked before reading: a worker is done only after its last write
+            done = self._future.done()
+            data = self._partial + self._ring.read()
+            *records, self._partial = data.split(b'\n')
+            lines = []
+            for record in records:
+                update_type, _, line = record.partition(b' ')
+                if update_type == b'progress':
+                    self.progress = json.loads(line)['data']
+                elif update_type in FRAME_UPDATE_TYPES:
+                    self.frames += 1
+                lines.append(line + b'\n')
+            if lines:
+                self._spool.seek(self._size)
+                self._spool.write(b''.join(lines))
+                self._size = self._spool.tell()
+            self.started = self.started or bool(lines)
+            if done and not lines:
+                if not self._future.cancelled() and self._future.exception() is not None:
+                    self.error = str(self._future.exception())
+                self._finish()
+            self._condition.notify_all()
+            return bool(lines)
+
+    def _finish(self):
+        self.finished = True
+        self._ring.close()
+
+    def close(self, error='Job was dropped before it finished.'):
+        """Stops the job if it is still queued or running. Lines already collected stay readable."""
+        with self._condition:
+            if not self.finished:
+                self._future.cancel()
+                self.error = error
+                self._finish()
+            self._condition.notify_all()
+
+    def iter_lines(self):
+        """
+        Yields the job's stream lines from the first, waiting for new ones until the job has finished.
+        While it waits, it checks every LIVENESS_INTERVAL whether the worker is done with the job
+        (or has died); if so, it collects the job's last output itself instead of relying on the
+        collector thread, so a reader never waits for a job that can no longer make progress.
+        """
+        offset = 0
+        partial = b''
+        while True:
+            with self._condition:
+                ready = self._condition.wait_for(lambda: self.finished or offset < self._size, LIVENESS_INTERVAL)
+                data = b''
+                if offset < self._size:
+                    self._spool.seek(offset)
+                    data = self._spool.read(min(self._size - offset, JOB_READ_CHUNK))
+                finished = self.finished
+            if not ready:
+                if self._future.done():
+                    self._collect()
+                continue
+            offset += len(data)
+            *lines, partial = (partial + data).split(b'\n')
+            for line in lines:
+                yield line.decode('utf-8') + '\n'
+            if finished and not data:
+                return
+
+    def status(self):
+        """Returns the job's state ('queued', 'running', 'finished' or 'failed') and progress."""
+        with self._condition:
+            if self.error is not None:
+                state = 'failed'
+            elif self.finished:
+                state = 'finished'
+            else:
+                state = 'running' if self.started else 'queued'
+            return {
+                'id': self.id,
+                'status': state,
+                'seed': self.seed,
+                **self.progress,
+                'frames': self.frames,
+                'error': self.error,
+            }
+
+
+class JobQueue:
+    """
+    Runs simulations as background jobs on a pool of worker processes.
+
+    Simulations in the request thread hold the GIL, so one long run stalls every other
+    request; jobs run in `workers` processes instead, each with the game already imported.
+    start() launches and warms up the workers (the first submit() does it otherwise).
+    Frames come back through a SharedRingBuffer per job rather than being pickled.
+    """
+
+    def __init__(self, workers, max_jobs=MAX_JOBS, ring_capacity=DEFAULT_RING_CAPACITY):
+        self.workers = max(1, int(workers))
+        self.max_jobs = max(1, int(max_jobs))
+        self.ring_capacity = ring_capacity
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._collector = None
+
+    def start(self):
+        """Starts the worker processes and waits until each has imported the game."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            # Spawned rather than forked: the web server's threads would not survive a fork safely
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker
+            )
+            warm_ups = [self._executor.submit(_warm_up) for _ in range(self.workers)]
+            self._collector = threading.Thread(target=self._collect_loop, daemon=True)
+            self._collector.start()
+        for future in warm_ups:
+            future.result()
+
+    def submit(self, setup, seed, selection, projection, budget=(None, None)):
+        """
+        Queues a simulation of `setup` with `seed` and returns its SimulationJob.
+        `budget` is the (max_seconds, max_steps) limit of the run, see CancellationToken.
+        """
+        self.start()
+        ring = SharedRingBuffer(capacity=self.ring_capacity)
+        future = self._executor.submit(_run_job, ring.name, setup, seed, selection, projection, budget)
+        job = SimulationJob(uuid.uuid4().hex, seed, ring, future)
+        with self._lock:
+            self._jobs[job.id] = job
+            evicted = []
+            while len(self._jobs) > self.max_jobs:
+                evicted.append(self._jobs.popitem(last=False)[1])
+        for old_job in evicted:
+            old_job.close()
+        return job
+
+    def submit_task(self, fn, *args):
+        """
+        Runs `fn(*args)` in a worker process and returns its Future. For short tasks with small
+        results, such as divination runs, which need neither a ring buffer nor a SimulationJob.
+        """
+        self.start()
+        return self._executor.submit(fn, *args)
+
+    def get(self, job_id):
+        """Returns a job, or None if it doesn't exist or was dropped."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _collect_loop(self):
+        """Background loop: moves the output of running jobs out of their ring buffers."""
+        while True:
+            with self._lock:
+                running = [job for job in self._jobs.values() if not job.finished]
+            collected = False
+            for job in running:
+                try:
+                    collected = job._collect() or collected
+                except Exception as e: # One job's unreadable output must not stop the collection of the others
+                    job.close(f'Job output could not be read: {e}')
+            if not collected:
+                time.sleep(COLLECT_INTERVAL)
+
+    def shutdown(self):
+        """Stops all jobs and the worker processes."""
+        with self._lock:
+            jobs, self._jobs = list(self._jobs.values()), OrderedDict()
+            executor, self._executor = self._executor, None
+        for job in jobs:
+            job.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,116 @@
+# game_app/replay.py
+import copy
+
+from .game_logic import Game
+
+# How many frames apart the replay engine keeps checkpoints for backward seeks.
+DEFAULT_CHECKPOINT_INTERVAL = 100
+
+
+def setup_from_initial_state(initial_state):
+    """Extracts a replayable setup dict from a game's stored `initial_state`."""
+    return {
+        'teams': initial_state['teams'],
+        'points': initial_state['points'],
+        'max_turns': initial_state['max_turns'],
+        'grid_size': initial_state['grid_size'],
+    }
+
+
+class ReplayEngine:
+    """
+    Rebuilds frames of a seeded simulation from its setup and seed alone.
+
+    Frames are recomputed lazily: moving forward continues the live simulation,
+    and moving backward resumes from the nearest checkpoint (a copy of the state
+    and the RNG state) at or before the requested frame.
+
+    Replays are exact in any process: the game never picks from a set of point IDs in
+    the set's own iteration order, which changes with the process's hash seed.
+    A game played by other than the default rules replays with the same `rules` (a GameRules).
+    """
+
+    def __init__(self, setup, seed, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, rules=None):
+        self.setup = copy.deepcopy(setup)
+        self.seed = seed
+        self.checkpoint_interval = max(1, int(checkpoint_interval))
+        self._game = Game(rules=rules)
+        self._checkpoints = {} # {frame_index: (state, rng_state)}
+        self._steps = None
+        self._index = -1 # Frame index of the live game state
+        self._length = None # Total frame count, known once the simulation has finished
+        self._rewind_to(None)
+
+    @classmethod
+    def from_initial_state(cls, initial_state, **kwargs):
+        """Creates a replay engine for a game's stored `initial_state`, which includes its seed."""
+        return cls(setup_from_initial_state(initial_state), initial_state['seed'], **kwargs)
+
+    @property
+    def log(self):
+        """The replayed game's log. Frames returned so far index into it through their `log_offset`."""
+        return self._game.log
+
+    def __len__(self):
+        if self._length is None:
+            while self._advance():
+                pass
+        return self._length
+
+    def __iter__(self):
+        index = 0
+        while True:
+            try:
+                yield self.get_frame(index)
+            except IndexError:
+                return
+            index += 1
+
+    def __getitem__(self, index):
+        return self.get_frame(index)
+
+    def get_frame(self, index):
+        """Returns an independent copy of the full state at a given frame index."""
+        if index < 0:
+            index += len(self)
+        if index < 0 or (self._length is not None and index >= self._length):
+            raise IndexError("replay frame index out of range")
+
+        if index < self._index:
+            self._rewind_to(max(i for i in self._checkpoints if i <= index))
+        while self._index < index:
+            if not self._advance():
+                raise IndexError("replay frame index out of range")
+        return self._game.snapshot()
+
+    def _rewind_to(self, checkpoint_index):
+        """Resets the live game to a checkpoint, or to a fresh start if `checkpoint_index` is None."""
+        if checkpoint_index is None:
+            setup = copy.deepcopy(self.setup)
+            self._steps = self._game.iter_simulation(
+                setup['teams'], setup['points'], setup['max_turns'], setup['grid_size'], seed=self.seed
+            )
+            self._index = -1
+            return
+        state, rng_state = self._checkpoints[checkpoint_index]
+        self._game.restore(state)
+        self._game.rng.setstate(rng_state)
+        self._steps = self._game.continue_simulation()
+        self._index = checkpoint_index
+
+    def _advance(self):
+        """Advances the live game by one frame. Returns False once the simulation has finished."""
+        try:
+            next(self._steps)
+        except StopIteration:
+            self._length = self._index + 1
+            return False
+        self._index += 1
+        if self._index % self.checkpoint_interval == 0 and self._index not in self._checkpoints:
+            self._checkpoints[self._index] = (self._game.snapshot(), self._game.rng.getstate())
+        return True
+
+
+def replay_frame(setup, seed, step):
+    """Rebuilds a single frame of a simulation from its setup, seed and frame index."""
+    return ReplayEngine(setup, seed).get_frame(step)
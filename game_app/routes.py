@@ -1,11 +1,54 @@
 import os
 import base64
+import hashlib
 import json
-from flask import Blueprint, render_template, jsonify, request, current_app, send_from_directory, Response, stream_with_context
-from . import game_logic
-from .game_logic import game # Explicitly import the instance
+import uuid
+import random
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from flask import (
+    Blueprint, jsonify, request, current_app, send_from_directory, Response, stream_with_context,
+    g, after_this_request
+)
 from . import game_data
 from . import utils
+from .replay import ReplayEngine
+from .frame_selection import FrameSelection
+from .field_projection import FieldProjection
+from .sim_session import SimulationSession
+from .sim_stream import generate_simulation_stream
+from .game_sessions import GameSessionManager
+from .cancellation import CancellationToken
+from .rules import GameRules
+from . import wire_format
+from . import divination
+
+# Replay engines for recently scrubbed simulations, keyed by their (setup, seed).
+MAX_CACHED_REPLAYS = 4
+_replay_cache = OrderedDict()
+
+# Paused, demand-driven simulations keyed by session ID. The least recently used are closed first.
+MAX_SIM_SESSIONS = 8
+MAX_FRAMES_PER_PAGE = 200
+_sim_sessions = OrderedDict()
+
+# Guards _replay_cache and _sim_sessions, which all request threads share
+_cache_lock = threading.Lock()
+
+# (ETag, JSON body) of the action catalog, built on first request
+_actions_catalog = None
+
+# Most runs a divination batch may ask for, and the least time between its partial aggregates
+MAX_DIVINATION_RUNS = 1000
+DIVINATION_UPDATE_INTERVAL = 0.5 # seconds
+
+# Each client gets its own Game, found by this header or, failing that, this cookie (see _current_game).
+SESSION_HEADER = 'X-Game-Session'
+SESSION_COOKIE = 'geom_session'
+MAX_SESSION_ID_LENGTH = 64
 
 # Using a Blueprint to organize routes.
 # The first argument is the name of the blueprint.
@@ -27,97 +70,466 @@ def check_updates():
         return jsonify({"updated": True, "message": "Source files have changed. Please restart the server and refresh the page."})
     return jsonify({"updated": False})
 
+def _current_game():
+    """
+    Returns the requesting client's Game from the app's GameSessionManager. A client without
+    a session (or with a malformed ID) is given a new one, sent back as a cookie.
+    """
+    if 'game' in g:
+        return g.game
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    if not session_id or len(session_id) > MAX_SESSION_ID_LENGTH or not session_id.isalnum():
+        session_id = GameSessionManager.new_session_id()
+
+        @after_this_request
+        def set_session_cookie(response):
+            response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite='Lax')
+            return response
+
+    g.game = current_app.extensions['game_sessions'].get(session_id)
+    return g.game
+
+@main_routes.route('/api/sessions', methods=['GET'])
+def get_session_stats():
+    """Returns the game session counters: live, created and evicted (by LRU or idle TTL) sessions."""
+    return jsonify(current_app.extensions['game_sessions'].stats())
+
+def _cached_json_response(etag, get_body):
+    """
+    Returns a JSON response tagged with a strong `etag`, or 304 Not Modified if the client already
+    has it (If-None-Match). `get_body()` is only called when the body has to be sent.
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(get_body(), mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache' # Cache, but revalidate on every use
+    return response
+
 @main_routes.route('/api/game/state', methods=['GET'])
 def get_game_state():
-    """Returns the complete current game state."""
-    return jsonify(game.get_state())
+    """Returns the complete current game state. The response is cached per state version (ETag)."""
+    game = _current_game()
+    return _cached_json_response(f'{game.instance_id}-{game.state_version}', game.get_state_json)
+
+def _parse_seed(value):
+    """Parses an optional seed from a request payload. Raises ValueError/TypeError if invalid."""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+def _parse_budget(data):
+    """
+    Returns the (max_seconds, max_steps) budget of a simulation: the payload's optional `timeBudget`
+    and `stepBudget`, capped by the app's SIMULATION_TIME_BUDGET and SIMULATION_STEP_BUDGET (0 = no limit).
+    None means no limit. Raises ValueError/TypeError if they are invalid.
+    """
+    budget = []
+    for key, config_key, parse in (('timeBudget', 'SIMULATION_TIME_BUDGET', float),
+                                   ('stepBudget', 'SIMULATION_STEP_BUDGET', int)):
+        limit = current_app.config.get(config_key) or None
+        value = data.get(key)
+        if value is None or value == '':
+            budget.append(limit)
+            continue
+        value = parse(value)
+        if value <= 0:
+            raise ValueError(f"{key} must be > 0.")
+        budget.append(value if limit is None else min(value, limit))
+    return tuple(budget)
+
+def _parse_delta_encoder(data):
+    """
+    Builds the FrameDeltaEncoder requested by a payload's `delta` and optional `keyframeInterval`
+    options, or returns None for a stream of full frames. Raises ValueError/TypeError if they are invalid.
+    """
+    if not data.get('delta'):
+        return None
+    interval = data.get('keyframeInterval')
+    if interval is None or interval == '':
+        return wire_format.FrameDeltaEncoder()
+    interval = int(interval)
+    if interval < 1:
+        raise ValueError("keyframeInterval must be >= 1.")
+    return wire_format.FrameDeltaEncoder(interval)
+
+def _negotiate_stream_format(compress=False):
+    """
+    Picks the simulation stream's format and compression from the request's `Accept` and `Accept-Encoding`.
+    Returns (mimetype, content encoding or None). JSON is sent unless the client asks for the columnar format.
+    Streams are only compressed when the request asks for it (`compress`) or the app's STREAM_COMPRESSION
+    is set, since compressed frames reach the client in batches rather than as each one is computed.
+    """
+    mimetype = request.accept_mimetypes.best_match(
+        [wire_format.JSON_STREAM_MIMETYPE, wire_format.COLUMNAR_STREAM_MIMETYPE],
+        default=wire_format.JSON_STREAM_MIMETYPE
+    )
+    encoding = None
+    if compress or current_app.config.get('STREAM_COMPRESSION'):
+        encoding = next((e for e in wire_format.STREAM_ENCODINGS if request.accept_encodings[e] > 0), None)
+    return mimetype, encoding
+
+def _simulation_stream_response(generate_chunks, cancel_token=None, compress=False):
+    """
+    Streams a simulation in the negotiated format. `generate_chunks(encoder)` yields the stream's lines,
+    encoding states with `encoder` (None for JSON, see sim_stream.generate_simulation_stream).
+    The simulation's `cancel_token` is cancelled when the response is closed, so a client that
+    goes away mid-stream stops the simulation before its next action.
+    With `compress`, the stream is compressed if the client accepts it (see _negotiate_stream_format).
+    """
+    mimetype, encoding = _negotiate_stream_format(compress)
+    encoder = wire_format.ColumnarEncoder() if mimetype == wire_format.COLUMNAR_STREAM_MIMETYPE else None
+    chunks = generate_chunks(encoder)
+    if encoding:
+        chunks = wire_format.compress_stream(chunks, encoding)
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if cancel_token is not None:
+        response.call_on_close(lambda: cancel_token.cancel("Cancelled: the client disconnected."))
+    return response
 
 @main_routes.route('/api/game/start', methods=['POST'])
 def start_game():
-    """Runs a full simulation, then streams the results to the client."""
+    """
+    Runs a simulation, streaming each frame to the client as soon as it has been computed.
+    Optional `frames` ('all', 'turns' or 'final'), `fromTurn` and `stride` options limit which
+    frames are sent; frames that aren't selected are never copied or augmented. With `delta`,
+    full frames are only sent every `keyframeInterval` frames and patches in between.
+    `fields` and `exclude` (lists of frame keys) limit what each frame contains and is augmented with.
+    With `forkable`, every frame is also kept (delta-encoded) in the session's game until its next run,
+    so /api/game/fork can continue the run from any of them. That memory grows with the length of the
+    run, so it is off by default. With `compress`, the stream is gzip/deflate-compressed if the client accepts it.
+    """
     data = request.json
     teams = data.get('teams', {})
     points = data.get('points', [])
     try:
         max_turns = int(data.get('maxTurns', 100))
         grid_size = int(data.get('gridSize', 10))
+        seed = _parse_seed(data.get('seed'))
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid maxTurns or gridSize"}), 400
-
-    # Run the entire simulation first. This returns a list of raw state objects.
-    raw_history = game.run_full_simulation(teams, points, max_turns, grid_size)
-
-    def generate():
-        total_steps = len(raw_history)
-        if total_steps == 0:
-            return
+        return jsonify({"error": "Invalid maxTurns, gridSize or seed"}), 400
+    try:
+        selection = FrameSelection.from_payload(data)
+        delta = _parse_delta_encoder(data)
+        projection = FieldProjection.from_payload(data)
+        cancel_token = CancellationToken(*_parse_budget(data))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid frame selection, delta, field or budget options: {e}"}), 400
 
-        for i, state in enumerate(raw_history):
-            # 1. Yield a progress update
-            progress = round((i / (total_steps - 1)) * 100) if total_steps > 1 else 100
-            progress_update = {
-                "type": "progress",
-                "data": {
-                    "progress": progress,
-                    "turn": state['turn'],
-                    "max_turns": state['max_turns'],
-                    "step": i + 1, # a 1-based step counter for display
-                }
-            }
-            yield json.dumps(progress_update) + '\n'
-
-            # 2. Augment and yield the state update
-            augmented_state_json = game.augment_state_for_frontend(state, as_json_string=True)
-            # Manually construct the JSON string to avoid double-encoding
-            state_update_json = f'{{"type": "state", "data": {augmented_state_json}}}'
-            yield state_update_json + '\n'
-
-    return Response(stream_with_context(generate()), mimetype='application/x-json-stream')
+    game = _current_game()
+    steps = game.iter_simulation(
+        teams, points, max_turns, grid_size, seed=seed, record_history=bool(data.get('forkable')),
+        cancel_token=cancel_token
+    )
+    return _simulation_stream_response(
+        lambda encoder: generate_simulation_stream(game, steps, selection, encoder, delta, projection),
+        cancel_token, compress=bool(data.get('compress'))
+    )
 
 @main_routes.route('/api/game/restart', methods=['POST'])
 def restart_game():
-    """Restarts the simulation with the same initial settings, streaming updates."""
-    
-    raw_history = game.restart_and_run_simulation()
+    """Restarts the simulation with the same initial settings, streaming updates. Takes `forkable` like /api/game/start."""
+    data = request.get_json(silent=True) or {}
+    try:
+        seed = _parse_seed(data.get('seed'))
+        selection = FrameSelection.from_payload(data)
+        delta = _parse_delta_encoder(data)
+        projection = FieldProjection.from_payload(data)
+        cancel_token = CancellationToken(*_parse_budget(data))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid seed, frame selection, field or budget options"}), 400
 
-    def generate():
-        total_steps = len(raw_history)
-        if total_steps == 0:
-            # This can happen if there's no initial_state to restart from.
+    game = _current_game()
+    initial_state = game.state.get('initial_state')
+
+    def generate(encoder):
+        if not initial_state:
             yield json.dumps({"type": "error", "data": "No initial state saved to restart from."}) + '\n'
             return
+        steps = game.iter_simulation(
+            initial_state['teams'], initial_state['points'], initial_state['max_turns'], initial_state['grid_size'],
+            seed=seed, record_history=bool(data.get('forkable')), cancel_token=cancel_token
+        )
+        yield from generate_simulation_stream(game, steps, selection, encoder, delta, projection)
+
+    return _simulation_stream_response(generate, cancel_token, compress=bool(data.get('compress')))
+
+@main_routes.route('/api/game/fork', methods=['POST'])
+def fork_game():
+    """
+    Continues the last simulation from one of its frames (`step`) under a new `seed` and optionally
+    new `traits` ({teamId: trait}), streaming updates like /api/game/start. Only the steps after the
+    fork are simulated. The stream starts with the fork frame; the original run stays forkable.
+    Only a run started with `forkable` can be forked.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        step = int(data.get('step', 0))
+        seed = _parse_seed(data.get('seed'))
+        selection = FrameSelection.from_payload(data)
+        delta = _parse_delta_encoder(data)
+        projection = FieldProjection.from_payload(data)
+        cancel_token = CancellationToken(*_parse_budget(data))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid step, seed, frame selection, field or budget options"}), 400
+    traits = data.get('traits') or {}
+    if not isinstance(traits, dict):
+        return jsonify({"error": "traits must map team IDs to traits"}), 400
+
+    game = _current_game()
+    if game.history is None:
+        return jsonify({"error": "The last simulation was not started with forkable, so it can't be forked."}), 400
+    try:
+        forked = game.fork(step, seed=seed, traits=traits)
+    except IndexError:
+        return jsonify({"error": "Step is beyond the end of the simulation."}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    steps = itertools.chain([forked.state], forked.continue_simulation(cancel_token))
+    return _simulation_stream_response(
+        lambda encoder: generate_simulation_stream(forked, steps, selection, encoder, delta, projection),
+        cancel_token, compress=bool(data.get('compress'))
+    )
+
+@main_routes.route('/api/game/replay', methods=['POST'])
+def replay_frame():
+    """Rebuilds a single augmented frame of a seeded simulation from its setup, seed and step."""
+    data = request.json
+    try:
+        setup = {
+            'teams': data.get('teams', {}),
+            'points': data.get('points', []),
+            'max_turns': int(data.get('maxTurns', 100)),
+            'grid_size': int(data.get('gridSize', 10)),
+        }
+        seed = _parse_seed(data.get('seed'))
+        step = int(data.get('step', 0))
+        projection = FieldProjection.from_payload(data)
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid maxTurns, gridSize, seed, step or field options"}), 400
+    if seed is None:
+        return jsonify({"error": "A seed is required to replay a simulation."}), 400
+
+    cache_key = json.dumps([setup, seed], sort_keys=True)
+    # An engine is taken out of the cache while in use, as it replays one game at a time;
+    # a concurrent request for the same replay builds its own.
+    with _cache_lock:
+        engine = _replay_cache.pop(cache_key, None)
+    if engine is None:
+        engine = ReplayEngine(setup, seed)
+    try:
+        state = engine.get_frame(step)
+        frame_json = _current_game().augment_state_for_frontend(
+            state, as_json_string=True, log=engine.log, fields=projection.fields, exclude=projection.exclude
+        )
+    except IndexError:
+        return jsonify({"error": "Step is beyond the end of the simulation."}), 404
+    finally:
+        with _cache_lock:
+            _replay_cache[cache_key] = engine
+            while len(_replay_cache) > MAX_CACHED_REPLAYS:
+                _replay_cache.popitem(last=False)
+    return Response(frame_json, mimetype='application/json')
+
+def _get_sim_session(sim_id):
+    """Returns a simulation session and marks it as recently used, or None if it doesn't exist."""
+    with _cache_lock:
+        session = _sim_sessions.get(sim_id)
+        if session is not None:
+            _sim_sessions.move_to_end(sim_id)
+    return session
+
+@main_routes.route('/api/sim', methods=['POST'])
+def create_sim():
+    """
+    Creates a paused simulation session from the same options as /api/game/start.
+    Nothing beyond a small read-ahead is simulated until frames are requested.
+    """
+    data = request.json
+    try:
+        setup = {
+            'teams': data.get('teams', {}),
+            'points': data.get('points', []),
+            'max_turns': int(data.get('maxTurns', 100)),
+            'grid_size': int(data.get('gridSize', 10)),
+        }
+        seed = _parse_seed(data.get('seed'))
+        selection = FrameSelection.from_payload(data)
+        projection = FieldProjection.from_payload(data)
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid maxTurns, gridSize, seed, frame selection or field options"}), 400
+
+    sim_id = uuid.uuid4().hex
+    session = SimulationSession(setup, seed=seed, frame_filter=selection, projection=projection)
+    with _cache_lock:
+        _sim_sessions[sim_id] = session
+        evicted = []
+        while len(_sim_sessions) > MAX_SIM_SESSIONS:
+            evicted.append(_sim_sessions.popitem(last=False)[1])
+    for old_session in evicted:
+        old_session.close()
+    return jsonify({"id": sim_id, **session.status()})
+
+@main_routes.route('/api/sim/<sim_id>/frames', methods=['GET'])
+def get_sim_frames(sim_id):
+    """
+    Returns a page of augmented frames (`from`, `count` query args), simulating only as far as needed.
+    Each frame carries the log entries since the frame before it, as in the /api/game/start stream.
+    """
+    session = _get_sim_session(sim_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired simulation."}), 404
+    try:
+        start = int(request.args.get('from', 0))
+        count = min(int(request.args.get('count', 20)), MAX_FRAMES_PER_PAGE)
+    except ValueError:
+        return jsonify({"error": "Invalid from or count"}), 400
+
+    frames = session.get_frames(start, count)
+    page_info = json.dumps({"from": start, "next": start + len(frames), **session.status()})
+    # Manually construct the JSON to avoid decoding and re-encoding the augmented frames
+    return Response(f'{{"frames": [{",".join(frames)}], "page": {page_info}}}', mimetype='application/json')
+
+@main_routes.route('/api/sim/<sim_id>', methods=['DELETE'])
+def delete_sim(sim_id):
+    """Stops and discards a simulation session."""
+    with _cache_lock:
+        session = _sim_sessions.pop(sim_id, None)
+    if session is None:
+        return jsonify({"error": "Unknown or expired simulation."}), 404
+    session.close()
+    return jsonify({"success": True})
+
+@main_routes.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Queues a simulation from the same options as /api/game/start to run in a job worker process.
+    Returns the job's ID and status at once; poll /api/jobs/<id> or read /api/jobs/<id>/stream.
+    """
+    data = request.json
+    try:
+        setup = {
+            'teams': data.get('teams', {}),
+            'points': data.get('points', []),
+            'max_turns': int(data.get('maxTurns', 100)),
+            'grid_size': int(data.get('gridSize', 10)),
+        }
+        seed = _parse_seed(data.get('seed'))
+        selection = FrameSelection.from_payload(data)
+        projection = FieldProjection.from_payload(data)
+        budget = _parse_budget(data)
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid maxTurns, gridSize, seed, frame selection, field or budget options"}), 400
+    if seed is None:
+        seed = random.randrange(2**32) # Drawn here so the job's status can report it from the start
+
+    job = current_app.extensions['jobs'].submit(setup, seed, selection, projection, budget)
+    return jsonify(job.status()), 202
+
+@main_routes.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Returns a simulation job's status and progress."""
+    job = current_app.extensions['jobs'].get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    return jsonify(job.status())
+
+@main_routes.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    """
+    Streams a simulation job's output from its first line, in the format of the /api/game/start
+    JSON stream, following the job until it finishes. `?compress=1` compresses it like `compress` there.
+    """
+    job = current_app.extensions['jobs'].get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    _, encoding = _negotiate_stream_format(request.args.get('compress', 0, type=int))
+    chunks = job.iter_lines()
+    if encoding:
+        chunks = wire_format.compress_stream(chunks, encoding)
+    response = Response(stream_with_context(chunks), mimetype=wire_format.JSON_STREAM_MIMETYPE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@main_routes.route('/api/divination/batch', methods=['POST'])
+def divination_batch():
+    """
+    Runs one setup ({teams, points, maxTurns, gridSize}) many times in the job worker processes and
+    streams the distribution of outcomes. With `seeds`, there is one run per seed; otherwise `runs`
+    runs with fresh seeds, played by the optional `rules` overrides (see rules.GameRules). Workers send
+    back a small stats record per run, never frames. The stream sends `aggregate` lines as runs finish
+    and ends with the `result` (see divination.DivinationAggregate), which lists the seed and outcome
+    of every run; a run's seed replays it (see replay.ReplayEngine).
+    """
+    data = request.get_json(silent=True) or {}
+    setup_data = data.get('setup')
+    if not isinstance(setup_data, dict) or not setup_data.get('teams'):
+        return jsonify({"error": "setup must hold the teams, points, maxTurns and gridSize of a game"}), 400
+    try:
+        setup = {
+            'teams': setup_data['teams'],
+            'points': setup_data.get('points', []),
+            'max_turns': int(setup_data.get('maxTurns', 100)),
+            'grid_size': int(setup_data.get('gridSize', 10)),
+        }
+        seeds = data.get('seeds')
+        if seeds is None:
+            seeds = [random.randrange(2**32) for _ in range(int(data.get('runs', 100)))]
+        else:
+            seeds = [int(seed) for seed in seeds]
+        budget = _parse_budget(data)
+        rules = GameRules.from_dict(data.get('rules'))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid maxTurns, gridSize, runs, seeds, budget or rules options: {e}"}), 400
+    if not 0 < len(seeds) <= MAX_DIVINATION_RUNS:
+        return jsonify({"error": f"A batch must have between 1 and {MAX_DIVINATION_RUNS} runs."}), 400
+
+    jobs = current_app.extensions['jobs']
+
+    def generate():
+        futures = [jobs.submit_task(divination.run_divination, setup, seed, budget, rules) for seed in seeds]
+        aggregate = divination.DivinationAggregate(setup['teams'], len(seeds))
+        last_update = None
+        try:
+            for future in as_completed(futures):
+                if future.exception() is None:
+                    aggregate.add(future.result())
+                else:
+                    aggregate.add_failure(future.exception())
+                now = time.monotonic()
+                if last_update is None or now - last_update >= DIVINATION_UPDATE_INTERVAL:
+                    last_update = now
+                    yield json.dumps({"type": "aggregate", "data": aggregate.to_dict()}) + '\n'
+            yield json.dumps({"type": "result", "data": aggregate.to_dict(outcomes=True)}) + '\n'
+        finally:
+            for future in futures: # Drop the runs not started yet if the client went away
+                future.cancel()
 
-        for i, state in enumerate(raw_history):
-            # 1. Yield a progress update
-            progress = round((i / (total_steps - 1)) * 100) if total_steps > 1 else 100
-            progress_update = {
-                "type": "progress",
-                "data": {
-                    "progress": progress,
-                    "turn": state['turn'],
-                    "max_turns": state['max_turns'],
-                    "step": i + 1,
-                }
-            }
-            yield json.dumps(progress_update) + '\n'
-
-            # 2. Augment and yield the state update
-            augmented_state_json = game.augment_state_for_frontend(state, as_json_string=True)
-            state_update_json = f'{{"type": "state", "data": {augmented_state_json}}}'
-            yield state_update_json + '\n'
-
-    return Response(stream_with_context(generate()), mimetype='application/x-json-stream')
+    return Response(stream_with_context(generate()), mimetype=wire_format.JSON_STREAM_MIMETYPE)
 
 @main_routes.route('/api/game/reset', methods=['POST'])
 def reset_game():
     """Resets the game to its initial empty state (SETUP phase)."""
+    game = _current_game()
     game.reset()
     return jsonify(game.get_state())
 
 @main_routes.route('/api/actions/all', methods=['GET'])
 def get_all_actions():
-    """Returns a structured list of all possible actions with their descriptions."""
-    return jsonify(game_data.get_all_actions_data())
+    """Returns a structured list of all possible actions with their descriptions. It never changes while the server runs."""
+    global _actions_catalog
+    if _actions_catalog is None:
+        body = json.dumps(game_data.get_all_actions_data())
+        _actions_catalog = (hashlib.sha1(body.encode('utf-8')).hexdigest(), body)
+    etag, body = _actions_catalog
+    return _cached_json_response(etag, lambda: body)
 
 @main_routes.route('/api/dev/save_illustration', methods=['POST'])
 def save_illustration():
@@ -0,0 +1,71 @@
+# game_app/rules.py
+from . import game_data
+
+
+class GameRules:
+    """
+    The tunable numbers of a game: the GAME_PARAMETERS, the base weights of the action groups
+    and the per-trait group multipliers.
+
+    Each Game carries its own rules (Game.rules), which start from the defaults in game_data,
+    so rule variants can be played side by side in one process without changing the module
+    globals. Overrides are partial: only the values given replace the defaults.
+    """
+
+    def __init__(self, parameters=None, group_base_weights=None, trait_group_multipliers=None):
+        self.parameters = dict(game_data.GAME_PARAMETERS)
+        self.group_base_weights = dict(game_data.GROUP_BASE_WEIGHTS)
+        self.trait_group_multipliers = {trait: dict(m) for trait, m in game_data.TRAIT_GROUP_MULTIPLIERS.items()}
+
+        for key, value in (parameters or {}).items():
+            if key not in self.parameters:
+                raise ValueError(f"Unknown game parameter '{key}'.")
+            value = _number(value, key)
+            if isinstance(self.parameters[key], int): # Counts and limits
+                if value != int(value):
+                    raise TypeError(f"'{key}' must be a whole number.")
+                value = int(value)
+            self.parameters[key] = value
+        for group, weight in (group_base_weights or {}).items():
+            self.group_base_weights[self._check_group(group)] = _number(weight, group)
+        for trait, multipliers in (trait_group_multipliers or {}).items():
+            if not isinstance(multipliers, dict):
+                raise TypeError(f"The multipliers of trait '{trait}' must map action groups to numbers.")
+            trait_multipliers = self.trait_group_multipliers.setdefault(trait, {})
+            for group, multiplier in multipliers.items():
+                trait_multipliers[self._check_group(group)] = _number(multiplier, f"{trait}.{group}")
+
+    def _check_group(self, group):
+        if group not in self.group_base_weights:
+            raise ValueError(f"Unknown action group '{group}'.")
+        return group
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds rules from {parameters, group_base_weights, trait_group_multipliers} overrides,
+        e.g. a request payload's `rules`. Returns the defaults for None.
+        Raises ValueError/TypeError if they are invalid.
+        """
+        if data is None:
+            return cls()
+        if not isinstance(data, dict):
+            raise TypeError("rules must be an object of parameters, group_base_weights and trait_group_multipliers.")
+        return cls(data.get('parameters'), data.get('group_base_weights'), data.get('trait_group_multipliers'))
+
+    def to_dict(self):
+        return {
+            'parameters': dict(self.parameters),
+            'group_base_weights': dict(self.group_base_weights),
+            'trait_group_multipliers': {trait: dict(m) for trait, m in self.trait_group_multipliers.items()},
+        }
+
+    def group_weight(self, trait, group):
+        """Returns the weight of an action group for a team with `trait`: its base weight times the trait's multiplier."""
+        return self.group_base_weights.get(group, 0) * self.trait_group_multipliers.get(trait, {}).get(group, 1.0)
+
+
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"'{name}' must be a number.")
+    return value
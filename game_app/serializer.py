@@ -0,0 +1,70 @@
+# game_app/serializer.py
+import json
+
+try:
+    import orjson # Optional fast JSON backend
+except ImportError:
+    orjson = None
+
+from .history import INVARIANT_KEYS
+
+
+def _encode_fallback(obj):
+    """Encodes values JSON has no type for. Frames hold no sets, but structures from older code might."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_json(obj):
+    return json.dumps(obj, separators=(',', ':'), default=_encode_fallback)
+
+
+def _dumps_orjson(obj):
+    return orjson.dumps(obj, default=_encode_fallback, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+BACKENDS = {'json': _dumps_json}
+if orjson is not None:
+    BACKENDS['orjson'] = _dumps_orjson
+DEFAULT_BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(obj, backend=DEFAULT_BACKEND):
+    """Encodes an object as compact JSON text with the given backend (the fastest available by default)."""
+    return BACKENDS[backend](obj)
+
+
+class FrameSerializer:
+    """
+    Encodes augmented frames as JSON text.
+
+    The invariant parts of a simulation's frames (`teams`, `initial_state`, ...; see
+    history.INVARIANT_KEYS) are the same objects in every frame of a run, so each is
+    encoded once and its text spliced into every frame until a frame holds a
+    different object.
+    """
+
+    def __init__(self, backend=DEFAULT_BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"JSON backend '{backend}' is not available. Available: {', '.join(BACKENDS)}.")
+        self.backend = backend
+        self._dumps = BACKENDS[backend]
+        self._fragments = {} # {key: (value, encoded value)}
+
+    def _fragment(self, key, value):
+        cached = self._fragments.get(key)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        encoded = self._dumps(value)
+        self._fragments[key] = (value, encoded)
+        return encoded
+
+    def encode(self, frame):
+        """Returns a frame dict as JSON text."""
+        varying = {k: v for k, v in frame.items() if k not in INVARIANT_KEYS}
+        parts = [self._dumps(varying)[1:-1]] if varying else []
+        for key in INVARIANT_KEYS:
+            if key in frame:
+                parts.append(f'"{key}":{self._fragment(key, frame[key])}')
+        return '{' + ','.join(parts) + '}'
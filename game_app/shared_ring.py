@@ -0,0 +1,94 @@
+# game_app/shared_ring.py
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Bytes of stream data a ring buffer holds before its writer has to wait for the reader.
+DEFAULT_RING_CAPACITY = 4 * 1024 * 1024
+
+# How long a writer waits between checks for free space.
+WRITE_POLL_INTERVAL = 0.002 # seconds
+
+# The block starts with a header of unsigned 64-bit fields; the data area follows it.
+_FIELD = struct.Struct('<Q')
+_CAPACITY, _WRITTEN, _READ, _READER_CLOSED = range(4)
+_DATA_OFFSET = 64
+
+
+class RingClosed(Exception):
+    """Raised by SharedRingBuffer.write() once the reader has closed the buffer."""
+
+
+class SharedRingBuffer:
+    """
+    A byte stream from one process to another through a shared memory block, so large
+    payloads such as stream frames are copied across once instead of being pickled.
+
+    The reading process creates the buffer; the writing process attaches to it by `name`.
+    Positions are running byte counts, each updated by one side only: the writer advances
+    `written` after copying data in and the reader advances `read` after copying it out,
+    so no lock is needed between one writer and one reader. A writer waits while the
+    buffer is full and stops with RingClosed once the reader closes it.
+    """
+
+    def __init__(self, name=None, capacity=DEFAULT_RING_CAPACITY):
+        self.is_owner = name is None
+        if self.is_owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=_DATA_OFFSET + capacity)
+            self._shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+            self._set(_CAPACITY, capacity)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self.capacity = self._get(_CAPACITY)
+        self._closed = False
+
+    def _get(self, field):
+        return _FIELD.unpack_from(self._shm.buf, field * _FIELD.size)[0]
+
+    def _set(self, field, value):
+        _FIELD.pack_into(self._shm.buf, field * _FIELD.size, value)
+
+    def write(self, data):
+        """Copies `data` (bytes) into the buffer, waiting for the reader whenever it is full."""
+        buf, capacity = self._shm.buf, self.capacity
+        view = memoryview(data)
+        while view:
+            if self._get(_READER_CLOSED):
+                raise RingClosed()
+            written = self._get(_WRITTEN)
+            free = capacity - (written - self._get(_READ))
+            if not free:
+                time.sleep(WRITE_POLL_INTERVAL)
+                continue
+            start = written % capacity
+            count = min(free, len(view), capacity - start)
+            buf[_DATA_OFFSET + start:_DATA_OFFSET + start + count] = view[:count]
+            self._set(_WRITTEN, written + count)
+            view = view[count:]
+
+    def read(self):
+        """Returns all bytes written since the last read (b'' if there are none), without waiting."""
+        buf, capacity = self._shm.buf, self.capacity
+        read, written = self._get(_READ), self._get(_WRITTEN)
+        if written == read:
+            return b''
+        start = read % capacity
+        end = start + (written - read)
+        if end <= capacity:
+            data = bytes(buf[_DATA_OFFSET + start:_DATA_OFFSET + end])
+        else:
+            data = bytes(buf[_DATA_OFFSET + start:_DATA_OFFSET + capacity]) + bytes(buf[_DATA_OFFSET:_DATA_OFFSET + end - capacity])
+        self._set(_READ, written)
+        return data
+
+    def close(self):
+        """Detaches from the buffer. The reader that created it also tells the writer to stop and frees it."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.is_owner:
+            self._set(_READER_CLOSED, 1)
+        self._shm.close()
+        if self.is_owner:
+            self._shm.unlink()
@@ -0,0 +1,120 @@
+# game_app/sim_session.py
+import threading
+
+from .game_logic import Game
+from .history import SimulationHistory
+from .field_projection import FieldProjection
+
+# How many frames past the client's last requested frame a session simulates in the background.
+DEFAULT_READ_AHEAD = 40
+
+
+class SimulationSession:
+    """
+    A paused simulation that only runs as far as its frames are requested.
+
+    A background thread steps the game until the history holds `read_ahead` frames
+    past the furthest frame requested so far, then waits. Frames are recorded in a
+    delta-encoded SimulationHistory and augmented only when they are requested, so
+    a simulation nobody watches to the end costs only what was viewed plus the
+    read-ahead. A FieldProjection (`projection`) limits the keys of the frames.
+    Concurrent get_frames() calls are served one at a time.
+    """
+
+    def __init__(self, setup, seed=None, frame_filter=None, read_ahead=DEFAULT_READ_AHEAD, projection=None):
+        self.read_ahead = max(0, int(read_ahead))
+        self.frame_filter = frame_filter
+        self.projection = projection or FieldProjection()
+        self.history = SimulationHistory()
+        self.finished = False
+        self.error = None
+        self._game = Game()
+        self._steps = self._game.iter_simulation(
+            setup['teams'], setup['points'], setup['max_turns'], setup['grid_size'], seed=seed
+        )
+        self._target = self.read_ahead # Frame count the producer runs up to before pausing
+        self._closed = False
+        self._condition = threading.Condition()
+        self._read_lock = threading.Lock() # Held by one get_frames() call at a time
+        # The first step starts the game, which draws the seed and creates the log.
+        self._record(next(self._steps))
+        self.history.log = self._game.log
+        self.seed = self._game.state['initial_state']['seed']
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _record(self, state):
+        if self.frame_filter is None or self.frame_filter(state):
+            self.history.append(state)
+
+    def _produce(self):
+        """Background loop: steps the simulation while the history is behind the target."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or len(self.history) < self._target)
+                if self._closed:
+                    return
+            try:
+                state = next(self._steps)
+            except StopIteration:
+                state = None
+            except Exception as e: # Surface simulation errors to the reader instead of hanging it
+                self.error = e
+                state = None
+            with self._condition:
+                if state is None:
+                    self.finished = True
+                else:
+                    self._record(state)
+                self._condition.notify_all()
+            if state is None:
+                return
+
+    def close(self):
+        """Stops the background simulation. Frames already recorded stay readable."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def get_frames(self, start, count):
+        """
+        Returns up to `count` augmented JSON frames starting at `start`, waiting for the
+        simulation to reach them. Each frame carries the log entries added since the frame
+        before it as `log_entries`. Returns fewer frames if the simulation ends first.
+        """
+        with self._read_lock:
+            return self._get_frames(max(0, int(start)), max(0, int(count)))
+
+    def _get_frames(self, start, count):
+        end = start + count
+        with self._condition:
+            self._target = max(self._target, end + self.read_ahead)
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self.finished or self._closed or len(self.history) >= end)
+            if self.error is not None:
+                raise RuntimeError(f"Simulation failed: {self.error}") from self.error
+            end = min(end, len(self.history))
+            states = [self.history[i] for i in range(start, end)]
+            log_since = self.history[start - 1]['log_offset'] if states and start > 0 else 0
+
+        # Augmentation only reads the frames, so it can run while the game keeps simulating
+        frames = []
+        for state in states:
+            frames.append(self._game.augment_state_for_frontend(
+                state, as_json_string=True, log=self.history.log, log_since=log_since,
+                fields=self.projection.fields, exclude=self.projection.exclude
+            ))
+            log_since = state['log_offset']
+        return frames
+
+    def status(self):
+        """Returns how far the simulation has progressed."""
+        with self._condition:
+            frames_ready = len(self.history)
+            finished = self.finished
+        return {
+            'seed': self.seed,
+            'frames_ready': frames_ready,
+            'finished': finished,
+            'total_frames': frames_ready if finished else None,
+        }
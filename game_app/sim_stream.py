@@ -0,0 +1,83 @@
+# game_app/sim_stream.py
+import json
+
+from .field_projection import FieldProjection
+
+
+def simulation_progress(state):
+    """Returns how far a simulation is, in percent, from its turn counter and place in the current turn."""
+    if state['game_phase'] != 'RUNNING':
+        return 100
+    max_turns = state['max_turns']
+    if max_turns <= 0:
+        return 0
+    queue_length = len(state['actions_queue_this_turn'])
+    turn_fraction = state['action_in_turn'] / queue_length if queue_length else 0
+    return min(99, round((max(0, state['turn'] - 1) + turn_fraction) / max_turns * 100))
+
+
+def generate_simulation_stream(sim_game, steps, selection, encoder=None, delta=None, projection=None, typed=False):
+    """
+    Drives a simulation of `sim_game` step by step and yields newline-delimited JSON progress and state updates.
+    Each selected frame is augmented and sent as soon as its step completes, then released, so the
+    first frame arrives immediately and memory doesn't grow with the length of the game.
+    Each state carries only the log entries added since the previous frame, as `log_entries`;
+    the client rebuilds each frame's `game_log` from them and the frame's `log_offset`.
+    With a wire_format.FrameDeltaEncoder (`delta`), only its keyframes are sent as states and the
+    frames between them as `delta` updates: patches against the frame before.
+    With a wire_format.ColumnarEncoder, states are sent in its compact columnar form.
+    A FieldProjection (`projection`) limits the keys of each frame and what is computed for it.
+    The stream ends with the per-turn team stats of the run (`metrics`).
+    With `typed`, (update type, line) pairs are yielded instead, so the lines can be told apart
+    without parsing them.
+    """
+    updates = _simulation_stream_lines(sim_game, steps, selection, encoder, delta, projection or FieldProjection())
+    return updates if typed else (line for _, line in updates)
+
+
+def _simulation_stream_lines(sim_game, steps, selection, encoder, delta, projection):
+    """Yields the (update type, line) pairs of generate_simulation_stream."""
+    last_progress = None
+    log_since = 0
+    for state in steps:
+        # 1. Yield a progress update whenever the percentage changes
+        progress = simulation_progress(state)
+        if progress != last_progress:
+            last_progress = progress
+            progress_update = {
+                "type": "progress",
+                "data": {
+                    "progress": progress,
+                    "turn": state['turn'],
+                    "max_turns": state['max_turns'],
+                    "step": state['step'],
+                }
+            }
+            yield "progress", json.dumps(progress_update) + '\n'
+
+        if not selection(state):
+            continue
+
+        # 2. Augment and yield the state update. Augmentation only reads the state, so the live one is used.
+        update_type = "state"
+        if encoder is None and delta is None:
+            augmented_state_json = sim_game.augment_state_for_frontend(
+                state, as_json_string=True, log=sim_game.log, log_since=log_since,
+                fields=projection.fields, exclude=projection.exclude
+            )
+        else:
+            augmented_state = sim_game.augment_state_for_frontend(
+                state, log=sim_game.log, log_since=log_since, fields=projection.fields, exclude=projection.exclude
+            )
+            if delta is not None:
+                update_type, augmented_state = delta.encode(augmented_state)
+            if encoder is not None and update_type == "state":
+                augmented_state = encoder.encode(augmented_state)
+            augmented_state_json = sim_game.serializer.encode(augmented_state)
+        log_since = state['log_offset']
+        # Manually construct the JSON string to avoid double-encoding
+        state_update_json = f'{{"type": "{update_type}", "data": {augmented_state_json}}}'
+        yield update_type, state_update_json + '\n'
+
+    # 3. Finish with the run's per-turn team stats
+    yield "metrics", json.dumps({"type": "metrics", "data": sim_game.metrics.to_dict()}) + '\n'
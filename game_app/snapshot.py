@@ -0,0 +1,116 @@
+# game_app/snapshot.py
+import copy
+
+from . import structure_data
+
+# A schema-aware replacement for copy.deepcopy(game.state).
+#
+# Game state entries are mutated in place only at known depths: point coordinates,
+# structure timers/counters, and a few list fields such as a bastion's 'prong_ids'.
+# Everything else (teams, action results, rune formations) is replaced
+# wholesale, never mutated, so a snapshot can share it with the live state.
+
+
+def _copy_entity(entity):
+    """Copies a structure entity and its list/dict fields. Scalar fields are shared."""
+    if isinstance(entity, dict):
+        return {k: (v.copy() if isinstance(v, (list, dict, set)) else v) for k, v in entity.items()}
+    if isinstance(entity, list):
+        return entity.copy()
+    return entity
+
+
+def _copy_entity_list(entities):
+    return [_copy_entity(e) for e in entities]
+
+
+def _copy_entity_dict(entities):
+    return {k: _copy_entity(e) for k, e in entities.items()}
+
+
+def _copy_flat_dict_of_dicts(entities):
+    return {k: e.copy() for k, e in entities.items()}
+
+
+def _copy_flat_list_of_dicts(entities):
+    return [e.copy() for e in entities]
+
+
+def _copy_team_dict_list(storage):
+    return {team_id: _copy_entity_list(entities) for team_id, entities in storage.items()}
+
+
+def _copy_team_dict_of_structures(storage):
+    # Formation checkers rebuild these lists wholesale, so only the containers are copied.
+    return {team_id: {subtype: list(entities) for subtype, entities in team_structs.items()}
+            for team_id, team_structs in storage.items()}
+
+
+def _copy_container(value):
+    return value.copy()
+
+
+def _share(value):
+    return value
+
+
+_STORAGE_TYPE_COPIERS = {
+    'list': _copy_entity_list,
+    'dict': _copy_entity_dict,
+    'dict_keyed_by_pid': _copy_entity_dict,
+    'team_dict_list': _copy_team_dict_list,
+    'team_dict_of_structures': _copy_team_dict_of_structures,
+}
+
+
+def _build_state_schema():
+    """Maps each known state key to the cheapest copier that keeps snapshots independent."""
+    schema = {
+        'points': _copy_flat_dict_of_dicts,
+        'lines': _copy_flat_list_of_dicts,
+        'shields': _copy_container,
+        'line_strengths': _copy_container,
+        'regenerating_points': _copy_entity_dict,
+        'barricades': _copy_entity_list,
+        'whirlpools': _copy_entity_list,
+        'rift_traps': _copy_entity_list,
+        'fissures': _copy_entity_list,
+        'scorched_zones': _copy_entity_list,
+        'actions_queue_this_turn': _copy_container,
+        'no_cost_action_used_by_team_this_turn': _copy_container,
+        # Action results and events hold references to live entities, so they need a full copy.
+        # They only describe the latest step, so they stay small.
+        'last_action_details': copy.deepcopy,
+        'new_turn_events': copy.deepcopy,
+        'action_events': copy.deepcopy,
+        # Replaced wholesale, never mutated in place.
+        'teams': _share,
+        'initial_state': _share,
+        'interpretation': _share,
+        'forked_from': _share,
+        'action_probabilities': _share,
+        'live_stats': _share,
+    }
+    for definition in structure_data.STRUCTURE_DEFINITIONS.values():
+        schema.setdefault(definition['state_key'], _STORAGE_TYPE_COPIERS[definition['storage_type']])
+    return schema
+
+
+STATE_SCHEMA = _build_state_schema()
+
+
+def snapshot_state(state):
+    """
+    Returns a copy of a game state that is independent of future in-place mutations
+    of the original. Unknown keys fall back to copy.deepcopy.
+    """
+    snapshot = {}
+    for key, value in state.items():
+        copier = STATE_SCHEMA.get(key)
+        if copier is not None and value is not None:
+            snapshot[key] = copier(value)
+        elif isinstance(value, (dict, list, set)):
+            snapshot[key] = copy.deepcopy(value)
+        else:
+            snapshot[key] = value
+    return snapshot
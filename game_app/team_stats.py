@@ -0,0 +1,124 @@
+# game_app/team_stats.py
+import math
+
+from .geometry import distance_sq, polygon_area
+
+# Per-team counters kept in `live_stats` and recorded per turn in the metrics series.
+TEAM_STAT_KEYS = ('point_count', 'line_count', 'controlled_area', 'line_length')
+
+
+class TeamStatsTracker:
+    """
+    Computes per-team counters (points, lines, controlled area, line length) for the states they are needed for.
+
+    Line lengths and territory areas are cached per entity together with the coordinates
+    they were measured from, so each computation only measures lines and territories that were
+    created or whose points moved since the last one; deleted ones simply drop out of the cache.
+    """
+
+    def __init__(self):
+        self._line_lengths = {} # {line_id: (coords, length)}
+        self._territory_areas = {} # {point_ids: (coords, area)}
+
+    def compute(self, state):
+        """Returns {teamId: {stat: value}} for a state, reusing the measurements of unchanged entities."""
+        points = state['points']
+        stats = {team_id: {'point_count': 0, 'line_count': 0, 'controlled_area': 0, 'line_length': 0}
+                 for team_id in state['teams']}
+
+        for point in points.values():
+            team_stats = stats.get(point['teamId'])
+            if team_stats is not None:
+                team_stats['point_count'] += 1
+
+        line_lengths = {}
+        for line in state['lines']:
+            team_stats = stats.get(line['teamId'])
+            if team_stats is None:
+                continue
+            team_stats['line_count'] += 1
+            p1, p2 = points.get(line['p1_id']), points.get(line['p2_id'])
+            if p1 is None or p2 is None:
+                continue
+            coords = (p1['x'], p1['y'], p2['x'], p2['y'])
+            cached = self._line_lengths.get(line['id'])
+            length = cached[1] if cached is not None and cached[0] == coords else math.sqrt(distance_sq(p1, p2))
+            line_lengths[line['id']] = (coords, length)
+            team_stats['line_length'] += length
+        self._line_lengths = line_lengths
+
+        territory_areas = {}
+        for territory in state.get('territories', []):
+            team_stats = stats.get(territory['teamId'])
+            triangle_point_ids = tuple(territory['point_ids'])
+            if team_stats is None or len(triangle_point_ids) != 3 or not all(pid in points for pid in triangle_point_ids):
+                continue
+            triangle_points = [points[pid] for pid in triangle_point_ids]
+            coords = tuple((p['x'], p['y']) for p in triangle_points)
+            cached = self._territory_areas.get(triangle_point_ids)
+            area = cached[1] if cached is not None and cached[0] == coords else polygon_area(triangle_points)
+            territory_areas[triangle_point_ids] = (coords, area)
+            team_stats['controlled_area'] += area
+        self._territory_areas = territory_areas
+
+        for team_stats in stats.values():
+            team_stats['controlled_area'] = round(team_stats['controlled_area'], 2)
+            team_stats['line_length'] = round(team_stats['line_length'], 2)
+        return stats
+
+
+class MetricsSeries:
+    """
+    A per-turn time series of team stats for one run, stored column-wise.
+
+    One row is kept per turn (the last one recorded for it), together with the step
+    it was recorded at, so a rewound or forked game can drop the rows after its frame.
+    """
+
+    def __init__(self):
+        self.turns = []
+        self.steps = []
+        self.teams = {} # {teamId: {stat: [value per row]}}
+
+    def __len__(self):
+        return len(self.turns)
+
+    def record(self, turn, step, live_stats):
+        """Adds a row for `turn`, replacing the previous row if it was for the same turn."""
+        if self.turns and self.turns[-1] == turn:
+            self._drop_rows_from(len(self.turns) - 1)
+        row = len(self.turns)
+        self.turns.append(turn)
+        self.steps.append(step)
+        for team_id, team_stats in live_stats.items():
+            columns = self.teams.setdefault(team_id, {key: [None] * row for key in TEAM_STAT_KEYS})
+            for key in TEAM_STAT_KEYS:
+                columns[key].append(team_stats[key])
+
+    def truncate(self, step):
+        """Drops the rows recorded after simulation step `step`."""
+        rows = len(self.steps)
+        while rows > 0 and self.steps[rows - 1] > step:
+            rows -= 1
+        self._drop_rows_from(rows)
+
+    def _drop_rows_from(self, row):
+        del self.turns[row:]
+        del self.steps[row:]
+        for columns in self.teams.values():
+            for values in columns.values():
+                del values[row:]
+
+    def copy(self, step=None):
+        """Returns an independent copy, optionally without the rows recorded after `step`."""
+        series = MetricsSeries()
+        series.turns, series.steps = list(self.turns), list(self.steps)
+        series.teams = {team_id: {key: list(values) for key, values in columns.items()}
+                        for team_id, columns in self.teams.items()}
+        if step is not None:
+            series.truncate(step)
+        return series
+
+    def to_dict(self):
+        """Returns the series as plain JSON-ready data: {turns, steps, teams: {teamId: {stat: [...]}}}."""
+        return {'turns': self.turns, 'steps': self.steps, 'teams': self.teams}
@@ -1,6 +1,4 @@
-import random
 import math
-import uuid
 
 from .geometry import distance_sq
 from . import structure_data
@@ -52,15 +50,17 @@ class TurnProcessor:
             is_valid, _ = self.game.is_spawn_location_valid(point_data, point_data['teamId'])
             if is_valid:
                 self.state['points'][point_id] = point_data
-                team_name = self.state['teams'][point_data['teamId']]['name']
-                log_msg = {'message': f"A point for {team_name} regenerated from a past sacrifice.", 'short_message': '[REGEN]', 'teamId': point_data['teamId'], 'is_event': True}
-                self.state['game_log'].append(log_msg)
-                self.state['new_turn_events'].append({'type': 'point_regenerate', 'point': point_data})
+                if not self.game.quiet:
+                    team_name = self.state['teams'][point_data['teamId']]['name']
+                    log_msg = {'message': f"A point for {team_name} regenerated from a past sacrifice.", 'short_message': '[REGEN]', 'teamId': point_data['teamId'], 'is_event': True}
+                    self.game.log.append(log_msg)
+                    self.state['new_turn_events'].append({'type': 'point_regenerate', 'point': point_data})
             else:
                 # Point failed to regenerate
-                team_name = self.state['teams'][point_data['teamId']]['name']
-                log_msg = {'message': f"A point for {team_name} failed to regenerate as its location was blocked.", 'short_message': '[REGEN->FAIL]', 'teamId': point_data['teamId'], 'is_event': True}
-                self.state['game_log'].append(log_msg)
+                if not self.game.quiet:
+                    team_name = self.state['teams'][point_data['teamId']]['name']
+                    log_msg = {'message': f"A point for {team_name} failed to regenerate as its location was blocked.", 'short_message': '[REGEN->FAIL]', 'teamId': point_data['teamId'], 'is_event': True}
+                    self.game.log.append(log_msg)
 
     def _process_attuned_nexuses(self):
         """Handles decay of attuned nexuses."""
@@ -75,10 +75,11 @@ class TurnProcessor:
         
         for nexus_id in expired_nexus_ids:
             nexus = self.state['attuned_nexuses'].pop(nexus_id)
-            team_name = self.state['teams'][nexus['teamId']]['name']
-            log_msg = {'message': f"An Attuned Nexus from {team_name} has lost its charge.", 'short_message': '[NEXUS:FADE]', 'teamId': nexus['teamId'], 'is_event': True}
-            self.state['game_log'].append(log_msg)
-            self.state['new_turn_events'].append({'type': 'attuned_nexus_fade', 'nexus': nexus})
+            if not self.game.quiet:
+                team_name = self.state['teams'][nexus['teamId']]['name']
+                log_msg = {'message': f"An Attuned Nexus from {team_name} has lost its charge.", 'short_message': '[NEXUS:FADE]', 'teamId': nexus['teamId'], 'is_event': True}
+                self.game.log.append(log_msg)
+                self.state['new_turn_events'].append({'type': 'attuned_nexus_fade', 'nexus': nexus})
 
     def _process_ley_lines(self):
         """Handles decay of ley lines."""
@@ -93,10 +94,11 @@ class TurnProcessor:
         
         for ll_id in expired_ley_line_ids:
             ley_line = self.state['ley_lines'].pop(ll_id)
-            team_name = self.state['teams'][ley_line['teamId']]['name']
-            log_msg = {'message': f"A Ley Line from {team_name} has faded.", 'short_message': '[LEY LINE:FADE]', 'teamId': ley_line['teamId'], 'is_event': True}
-            self.state['game_log'].append(log_msg)
-            self.state['new_turn_events'].append({'type': 'ley_line_fade', 'ley_line': ley_line})
+            if not self.game.quiet:
+                team_name = self.state['teams'][ley_line['teamId']]['name']
+                log_msg = {'message': f"A Ley Line from {team_name} has faded.", 'short_message': '[LEY LINE:FADE]', 'teamId': ley_line['teamId'], 'is_event': True}
+                self.game.log.append(log_msg)
+                self.state['new_turn_events'].append({'type': 'ley_line_fade', 'ley_line': ley_line})
 
     def _process_shields_and_stasis(self):
         """Handles decay of shields and stasis effects."""
@@ -119,7 +121,7 @@ class TurnProcessor:
             else:
                 self.state['isolated_points'][point_id] = turns_left
                 # 25% chance to be destroyed each turn it's isolated
-                if random.random() < 0.25:
+                if self.game.rng.random() < 0.25:
                     points_to_destroy.append(point_id)
                     expired_points.append(point_id) # also remove from isolation if destroyed
 
@@ -132,9 +134,10 @@ class TurnProcessor:
                 point_data = self.state['points'][point_id]
                 team_name = self.state['teams'][point_data['teamId']]['name']
                 self.game._delete_point_and_connections(point_id, aggressor_team_id=None) # No aggressor, it's decay
-                log_msg = {'message': f"An isolated point from {team_name} collapsed under pressure.", 'short_message': '[ISOLATED->COLLAPSE]', 'teamId': point_data['teamId'], 'is_event': True}
-                self.state['game_log'].append(log_msg)
-                self.state['new_turn_events'].append({'type': 'point_collapse', 'point': point_data})
+                if not self.game.quiet:
+                    log_msg = {'message': f"An isolated point from {team_name} collapsed under pressure.", 'short_message': '[ISOLATED->COLLAPSE]', 'teamId': point_data['teamId'], 'is_event': True}
+                    self.game.log.append(log_msg)
+                    self.state['new_turn_events'].append({'type': 'point_collapse', 'point': point_data})
 
     def _process_rift_traps(self):
         """Handles rift trap triggers, expiration, and spawning."""
@@ -152,11 +155,12 @@ class TurnProcessor:
             if triggered_point_id:
                 destroyed_point = self.game._delete_point_and_connections(triggered_point_id, aggressor_team_id=trap['teamId'])
                 if destroyed_point:
-                    team_name = self.state['teams'][trap['teamId']]['name']
-                    enemy_team_name = self.state['teams'][destroyed_point['teamId']]['name']
-                    log_msg = { 'message': f"A Rift Trap from {team_name} snared and destroyed a point from {enemy_team_name}!", 'short_message': '[TRAP!]', 'teamId': trap['teamId'], 'is_event': True}
-                    self.state['game_log'].append(log_msg)
-                    self.state['new_turn_events'].append({ 'type': 'rift_trap_trigger', 'trap': trap, 'destroyed_point': destroyed_point })
+                    if not self.game.quiet:
+                        team_name = self.state['teams'][trap['teamId']]['name']
+                        enemy_team_name = self.state['teams'][destroyed_point['teamId']]['name']
+                        log_msg = { 'message': f"A Rift Trap from {team_name} snared and destroyed a point from {enemy_team_name}!", 'short_message': '[TRAP!]', 'teamId': trap['teamId'], 'is_event': True}
+                        self.game.log.append(log_msg)
+                        self.state['new_turn_events'].append({ 'type': 'rift_trap_trigger', 'trap': trap, 'destroyed_point': destroyed_point })
                 continue
 
             trap['turns_left'] -= 1
@@ -167,10 +171,11 @@ class TurnProcessor:
                     new_point = {"x": round(trap['coords']['x']), "y": round(trap['coords']['y']), "teamId": trap['teamId'], "id": new_point_id}
                     self.state['points'][new_point_id] = new_point
                     
-                    team_name = self.state['teams'][trap['teamId']]['name']
-                    log_msg = { 'message': f"An unused Rift Trap from {team_name} stabilized into a new point.", 'short_message': '[TRAP->SPAWN]', 'teamId': trap['teamId'], 'is_event': True }
-                    self.state['game_log'].append(log_msg)
-                    self.state['new_turn_events'].append({ 'type': 'rift_trap_expire', 'trap': trap, 'new_point': new_point })
+                    if not self.game.quiet:
+                        team_name = self.state['teams'][trap['teamId']]['name']
+                        log_msg = { 'message': f"An unused Rift Trap from {team_name} stabilized into a new point.", 'short_message': '[TRAP->SPAWN]', 'teamId': trap['teamId'], 'is_event': True }
+                        self.game.log.append(log_msg)
+                        self.state['new_turn_events'].append({ 'type': 'rift_trap_expire', 'trap': trap, 'new_point': new_point })
                 continue
             
             remaining_traps.append(trap)
@@ -241,10 +246,11 @@ class TurnProcessor:
             if monolith['charge_counter'] >= monolith['charge_interval']:
                 monolith['charge_counter'] = 0
                 
-                team_name = self.state['teams'][monolith['teamId']]['name']
-                log_msg = {'message': f"A Monolith from {team_name} emits a reinforcing wave.", 'short_message': '[MONOLITH:WAVE]', 'teamId': monolith['teamId'], 'is_event': True}
-                self.state['game_log'].append(log_msg)
-                self.state['new_turn_events'].append({'type': 'monolith_wave', 'monolith_id': monolith_id, 'center_coords': monolith['center_coords'], 'radius_sq': monolith['wave_radius_sq']})
+                if not self.game.quiet:
+                    team_name = self.state['teams'][monolith['teamId']]['name']
+                    log_msg = {'message': f"A Monolith from {team_name} emits a reinforcing wave.", 'short_message': '[MONOLITH:WAVE]', 'teamId': monolith['teamId'], 'is_event': True}
+                    self.game.log.append(log_msg)
+                    self.state['new_turn_events'].append({'type': 'monolith_wave', 'monolith_id': monolith_id, 'center_coords': monolith['center_coords'], 'radius_sq': monolith['wave_radius_sq']})
 
                 center, radius_sq = monolith['center_coords'], monolith['wave_radius_sq']
                 for line in self.game.query.get_team_lines(monolith['teamId']):
@@ -275,8 +281,8 @@ class TurnProcessor:
                 heartwood['growth_counter'] = 0
                 
                 for _ in range(10):
-                    angle = random.uniform(0, 2 * math.pi)
-                    radius = self.state['grid_size'] * random.uniform(0.05, 0.15)
+                    angle = self.game.rng.uniform(0, 2 * math.pi)
+                    radius = self.state['grid_size'] * self.game.rng.uniform(0.05, 0.15)
                     
                     new_x = heartwood['center_coords']['x'] + math.cos(angle) * radius
                     new_y = heartwood['center_coords']['y'] + math.sin(angle) * radius
@@ -292,10 +298,11 @@ class TurnProcessor:
                     new_point = {"x": final_x, "y": final_y, "teamId": teamId, "id": new_point_id}
                     self.state['points'][new_point_id] = new_point
                     
-                    team_name = self.state['teams'][teamId]['name']
-                    log_msg = {'message': f"The Heartwood of {team_name} birthed a new point.", 'short_message': '[HW:GROWTH]', 'teamId': teamId, 'is_event': True}
-                    self.state['game_log'].append(log_msg)
-                    self.state['new_turn_events'].append({'type': 'heartwood_growth', 'new_point': new_point, 'heartwood_id': heartwood['id']})
+                    if not self.game.quiet:
+                        team_name = self.state['teams'][teamId]['name']
+                        log_msg = {'message': f"The Heartwood of {team_name} birthed a new point.", 'short_message': '[HW:GROWTH]', 'teamId': teamId, 'is_event': True}
+                        self.game.log.append(log_msg)
+                        self.state['new_turn_events'].append({'type': 'heartwood_growth', 'new_point': new_point, 'heartwood_id': heartwood['id']})
                     break
 
     def _process_wonders(self):
@@ -307,13 +314,15 @@ class TurnProcessor:
             if wonder['type'] == 'ChronosSpire':
                 wonder['turns_to_victory'] -= 1
                 team_name = self.state['teams'][wonder['teamId']]['name']
-                log_msg = {'message': f"The Chronos Spire of {team_name} pulses. Victory in {wonder['turns_to_victory']} turns.", 'short_message': f'[SPIRE: T-{wonder["turns_to_victory"]}]', 'teamId': wonder['teamId'], 'is_event': True}
-                self.state['game_log'].append(log_msg)
+                if not self.game.quiet:
+                    log_msg = {'message': f"The Chronos Spire of {team_name} pulses. Victory in {wonder['turns_to_victory']} turns.", 'short_message': f'[SPIRE: T-{wonder["turns_to_victory"]}]', 'teamId': wonder['teamId'], 'is_event': True}
+                    self.game.log.append(log_msg)
                 
                 if wonder['turns_to_victory'] <= 0:
                     self.state['game_phase'] = 'FINISHED'
                     self.state['victory_condition'] = f"'{team_name}' achieved victory with the Chronos Spire."
-                    self.state['game_log'].append({'message': self.state['victory_condition'], 'short_message': '[WONDER VICTORY]', 'teamId': wonder['teamId'], 'is_event': True})
+                    if not self.game.quiet:
+                        self.game.log.append({'message': self.state['victory_condition'], 'short_message': '[WONDER VICTORY]', 'teamId': wonder['teamId'], 'is_event': True})
                     self.state['actions_queue_this_turn'] = []
                     return True
         return False
@@ -15,6 +15,24 @@ WATCHED_FILES = [
     'game_app/action_data.py',
     'game_app/turn_processor.py',
     'game_app/game_state_query.py',
+    'game_app/history.py',
+    'game_app/game_log.py',
+    'game_app/frame_selection.py',
+    'game_app/field_projection.py',
+    'game_app/sim_session.py',
+    'game_app/sim_stream.py',
+    'game_app/decorations.py',
+    'game_app/team_stats.py',
+    'game_app/serializer.py',
+    'game_app/wire_format.py',
+    'game_app/game_sessions.py',
+    'game_app/jobs.py',
+    'game_app/shared_ring.py',
+    'game_app/cancellation.py',
+    'game_app/divination.py',
+    'game_app/rules.py',
+    'game_app/snapshot.py',
+    'game_app/replay.py',
     'game_app/actions/expand_actions.py',
     'game_app/actions/fight_actions.py',
     'game_app/actions/fortify_actions.py',
@@ -0,0 +1,159 @@
+# game_app/wire_format.py
+import time
+import zlib
+
+from .history import INVARIANT_KEYS, apply_diff, diff_states
+from .snapshot import snapshot_state
+
+# Media types of the simulation stream. JSON is the default; the columnar format is opt-in via `Accept`.
+JSON_STREAM_MIMETYPE = 'application/x-json-stream'
+COLUMNAR_STREAM_MIMETYPE = 'application/x-geom-columnar-stream'
+
+# Content encodings the stream can be compressed with, in order of preference.
+STREAM_ENCODINGS = ('gzip', 'deflate')
+
+# How often a compressed stream is flushed, so frames keep arriving while the simulation runs.
+COMPRESSION_FLUSH_INTERVAL = 0.1 # seconds
+
+# How many frames apart a delta stream sends full keyframes.
+DEFAULT_DELTA_KEYFRAME_INTERVAL = 50
+
+# Frame keys that hold only what is new in each frame, so they are sent as-is rather than diffed.
+DELTA_PASSTHROUGH_KEYS = ('log_entries',)
+
+POINT_KEYS = ('id', 'x', 'y', 'teamId')
+LINE_KEYS = ('id', 'p1_id', 'p2_id', 'teamId', 'is_shielded', 'is_bastion_line', 'strength')
+
+
+class ColumnarEncoder:
+    """
+    Rewrites the points and lines of augmented frames as column arrays for the compact stream format.
+
+    Point/line IDs, team IDs and point flag names are interned in tables that grow over
+    the stream: each frame lists only the entries it adds (`tables`), and columns refer to
+    entries by index. Point flags become a bitmask over the flag table; line decorations a
+    bitmask of is_shielded (1) and is_bastion_line (2). Any other keys are sent as-is
+    in an `extra` column of {row: {key: value}}. One encoder serves one stream, whose
+    frames must be decoded in order (see `_decodeColumnarFrame` in static/js/api.js).
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._teams = {}
+        self._flags = {}
+
+    @staticmethod
+    def _intern(table, value, added):
+        index = table.get(value)
+        if index is None:
+            index = table[value] = len(table)
+            added.append(value)
+        return index
+
+    def encode(self, frame):
+        """Returns a copy of an augmented frame dict with columnar `points` and `lines` (if it has them) and a `tables` delta."""
+        new_ids, new_teams, new_flags = [], [], []
+        encoded = frame.copy()
+
+        if 'points' in frame:
+            encoded['points'] = self._encode_points(frame['points'], new_ids, new_teams, new_flags)
+        if 'lines' in frame:
+            encoded['lines'] = self._encode_lines(frame['lines'], new_ids, new_teams)
+        if new_ids or new_teams or new_flags:
+            encoded['tables'] = {'ids': new_ids, 'teams': new_teams, 'flags': new_flags}
+        return encoded
+
+    def _encode_points(self, points, new_ids, new_teams, new_flags):
+        ids, teams, flags = self._ids, self._teams, self._flags
+        point_columns = {'id': [], 'x': [], 'y': [], 'team': [], 'flags': []}
+        extra = {}
+        for row, point in enumerate(points.values()):
+            point_columns['id'].append(self._intern(ids, point['id'], new_ids))
+            point_columns['x'].append(point['x'])
+            point_columns['y'].append(point['y'])
+            point_columns['team'].append(self._intern(teams, point['teamId'], new_teams))
+            mask = 0
+            for key, value in point.items():
+                if key in POINT_KEYS:
+                    continue
+                if key.startswith('is_') and value is True:
+                    mask |= 1 << self._intern(flags, key, new_flags)
+                else:
+                    extra.setdefault(row, {})[key] = value
+            point_columns['flags'].append(mask)
+        if extra:
+            point_columns['extra'] = extra
+        return point_columns
+
+    def _encode_lines(self, lines, new_ids, new_teams):
+        ids, teams = self._ids, self._teams
+        line_columns = {'id': [], 'p1': [], 'p2': [], 'team': [], 'flags': [], 'strength': []}
+        extra = {}
+        for row, line in enumerate(lines):
+            line_columns['id'].append(self._intern(ids, line['id'], new_ids))
+            line_columns['p1'].append(self._intern(ids, line['p1_id'], new_ids))
+            line_columns['p2'].append(self._intern(ids, line['p2_id'], new_ids))
+            line_columns['team'].append(self._intern(teams, line['teamId'], new_teams))
+            line_columns['flags'].append(int(bool(line.get('is_shielded'))) | int(bool(line.get('is_bastion_line'))) << 1)
+            line_columns['strength'].append(line.get('strength', 0))
+            for key, value in line.items():
+                if key not in LINE_KEYS:
+                    extra.setdefault(row, {})[key] = value
+        if extra:
+            line_columns['extra'] = extra
+        return line_columns
+
+
+class FrameDeltaEncoder:
+    """
+    Turns a stream's augmented frames into periodic keyframes and patches against the previous frame.
+
+    Every `keyframe_interval`-th frame is sent whole; the frames between them are sent as
+    the diff (history.diff_states) from the frame before: {key: op}, where op is
+    ['set', value], ['remove'], or for points (a dict by ID) and ID-keyed lists such as lines
+    ['dict' | 'id_list', {id: changed or added entity}, [removed IDs], new order or null].
+    Invariant keys are only sent with keyframes. Frames are snapshotted as they are
+    encoded, so live states can be augmented and passed in directly.
+    """
+
+    def __init__(self, keyframe_interval=DEFAULT_DELTA_KEYFRAME_INTERVAL):
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self._shadow = None # The previous frame, as the client has rebuilt it
+        self._frames_since_keyframe = 0
+
+    def encode(self, frame):
+        """Returns ('state', frame) for a keyframe, or ('delta', {'ops': diff, ...passthrough keys})."""
+        tracked = {k: v for k, v in frame.items() if k not in INVARIANT_KEYS and k not in DELTA_PASSTHROUGH_KEYS}
+        if self._shadow is None or self._frames_since_keyframe >= self.keyframe_interval:
+            self._shadow = snapshot_state(tracked)
+            self._frames_since_keyframe = 1
+            return 'state', frame
+
+        diff = diff_states(self._shadow, tracked)
+        apply_diff(self._shadow, diff)
+        self._frames_since_keyframe += 1
+        patch = {'ops': diff}
+        for key in DELTA_PASSTHROUGH_KEYS:
+            if key in frame:
+                patch[key] = frame[key]
+        return 'delta', patch
+
+
+def compress_stream(chunks, encoding, flush_interval=COMPRESSION_FLUSH_INTERVAL):
+    """
+    Compresses a stream of text chunks with gzip or deflate. The compressor is sync-flushed
+    after the first chunk and then at most every `flush_interval` seconds, so the client can
+    decode what has been sent so far without waiting for the end of the stream.
+    """
+    wbits = zlib.MAX_WBITS | 16 if encoding == 'gzip' else zlib.MAX_WBITS
+    compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+    last_flush = None
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        now = time.monotonic()
+        if last_flush is None or now - last_flush >= flush_interval:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            last_flush = now
+        if data:
+            yield data
+    yield compressor.flush(zlib.Z_FINISH)
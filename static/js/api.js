@@ -6,6 +6,7 @@ const api = {
     _pyodide: null,
     _game: null,
     _game_data: null,
+    _streamFormat: 'json', // 'json' or 'columnar'; the wire format requested for HTTP simulation streams
 
     /**
      * Initializes the API, loading Pyodide if specified.
@@ -26,7 +27,8 @@ const api = {
             const pyodideFileStructure = {
                 'game_app': [
                     'action_data.py', 'game_data.py', 'game_logic.py', 'geometry.py',
-                    'formations.py', 'structure_data.py', 'turn_processor.py', 'game_state_query.py'
+                    'formations.py', 'structure_data.py', 'turn_processor.py', 'game_state_query.py',
+                    'history.py', 'snapshot.py', 'game_log.py', 'frame_selection.py', 'decorations.py', 'team_stats.py', 'serializer.py', 'field_projection.py', 'rules.py'
                 ],
                 'game_app/actions': [
                     'expand_actions.py', 'fight_actions.py', 'fortify_actions.py', 'rune_actions.py', 'sacrifice_actions.py', 'terraform_actions.py'
@@ -59,17 +61,20 @@ const api = {
 import sys
 sys.path.append('/')
 from game_app import game_logic, game_data
-import copy
-# Make the game instance and copy module available on Python's global scope under specific names
+from game_app.history import SimulationHistory
+from game_app.frame_selection import FrameSelection
+# Make the game instance and helper classes available on Python's global scope under specific names
 js_game_instance = game_logic.game
 js_game_data = game_data
-js_copy_module = copy
+js_history_class = SimulationHistory
+js_frame_selection_class = FrameSelection
             `);
 
             // Get a proxy to the game instance from the Python global scope.
             this._game = this._pyodide.globals.get('js_game_instance');
             this._game_data = this._pyodide.globals.get('js_game_data');
-            this._copy = this._pyodide.globals.get('js_copy_module');
+            this._historyClass = this._pyodide.globals.get('js_history_class');
+            this._frameSelectionClass = this._pyodide.globals.get('js_frame_selection_class');
             console.log('Pyodide backend ready.');
         } else {
             this._mode = 'http';
@@ -88,6 +93,137 @@ js_copy_module = copy
         return pyProxy.toJs({ dict_converter: Object.fromEntries });
     },
 
+    /**
+     * Rebuilds a streamed frame's `game_log`. The server only sends the log entries added
+     * since the previous frame (`log_entries`), so all frames of a stream share one log
+     * array and each exposes its own prefix of it, up to its `log_offset`.
+     * @param {object} frame - A state parsed from the stream.
+     * @param {Array} sharedLog - The log entries received so far in this stream.
+     * @returns {object} The same frame, with a `game_log` property.
+     */
+    _attachGameLog(frame, sharedLog) {
+        if (!Array.isArray(frame.log_entries)) return frame;
+        sharedLog.push(...frame.log_entries);
+        delete frame.log_entries;
+        const logOffset = frame.log_offset;
+        Object.defineProperty(frame, 'game_log', {
+            get: () => sharedLog.slice(0, logOffset),
+            enumerable: true,
+            configurable: true
+        });
+        return frame;
+    },
+
+    /**
+     * Chooses the wire format of HTTP simulation streams. 'columnar' sends points and lines as
+     * column arrays with interned ID and team tables, which is several times smaller than JSON;
+     * frames are decoded back to the usual shape as they arrive. Streams are sent uncompressed unless the
+     * payload sets `compress: true`; the browser then negotiates gzip/deflate itself.
+     * @param {string} format - 'json' (the default) or 'columnar'.
+     */
+    setStreamFormat(format) {
+        if (format !== 'json' && format !== 'columnar') {
+            throw new Error(`Unknown stream format: ${format}`);
+        }
+        this._streamFormat = format;
+    },
+
+    _streamHeaders(headers = {}) {
+        const accept = this._streamFormat === 'columnar'
+            ? 'application/x-geom-columnar-stream'
+            : 'application/x-json-stream';
+        return { ...headers, 'Accept': accept };
+    },
+
+    /**
+     * Rebuilds a frame sent in the columnar stream format (see game_app/wire_format.py) as a regular frame.
+     * The interned tables only list the entries each frame adds, so frames must be decoded in stream order.
+     * @param {object} frame - A columnar state parsed from the stream.
+     * @param {object} tables - The stream's `{ids, teams, flags}` tables, extended in place.
+     * @returns {object} The same frame, with `points` as a dict by ID and `lines` as a list.
+     */
+    _decodeColumnarFrame(frame, tables) {
+        if (frame.tables) {
+            tables.ids.push(...frame.tables.ids);
+            tables.teams.push(...frame.tables.teams);
+            tables.flags.push(...frame.tables.flags);
+            delete frame.tables;
+        }
+        if (frame.points) frame.points = this._decodePointColumns(frame.points, tables);
+        if (frame.lines) frame.lines = this._decodeLineColumns(frame.lines, tables);
+        return frame;
+    },
+
+    _decodePointColumns(pointColumns, { ids, teams, flags }) {
+        const pointExtra = pointColumns.extra || {};
+        const points = {};
+        for (let row = 0; row < pointColumns.id.length; row++) {
+            const point = {
+                id: ids[pointColumns.id[row]],
+                x: pointColumns.x[row],
+                y: pointColumns.y[row],
+                teamId: teams[pointColumns.team[row]],
+                ...pointExtra[row]
+            };
+            const mask = pointColumns.flags[row];
+            for (let bit = 0; mask >= 2 ** bit; bit++) {
+                if (Math.floor(mask / 2 ** bit) % 2) point[flags[bit]] = true;
+            }
+            points[point.id] = point;
+        }
+        return points;
+    },
+
+    _decodeLineColumns(lineColumns, { ids, teams }) {
+        const lineExtra = lineColumns.extra || {};
+        return lineColumns.id.map((idIndex, row) => ({
+            id: ids[idIndex],
+            p1_id: ids[lineColumns.p1[row]],
+            p2_id: ids[lineColumns.p2[row]],
+            teamId: teams[lineColumns.team[row]],
+            ...lineExtra[row],
+            is_shielded: (lineColumns.flags[row] & 1) !== 0,
+            is_bastion_line: (lineColumns.flags[row] & 2) !== 0,
+            strength: lineColumns.strength[row]
+        }));
+    },
+
+    /**
+     * Rebuilds a frame from a `delta` stream update and the frame before it (see FrameDeltaEncoder
+     * in game_app/wire_format.py). Unchanged entities are shared with the previous frame, not copied.
+     * @param {object} previous - The previous frame of the stream.
+     * @param {object} patch - `{ops: {key: op}}`, plus keys such as `log_entries` sent as-is.
+     * @returns {object} A new frame.
+     */
+    _applyFrameDelta(previous, patch) {
+        const frame = {};
+        for (const key of Object.keys(previous)) {
+            if (key !== 'game_log') frame[key] = previous[key];
+        }
+        for (const [key, op] of Object.entries(patch.ops)) {
+            const [kind, changed, removed, order] = op;
+            if (kind === 'set') {
+                frame[key] = changed;
+            } else if (kind === 'remove') {
+                delete frame[key];
+            } else if (kind === 'dict') {
+                const container = { ...frame[key] };
+                removed.forEach(k => delete container[k]);
+                Object.assign(container, changed);
+                frame[key] = order ? Object.fromEntries(order.map(k => [k, container[k]])) : container;
+            } else if (kind === 'id_list') {
+                const byId = new Map(frame[key].map(item => [item.id, item]));
+                removed.forEach(id => byId.delete(id));
+                for (const item of Object.values(changed)) byId.set(item.id, item);
+                frame[key] = (order || [...byId.keys()]).map(id => byId.get(id));
+            }
+        }
+        for (const [key, value] of Object.entries(patch)) {
+            if (key !== 'ops') frame[key] = value;
+        }
+        return frame;
+    },
+
     async _fetchJson(url, options) {
         const response = await fetch(url, options);
         if (!response.ok) {
@@ -129,6 +265,72 @@ js_copy_module = copy
     },
 
 
+    /**
+     * Reads a newline-delimited JSON stream of progress and state updates from the server.
+     * @param {Response} response - A successful fetch response from a streaming endpoint.
+     * @param {function} [progressCallback] - Called with (progress, turn, max_turns, step).
+     * @param {number} fallbackMaxTurns - Reported in the final progress update if no state arrived.
+     * @returns {Promise<object>} `{history, metrics}`: the augmented states, with their `game_log` attached,
+     *   and the run's per-turn team stats (`{turns, steps, teams: {teamId: {stat: [...]}}}`), if sent.
+     */
+    async _readStateStream(response, progressCallback, fallbackMaxTurns) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        const history = [];
+        const sharedLog = [];
+        let metrics = null;
+        const contentType = response.headers.get('Content-Type') || '';
+        const columnarTables = contentType.startsWith('application/x-geom-columnar-stream')
+            ? { ids: [], teams: [], flags: [] }
+            : null;
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop(); // Keep partial line for the next chunk
+
+            for (const line of lines) {
+                if (line.trim() === '') continue;
+                try {
+                    const update = JSON.parse(line);
+                    if (update.type === 'error') {
+                        throw new Error(`Server error during simulation: ${update.data}`);
+                    }
+                    if (update.type === 'progress' && progressCallback) {
+                        const pData = update.data;
+                        progressCallback(pData.progress, pData.turn, pData.max_turns, pData.step);
+                    } else if (update.type === 'state') {
+                        // The server sends augmented states
+                        const frame = columnarTables ? this._decodeColumnarFrame(update.data, columnarTables) : update.data;
+                        history.push(this._attachGameLog(frame, sharedLog));
+                    } else if (update.type === 'delta') {
+                        // A patch against the previous frame, sent by streams started with `delta: true`
+                        const frame = this._applyFrameDelta(history[history.length - 1], update.data);
+                        history.push(this._attachGameLog(frame, sharedLog));
+                    } else if (update.type === 'metrics') {
+                        metrics = update.data;
+                    }
+                } catch (e) {
+                    console.error("Failed to parse JSON stream line:", line, e);
+                }
+            }
+        }
+        // Final progress update
+        if (progressCallback) {
+            if (history.length > 0) {
+                const lastState = history[history.length - 1];
+                progressCallback(100, lastState.max_turns, lastState.max_turns, history.length - 1);
+            } else {
+                progressCallback(100, fallbackMaxTurns, fallbackMaxTurns, 0);
+            }
+        }
+        return { history, metrics };
+    },
+
     // --- GAME API calls ---
     async getState() {
         if (this._mode === 'pyodide') {
@@ -149,7 +351,7 @@ js_copy_module = copy
             // HTTP mode uses fetch streaming
             const response = await fetch('/api/game/start', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: this._streamHeaders({ 'Content-Type': 'application/json' }),
                 body: JSON.stringify(payload)
             });
 
@@ -160,69 +362,45 @@ js_copy_module = copy
                 throw error;
             }
 
-            const reader = response.body.getReader();
-            const decoder = new TextDecoder();
-            let buffer = '';
-            const history = [];
-
-            while (true) {
-                const { done, value } = await reader.read();
-                if (done) break;
-
-                buffer += decoder.decode(value, { stream: true });
-                const lines = buffer.split('\n');
-                buffer = lines.pop(); // Keep partial line for the next chunk
-
-                for (const line of lines) {
-                    if (line.trim() === '') continue;
-                    try {
-                        const update = JSON.parse(line);
-                        if (update.type === 'progress' && progressCallback) {
-                            const pData = update.data;
-                            progressCallback(pData.progress, pData.turn, pData.max_turns, pData.step);
-                        } else if (update.type === 'state') {
-                            // The server now sends augmented states
-                            history.push(update.data);
-                        }
-                    } catch (e) {
-                        console.error("Failed to parse JSON stream line:", line, e);
-                    }
-                }
-            }
-            // Final progress update
-            if (progressCallback) {
-                if (history.length > 0) {
-                    const lastState = history[history.length - 1];
-                    progressCallback(100, lastState.max_turns, lastState.max_turns, history.length - 1);
-                } else {
-                    progressCallback(100, payload.maxTurns, payload.maxTurns, 0);
-                }
-            }
-            return { history }; // HTTP mode returns pre-augmented history
+            return this._readStateStream(response, progressCallback, payload.maxTurns); // HTTP mode returns pre-augmented history
         }
 
-        // Pyodide mode simulation
-        this._game.start_game(
+        // Pyodide mode simulation, driven step by step through the Python simulation generator.
+        // Only the frames picked by the payload's frame selection options are recorded.
+        this._frameSelection?.destroy();
+        this._frameSelection = this._frameSelectionClass.from_payload(this._pyodide.toPy({
+            frames: payload.frames ?? null,
+            fromTurn: payload.fromTurn ?? null,
+            stride: payload.stride ?? null
+        }));
+        this._steps?.destroy();
+        this._steps = this._game.iter_simulation(
             this._pyodide.toPy(payload.teams),
             this._pyodide.toPy(payload.points),
             payload.maxTurns,
-            payload.gridSize
+            payload.gridSize,
+            payload.seed ?? null
         );
-        
-        const state_copy_proxy_initial = this._copy.deepcopy(this._game.state);
-        const raw_history = [this._pyProxyToJs(state_copy_proxy_initial)];
-        state_copy_proxy_initial.destroy();
+
+        // Frames are kept in a delta-encoded Python history and rebuilt on demand in augmentState.
+        // The first step starts the game, which creates the log the history's frames refer to.
+        const appendStep = () => {
+            const { done, value } = this._steps.next();
+            if (done) return false;
+            if (this._frameSelection(value)) this._history.append(value);
+            value.destroy();
+            return true;
+        };
+        this._history?.destroy();
+        const firstStep = this._steps.next();
+        this._history = this._historyClass.callKwargs({ log: this._game.log, metrics: this._game.metrics });
+        this._pyodide.globals.set('js_history', this._history);
+        if (this._frameSelection(firstStep.value)) this._history.append(firstStep.value);
+        firstStep.value.destroy();
 
         return new Promise((resolve) => {
             const step = () => {
-                const game_phase = this._game.state.get('game_phase');
-                
-                if (game_phase === 'RUNNING') {
-                    this._game.run_next_action();
-                    const state_copy_proxy = this._copy.deepcopy(this._game.state);
-                    raw_history.push(this._pyProxyToJs(state_copy_proxy));
-                    state_copy_proxy.destroy();
-                    
+                if (appendStep()) {
                     if (progressCallback) {
                         const turn = this._game.state.get('turn');
                         const max_turns = this._game.state.get('max_turns');
@@ -237,74 +415,75 @@ js_copy_module = copy
                         const action_progress_in_turn = actions_this_turn > 0 ? (action_in_turn / actions_this_turn) : 0;
                         const total_progress = max_turns > 0 ? Math.round((turn_progress + action_progress_in_turn / max_turns) * 100) : 0;
                         
-                        const currentStep = raw_history.length - 1;
+                        const currentStep = this._game.state.get('step');
                         progressCallback(total_progress, turn, max_turns, currentStep);
                     }
 
                     setTimeout(step, 0); // Yield to event loop to update UI
                 } else {
+                    const frameCount = this._history.length;
                     if (progressCallback) {
                          const max_turns = this._game.state.get('max_turns');
-                         const currentStep = raw_history.length - 1;
-                         progressCallback(100, max_turns, max_turns, currentStep);
+                         progressCallback(100, max_turns, max_turns, frameCount - 1);
                     }
-                    resolve({ raw_history }); // Pyodide mode returns raw history
+                    // Raw history entries are lightweight references into the Python history store.
+                    const raw_history = Array.from({ length: frameCount }, (_, i) => ({ frame_index: i }));
+                    const metrics_py = this._game.metrics.to_dict();
+                    const metrics = this._pyProxyToJs(metrics_py);
+                    metrics_py.destroy();
+                    resolve({ raw_history, metrics }); // Pyodide mode returns raw history
                 }
             };
             setTimeout(step, 0);
         });
     },
 
+    /**
+     * Creates a paused, demand-driven simulation on the server (HTTP mode only).
+     * @param {object} payload - The same options as startGameAsync.
+     * @returns {Promise<object>} The session's `id` and progress.
+     */
+    async createSimulation(payload) {
+        if (this._mode === 'pyodide') {
+            throw new Error("Paged simulations are only available with the HTTP backend.");
+        }
+        return this._fetchJson('/api/sim', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+    },
+
+    /**
+     * Fetches a page of augmented frames from a paged simulation, which only simulates as far as needed.
+     * Pages must be fetched in order for their frames' `game_log` to be complete.
+     * @param {string} simId - The ID returned by createSimulation.
+     * @param {number} from - Index of the first frame.
+     * @param {number} count - Number of frames to fetch.
+     * @param {Array} sharedLog - Log entries received so far for this simulation; extended in place.
+     * @returns {Promise<object>} `{frames, page}` where `page` has `next`, `finished` and `total_frames`.
+     */
+    async getSimulationFrames(simId, from, count, sharedLog) {
+        const result = await this._fetchJson(`/api/sim/${simId}/frames?from=${from}&count=${count}`);
+        result.frames.forEach(frame => this._attachGameLog(frame, sharedLog));
+        return result;
+    },
+
+    async deleteSimulation(simId) {
+        return this._fetchJson(`/api/sim/${simId}`, { method: 'DELETE' });
+    },
+
     async restartAsync(progressCallback) {
         if (this._mode === 'http') {
             // HTTP mode uses fetch streaming
-            const response = await fetch('/api/game/restart', { method: 'POST' });
+            const response = await fetch('/api/game/restart', { method: 'POST', headers: this._streamHeaders() });
             if (!response.ok) {
                 const errorText = await response.text();
                 const error = new Error(`Server returned an error: ${response.status} ${response.statusText}`);
                 error.response_text = errorText;
                 throw error;
             }
-            const reader = response.body.getReader();
-            const decoder = new TextDecoder();
-            let buffer = '';
-            const history = [];
-
-            while (true) {
-                const { done, value } = await reader.read();
-                if (done) break;
-
-                buffer += decoder.decode(value, { stream: true });
-                const lines = buffer.split('\n');
-                buffer = lines.pop();
-
-                for (const line of lines) {
-                    if (line.trim() === '') continue;
-                    try {
-                        const update = JSON.parse(line);
-                         if (update.type === 'error') {
-                            throw new Error(`Server error during restart: ${update.data}`);
-                        }
-                        if (update.type === 'progress' && progressCallback) {
-                            const pData = update.data;
-                            progressCallback(pData.progress, pData.turn, pData.max_turns, pData.step);
-                        } else if (update.type === 'state') {
-                            history.push(update.data);
-                        }
-                    } catch (e) {
-                        console.error("Failed to parse JSON stream line:", line, e);
-                    }
-                }
-            }
-            if (progressCallback) {
-                if (history.length > 0) {
-                    const lastState = history[history.length - 1];
-                    progressCallback(100, lastState.max_turns, lastState.max_turns, history.length - 1);
-                } else {
-                     progressCallback(100, 0, 0, 0); // fallback
-                }
-            }
-            return { history };
+            return this._readStateStream(response, progressCallback, 0);
 
         }
 
@@ -324,20 +503,59 @@ js_copy_module = copy
         }, progressCallback);
     },
 
+    /**
+     * Continues the last simulation from one of its frames under a new seed and/or traits (HTTP mode only).
+     * The last simulation must have been started with `forkable: true`.
+     * Only the steps after the fork are simulated; the returned history starts with the fork frame.
+     * @param {object} payload - `step`, optional `seed`, `traits` ({teamId: trait}) and frame selection options.
+     * @param {function} [progressCallback] - Called with (progress, turn, max_turns, step).
+     * @returns {Promise<object>} `{history, metrics}`, as from startGameAsync.
+     */
+    async forkGameAsync(payload, progressCallback) {
+        if (this._mode === 'pyodide') {
+            throw new Error("Forking a simulation is only available with the HTTP backend.");
+        }
+        const response = await fetch('/api/game/fork', {
+            method: 'POST',
+            headers: this._streamHeaders({ 'Content-Type': 'application/json' }),
+            body: JSON.stringify(payload)
+        });
+        if (!response.ok) {
+            const errorText = await response.text();
+            const error = new Error(`Server returned an error: ${response.status} ${response.statusText}`);
+            error.response_text = errorText;
+            throw error;
+        }
+        return this._readStateStream(response, progressCallback, 0);
+    },
+
     async augmentState(state) {
         if (this._mode === 'pyodide') {
-            const state_json = JSON.stringify(state);
-            this._pyodide.globals.set('state_json_str_for_augment', state_json);
-            
-            // Call the Python function which now handles its own JSON serialization.
-            // The result is a JS string, not a PyProxy.
-            const augmented_state_json_string = this._pyodide.runPython(`
+            let augmented_state_json_string;
+            if (typeof state.frame_index === 'number') {
+                // Rebuild the frame from the delta-encoded history, then augment it.
+                this._pyodide.globals.set('frame_index_for_augment', state.frame_index);
+                augmented_state_json_string = this._pyodide.runPython(`
+js_game_instance.augment_state_for_frontend(
+    js_history.get_frame(frame_index_for_augment),
+    as_json_string=True,
+    log=js_history.log
+)
+                `);
+            } else {
+                const state_json = JSON.stringify(state);
+                this._pyodide.globals.set('state_json_str_for_augment', state_json);
+                
+                // Call the Python function which now handles its own JSON serialization.
+                // The result is a JS string, not a PyProxy.
+                augmented_state_json_string = this._pyodide.runPython(`
 import json
 js_game_instance.augment_state_for_frontend(
     json.loads(state_json_str_for_augment),
     as_json_string=True
 )
-            `);
+                `);
+            }
             
             return JSON.parse(augmented_state_json_string);
         }